@@ -1,8 +1,8 @@
 import customtkinter as ctk
-from PIL import Image, ImageTk
+from PIL import ImageTk
 import warnings
-import math
-import heapq
+import os
+import time
 from tkinter import ttk
 import tkinter as tk
 
@@ -17,93 +17,63 @@ app.minsize(800, 600)
 
 # ==============================
 # BACKGROUND MAP
-bg_photo = None
+from map_assets import MapAssets
+
+# pre-scaled map variants are cached on disk, so only the first run resamples
+map_assets = MapAssets()
+bg_image = None
 try:
-    bg_image = Image.open("EGNX_Map.tif")
-    bg_image = bg_image.resize((screen_width, screen_height), Image.Resampling.LANCZOS)
-    bg_photo = ImageTk.PhotoImage(bg_image)
-    # warn if not CTkImage (CTkImage supports HighDPI scaling)
-    try:
-        if not isinstance(bg_photo, ctk.CTkImage):
-            warnings.warn(f"EGNX_V7 Warning: Given image is not CTkImage but {type(bg_photo)}. Image cannot be scaled on HighDPI displays; use CTkImage instead.", stacklevel=2)
-    except Exception:
-        warnings.warn(f"EGNX_V7 Warning: Given image is of type {type(bg_photo)}; expected CTkImage. Use CTkImage for HighDPI scaling.", stacklevel=2)
+    bg_image = map_assets.scaled("EGNX_Map.tif", (screen_width, screen_height))
 except FileNotFoundError:
     print("Warning: EGNX_Map.tif not found — continuing with placeholder background")
 except Exception as e:
     print(f"Warning: failed to load map image: {e}")
 
-# Create canvas regardless; if image loaded we'll place it, otherwise keep blank
+# Create canvas regardless; the map (if loaded) and the taxiway graph are
+# composited into its bottom image item by draw_graph()
 canvas = ctk.CTkCanvas(app, width=screen_width, height=screen_height)
 canvas.pack(fill="both", expand=True)
-if bg_photo:
-    canvas_bg = canvas.create_image(0, -100, anchor="nw", image=bg_photo)
+canvas_bg = canvas.create_image(0, 0, anchor="nw")
+bg_photo = None
 
 # ==============================
 # NODES & EDGES
-nodes = {
-    "STAND1a": (846, 200), "STAND1b": (846, 215),
-    "STAND2a": (892, 200), "STAND2b": (892, 215),
-    "STAND3a": (938, 200), "STAND3b": (938, 215),
-    "STAND4a": (984, 200), "STAND4b": (984, 215),
-    "STAND5a": (1089, 200), "STAND5b": (1089, 215),
-    "STAND6a": (1135, 200), "STAND6b": (1135, 215),
-    "STAND7a": (1181, 200), "STAND7b": (1181, 215),
-    "STAND8a": (1227, 200), "STAND8b": (1227, 215),
-    "STAND1N": (846, 241), "STAND2N": (892, 241),
-    "STAND3N": (938, 241), "STAND4N": (984, 241),
-    "STAND5N": (1089, 241), "STAND6N": (1135, 241),
-    "STAND7N": (1181, 241), "STAND8N": (1227, 241),
-    "AQ": (790, 152), "NQ": (790, 241),
-    "AR": (1282, 152), "NR": (1282, 241),
-    "AS": (1036, 152), "NS": (1036, 241),
-    "TXY_A1": (1730, 152), "RWY27_A1": (1730, 90),
-    "TXY_B1": (1498, 152), "RWY27_B1": (1498, 90),
-    "TXY_C1": (675, 152), "RWY09_C1": (675, 90),
-    "TXY_D1": (287, 152), "RWY09_D1": (287, 90),
-    "TXY_E1": (190, 152), "RWY09_E1": (190, 90),
-}
-
-edges = {
-    "RWY27_A1": ["TXY_A1","RWY27_B1"],
-    "RWY27_B1": ["TXY_B1","RWY09_C1"],
-    "RWY09_C1": ["TXY_C1","RWY09_D1"],
-    "RWY09_D1": ["RWY09_E1","TXY_D1"],
-    "TXY_E1": ["RWY09_E1","TXY_D1"],
-    "TXY_C1": ["TXY_D1","AQ"],
-    "AQ": ["NQ","AS"],
-    "NS": ["AS","NQ","NR","STAND1N","STAND2N","STAND3N","STAND4N","STAND5N","STAND6N","STAND7N","STAND8N"],
-    "NQ": ["STAND1N","STAND2N","STAND3N","STAND4N"],
-    "NR": ["STAND5N","STAND6N","STAND7N","STAND8N"],
-    "AR": ["AS","NR","TXY_B1"],
-    "TXY_B1": ["TXY_A1"],
-    "STAND1b": ["STAND1N","STAND1a"],
-    "STAND2b": ["STAND2N","STAND2a"],
-    "STAND3b": ["STAND3N","STAND3a"],
-    "STAND4b": ["STAND4N","STAND4a"],
-    "STAND5b": ["STAND5N","STAND5a"],
-    "STAND6b": ["STAND6N","STAND6a"],
-    "STAND7b": ["STAND7N","STAND7a"],
-    "STAND8b": ["STAND8N","STAND8a"],
-}
-for node, neighbors in list(edges.items()):
-    for neighbor in neighbors:
-        if neighbor not in edges:
-            edges[neighbor] = []
-        if node not in edges[neighbor]:
-            edges[neighbor].append(node)
+from layout_loader import layout_switch, load_layout
+from taxi_graph import TaxiGraph
+from spatial_index import GridIndex
+from route_cache import RouteCache
+
+# --layout=<file> (or EGNX_LAYOUT) loads a GeoJSON/CSV layout through its
+# compiled cache instead of the built-in EGNX one
+if layout_switch():
+    layout = load_layout(layout_switch())
+    nodes, edges, metres_per_pixel = layout.nodes, layout.edges, layout.metres_per_pixel
+    runway_entries, stands = layout.runway_entries, layout.stands
+    graph = layout.graph
+    route_cache = layout.route_cache()
+else:
+    from egnx_layout import nodes, edges, metres_per_pixel, runway_entries
+    stands = [s for s in nodes if s.endswith("a")]
+    graph = TaxiGraph(nodes, edges, metres_per_pixel)
+    # shortest-path trees rooted at every runway entry and stand
+    route_cache = RouteCache(graph, runway_entries + stands)
 
 # ==============================
 # GRAPH DRAW
+from render_layer import SpriteLayer, compose_static_layer
+
 def draw_graph():
-    for node, neighbors in edges.items():
-        x1, y1 = nodes[node]
-        for neighbor in neighbors:
-            x2, y2 = nodes[neighbor]
-            canvas.create_line(x1, y1, x2, y2, fill="yellow", width=2, dash=(4,2))
-    for name, (x, y) in nodes.items():
-        canvas.create_oval(x-3, y-3, x+3, y+3, fill="red")
-        canvas.create_text(x, y-10, text=name, fill="white", font=("Arial", 7, "bold"))
+    """Composite the map and the taxiway graph into the canvas's one background image."""
+    global bg_photo
+    static_layer = compose_static_layer((screen_width, screen_height), nodes, edges, bg_image, offset=(0, -100))
+    bg_photo = ImageTk.PhotoImage(static_layer)
+    # warn if not CTkImage (CTkImage supports HighDPI scaling)
+    try:
+        if not isinstance(bg_photo, ctk.CTkImage):
+            warnings.warn(f"EGNX_V7 Warning: Given image is not CTkImage but {type(bg_photo)}. Image cannot be scaled on HighDPI displays; use CTkImage instead.", stacklevel=2)
+    except Exception:
+        warnings.warn(f"EGNX_V7 Warning: Given image is of type {type(bg_photo)}; expected CTkImage. Use CTkImage for HighDPI scaling.", stacklevel=2)
+    canvas.itemconfigure(canvas_bg, image=bg_photo)
 
 draw_graph()
 
@@ -115,91 +85,43 @@ def dijkstra(start, goal):
     Both start and goal must be node keys (strings) present in the `nodes` dict.
     Returns None if no path found or inputs invalid.
     """
-    if start not in nodes or goal not in nodes:
+    start_id = graph.id_of(start)
+    goal_id = graph.id_of(goal)
+    if start_id is None or goal_id is None:
         return None
-
-    dist = {start: 0.0}
-    prev = {}
-    pq = [(0.0, start)]
-
-    while pq:
-        cur_cost, node = heapq.heappop(pq)
-        if node == goal:
-            # reconstruct path
-            path = []
-            while node in prev:
-                path.append(node)
-                node = prev[node]
-            path.append(start)
-            return list(reversed(path))
-
-        if cur_cost > dist.get(node, float('inf')):
-            continue
-
-        for nxt in edges.get(node, []):
-            # ensure node coordinates exist
-            if node not in nodes or nxt not in nodes:
-                continue
-            edge_cost = math.dist(nodes[node], nodes[nxt])
-            new_cost = cur_cost + edge_cost
-            if new_cost < dist.get(nxt, float('inf')):
-                dist[nxt] = new_cost
-                prev[nxt] = node
-                heapq.heappush(pq, (new_cost, nxt))
-
-    return None
+    path = graph.dijkstra(start_id, goal_id)
+    return graph.path_names(path) if path is not None else None
 
 # ==============================
-# AIRCRAFT CLASS
-class Aircraft:
-    def __init__(self, callsign, node):
-        # logical node name where aircraft currently is (string)
-        self.callsign = callsign
-        self.node = node
-        # current coordinates (x,y) for drawing and movement
-        self.coords = nodes.get(node) if node in nodes else (0, 0)
-        self.triangle_id = None
-        self.label_id = None
-        self.route = []
-        # spline_points: list of (x,y) tuples
-        self.spline_points = []
-        # mapping from spline index -> route index (index into self.route)
-        self.spline_route_idx_map = []
-        self.dist_along_path = 0.0
-        self.waiting_for_stopbar = False
-
-active_aircraft = {}
-aircraft_rows = {}
-stop_bars = {}
+# SIMULATION CORE
+from simulation import ARRIVED, HOLDING, RUNWAY, TAXIING, Simulation
+from scheduler import FrameScheduler
+from fleet import HAS_NUMPY
+from reservations import ReservationPlanner
+from table_view import TableModel, format_coords
+import spline
+
+# all aircraft/stop-bar state lives in the headless simulation; taxi routes
+# are booked in space and time so aircraft do not meet head-on
+sim = Simulation(graph, route_cache=route_cache, vectorized=HAS_NUMPY,
+                 planner=ReservationPlanner(graph), runway_entries=runway_entries)
+active_aircraft = sim.active_aircraft
+stop_bars = sim.stop_bars
 stop_bar_draw_ids = {}
+# closed node -> the canvas items of its cross
+closure_draw_ids = {}
 
 # ==============================
 # DRAW AIRCRAFT
+# sprites are only moved when an aircraft has visibly moved or turned
+sprites = SpriteLayer(canvas)
+
 def draw_aircraft(ac):
     """Draw an aircraft at its current coords and store canvas ids on the object."""
-    x, y = ac.coords
-    size = 12
-    ac.triangle_id = canvas.create_polygon(
-        x, y-size,
-        x-size, y+size,
-        x+size, y+size,
-        fill="blue"
-    )
-    ac.label_id = canvas.create_text(x, y-size-10, text=ac.callsign, fill="white", font=("Arial", 10, "bold"))
+    sprites.add(ac)
 
 # ==============================
 # CATMULL-ROM SPLINE
-def catmull_rom_spline(P0,P1,P2,P3,n_points=20):
-    points = []
-    for i in range(n_points):
-        t = i/n_points
-        t2 = t*t
-        t3 = t2*t
-        x = 0.5*((2*P1[0]) + (-P0[0]+P2[0])*t + (2*P0[0]-5*P1[0]+4*P2[0]-P3[0])*t2 + (-P0[0]+3*P1[0]-3*P2[0]+P3[0])*t3)
-        y = 0.5*((2*P1[1]) + (-P0[1]+P2[1])*t + (2*P0[1]-5*P1[1]+4*P2[1]-P3[1])*t2 + (-P0[1]+3*P1[1]-3*P2[1]+P3[1])*t3)
-        points.append((x,y))
-    return points
-
 def build_spline_path(route, points_per_segment=20):
     """Build a Catmull-Rom spline for the given route (list of node names).
 
@@ -207,95 +129,66 @@ def build_spline_path(route, points_per_segment=20):
     is the index j such that spline_points[i] corresponds to motion from route[j]
     towards route[j+1].
     """
-    spline_points = []
-    spline_route_idx_map = []
-    if not route or len(route) == 0:
-        return [], []
-    if len(route) == 1:
-        # single point
-        pt = nodes.get(route[0], (0, 0))
-        return [pt], [0]
-
-    n = len(route)
-    for i in range(n-1):
-        P0 = nodes[route[i-1]] if i>0 else nodes[route[i]]
-        P1 = nodes[route[i]]
-        P2 = nodes[route[i+1]]
-        P3 = nodes[route[i+2]] if i+2<n else nodes[route[i+1]]
-        seg = catmull_rom_spline(P0, P1, P2, P3, n_points=points_per_segment)
-        spline_points.extend(seg)
-        # for each point in seg, map to route index i
-        spline_route_idx_map.extend([i] * len(seg))
-
-    return spline_points, spline_route_idx_map
+    return spline.build_spline_path(graph, route, points_per_segment)
+
 
+# grid index over the layout so clicks and hover need not scan every node
+node_index = GridIndex.from_points(nodes.items(), cell_size=50)
 
 def nearest_node_to(x, y, max_dist=50):
     """Return the node name nearest to (x,y) within max_dist pixels, else None."""
-    best = None
-    best_d = float('inf')
-    for name, (nx, ny) in nodes.items():
-        d = math.hypot(nx - x, ny - y)
-        if d < best_d:
-            best_d = d
-            best = name
-    if best_d <= max_dist:
-        return best
-    return None
+    return node_index.nearest(x, y, max_dist)
 
 # ==============================
-# MOVE AIRCRAFT ALONG SPLINE WITH CONTROLLED SPEED
-def move_aircraft(ac, speed=2):
-    if not ac.spline_points or ac.dist_along_path >= len(ac.spline_points)-1:
-        # arrived or nothing to follow
-        if ac.route:
-            ac.node = ac.route[-1]
-            ac.coords = nodes.get(ac.node, ac.coords)
-        row_id = aircraft_rows.get(ac.callsign)
-        if row_id:
-            aircraft_table.item(row_id, values=(ac.callsign, "", "", "ARRIVED", ac.node))
-        return
+# RENDER AIRCRAFT (one pass per rendered frame from the scheduler)
+def render_frame(moving, stopped):
+    # vectorized fleets hand back every triangle from one batched computation
+    triangles = sim.fleet.triangles().tolist() if sim.fleet is not None and moving else None
+    for ac in moving:
+        sprites.draw(ac, triangles[ac.slot] if triangles else None)
+        aircraft_view.update(ac.callsign, table_row(ac, format_coords(ac.coords)))
+    for ac in stopped:
+        sprites.draw(ac, force=True)
+        aircraft_view.update(ac.callsign, table_row(ac, ac.node))
+    # rows reach the Treeview a few times a second, and once more when the loop stops
+    aircraft_view.flush(force=not sim.busy)
+    if scheduler.renders % 30 == 0:
+        frame_label.configure(text=instruments.overlay_text() if instruments.enabled else scheduler.stats())
+
+# aircraft taxi at realistic speeds (15 kt), so run the GUI clock faster;
+# the simulation advances every tick and the canvas is drawn at ~30 fps
+SIM_TIME_SCALE = 10.0
+SIM_INTERVAL_MS = 15
+RENDER_INTERVAL_MS = 33
+scheduler = FrameScheduler(app, sim, render_frame, interval_ms=SIM_INTERVAL_MS, time_scale=SIM_TIME_SCALE,
+                           render_interval_ms=RENDER_INTERVAL_MS)
+frame_label = ctk.CTkLabel(app, text="", justify="left")
+frame_label.place(relx=0.01, rely=0.97, anchor="sw")
 
-    idx = int(ac.dist_along_path)
-    next_idx = min(idx+1, len(ac.spline_points)-1)
-    curr_x, curr_y = ac.spline_points[idx]
-    next_x, next_y = ac.spline_points[next_idx]
-
-    # stop bar check using precomputed spline->route map
-    route_idx = None
-    if ac.spline_route_idx_map and idx < len(ac.spline_route_idx_map):
-        route_idx = ac.spline_route_idx_map[idx]
-    if route_idx is not None and route_idx + 1 < len(ac.route):
-        next_node = ac.route[route_idx + 1]
-        if stop_bars.get(next_node):
-            ac.waiting_for_stopbar = True
-            row_id = aircraft_rows.get(ac.callsign)
-            if row_id:
-                aircraft_table.item(row_id, values=("", ac.callsign + " (HOLD)", "", "", ac.node))
-            return
-        else:
-            ac.waiting_for_stopbar = False
-
-    # rotation
-    angle = math.atan2(next_y-curr_y, next_x-curr_x)
-    size = 12
-    points = [
-        (curr_x + size*math.cos(angle), curr_y + size*math.sin(angle)),
-        (curr_x - size*math.cos(angle+0.5), curr_y - size*math.sin(angle+0.5)),
-        (curr_x - size*math.cos(angle-0.5), curr_y - size*math.sin(angle-0.5)),
-    ]
-    coords = [c for p in points for c in p]
-    canvas.coords(ac.triangle_id, *coords)
-    canvas.coords(ac.label_id, curr_x, curr_y-size-10)
-
-    ac.coords = (curr_x, curr_y)
-    row_id = aircraft_rows.get(ac.callsign)
-    if row_id:
-        aircraft_table.item(row_id, values=(ac.callsign, "", "", "", f"{ac.coords}"))
-
-    # move along spline by distance
-    ac.dist_along_path += speed
-    app.after(30, move_aircraft, ac, speed)
+# ==============================
+# INSTRUMENTATION
+# hot paths are timed only while switched on (F12, or EGNX_INSTRUMENT=1);
+# the frame label then shows the overlay and F11 writes a JSON dump
+from instrumentation import instruments, install_hot_path_hooks, profile_switch, profiling
+
+install_hot_path_hooks()
+instruments.wrap(canvas, "coords", "canvas.coords")
+instruments.wrap(SpriteLayer, "draw", "sprites.draw")
+instruments.wrap(TableModel, "flush", "table.flush")
+
+def toggle_instruments(event=None):
+    if instruments.toggle():
+        instruments.reset()
+    frame_label.configure(text=instruments.overlay_text() if instruments.enabled else scheduler.stats())
+
+def dump_instruments(event=None):
+    path = instruments.dump_json(f"egnx-instruments-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    print(f"Instrumentation written to {path}")
+
+app.bind("<F12>", toggle_instruments)
+app.bind("<F11>", dump_instruments)
+if os.environ.get("EGNX_INSTRUMENT"):
+    instruments.enable()
 
 # ==============================
 # TABLE
@@ -306,6 +199,18 @@ for col in ("stand","taxi","runway","inbound","pos"):
     aircraft_table.heading(col, text=col.capitalize())
     aircraft_table.column(col, width=100)
 aircraft_table.pack()
+instruments.wrap(aircraft_table, "item", "aircraft_table.item")
+# batches row changes so the Treeview is touched at most ~4 times a second
+aircraft_view = TableModel(aircraft_table)
+
+# table column an aircraft's callsign is shown in, by Aircraft.status
+TABLE_COLUMN = {TAXIING: 1, HOLDING: 1, RUNWAY: 2, ARRIVED: 3}
+
+def table_row(ac, position):
+    row = ["", "", "", "", position]
+    text = ac.callsign + " (HOLD)" if ac.status == HOLDING else ac.callsign
+    row[TABLE_COLUMN.get(ac.status, 0)] = text
+    return row
 
 # ==============================
 # ADD AIRCRAFT
@@ -315,7 +220,7 @@ def open_add_aircraft():
     popup.geometry("300x200")
     popup.grab_set()
     ctk.CTkLabel(popup, text="Select Stand:").pack(pady=5)
-    stand_menu = ctk.CTkOptionMenu(popup, values=[s for s in nodes if s.endswith("a")])
+    stand_menu = ctk.CTkOptionMenu(popup, values=stands)
     stand_menu.pack(pady=5)
     ctk.CTkLabel(popup, text="Enter Callsign:").pack(pady=5)
     callsign_entry = ctk.CTkEntry(popup)
@@ -326,13 +231,9 @@ def open_add_aircraft():
         stand = stand_menu.get()
         callsign = callsign_entry.get().strip().upper()
         if not callsign: return
-        ac = Aircraft(callsign, stand)
-        # ensure coords are set from stand
-        ac.coords = nodes.get(stand, ac.coords)
+        ac = sim.add_aircraft(callsign, stand)
         draw_aircraft(ac)
-        row_id = aircraft_table.insert("", "end", values=(callsign, "", "", "", stand))
-        active_aircraft[callsign] = ac
-        aircraft_rows[callsign] = row_id
+        aircraft_view.insert(callsign, table_row(ac, stand))
         popup.destroy()
 
     confirm_btn = ctk.CTkButton(popup, text="Add", command=confirm)
@@ -348,35 +249,19 @@ controls_frame = ctk.CTkFrame(app)
 controls_frame.place(relx=0.5, rely=0.42, anchor="n")
 runway_selector = ctk.CTkOptionMenu(
     controls_frame,
-    values=["RWY27_A1","RWY27_B1","RWY09_C1","RWY09_D1","RWY09_E1"]
+    values=runway_entries
 )
 runway_selector.pack(side="left", padx=10, pady=10)
 
 def taxi_selected_aircraft():
     sel = aircraft_table.selection()
     if not sel: return
-    row_id = sel[0]
-    values = aircraft_table.item(row_id, "values")
-    callsign = next((v for v in values if v and v != values[-1]), None)
-    if not callsign: return
-    ac = active_aircraft[callsign]
+    callsign = aircraft_view.key_of(sel[0])
+    if callsign not in active_aircraft: return
     destination = runway_selector.get()
-    route = dijkstra(ac.node, destination)
+    route = sim.taxi_to(callsign, destination)
     if route and len(route) >= 1:
-        ac.route = route
-        spline_points, spline_map = build_spline_path(route, points_per_segment=15)
-        ac.spline_points = spline_points
-        ac.spline_route_idx_map = spline_map
-        ac.dist_along_path = 0.0
-        # set starting coords to first spline point
-        if spline_points:
-            ac.coords = spline_points[0]
-            canvas.coords(ac.triangle_id, *([c for p in [
-                (spline_points[0][0] + 12*math.cos(0), spline_points[0][1] + 12*math.sin(0)),
-                (spline_points[0][0] - 12*math.cos(0.5), spline_points[0][1] - 12*math.sin(0.5)),
-                (spline_points[0][0] - 12*math.cos(-0.5), spline_points[0][1] - 12*math.sin(-0.5)),
-            ] for c in p]) )
-        move_aircraft(ac, speed=2)
+        scheduler.start()
 
 taxi_button = ctk.CTkButton(controls_frame, text="Taxi to Runway", command=taxi_selected_aircraft)
 taxi_button.pack(side="left", padx=10, pady=10)
@@ -387,20 +272,52 @@ stopbar_frame = ctk.CTkFrame(app)
 stopbar_frame.place(relx=0.85, rely=0.15, anchor="n")
 placing_stopbars = {"on": False}
 
+hover_ring = {"id": None, "node": None}
+
 def enter_stopbar_mode():
     placing_stopbars["on"] = not placing_stopbars["on"]
     if placing_stopbars["on"]:
         place_btn.configure(text="Stop-Bar Mode: ON (click map)")
         canvas.bind("<Button-1>", stopbar_place_click)
+        canvas.bind("<Button-3>", closure_click)
+        canvas.bind("<Motion>", stopbar_hover)
     else:
         place_btn.configure(text="Stop-Bar Mode: OFF")
-        canvas.unbind("<Button-1>")
+        canvas.bind("<Button-1>", select_aircraft_click)
+        canvas.unbind("<Button-3>")
+        canvas.unbind("<Motion>")
+        highlight_node(None)
 
 def stopbar_place_click(event):
     node = nearest_node_to(event.x, event.y, max_dist=50)
     if node:
         toggle_stop_bar(node)
 
+def highlight_node(node):
+    """Ring the node a stop-bar click would hit (None clears it)."""
+    if node == hover_ring["node"]:
+        return
+    if hover_ring["id"]:
+        canvas.delete(hover_ring["id"])
+        hover_ring["id"] = None
+    hover_ring["node"] = node
+    if node:
+        x, y = nodes[node]
+        hover_ring["id"] = canvas.create_oval(x-8, y-8, x+8, y+8, outline="orange", width=2)
+
+def stopbar_hover(event):
+    highlight_node(nearest_node_to(event.x, event.y, max_dist=50))
+
+def select_aircraft_click(event):
+    """Select the table row of the aircraft under the cursor."""
+    ac = sim.aircraft_at(event.x, event.y)
+    row_id = aircraft_view.row_of(ac.callsign) if ac else None
+    if row_id:
+        aircraft_table.selection_set(row_id)
+        aircraft_table.see(row_id)
+
+canvas.bind("<Button-1>", select_aircraft_click)
+
 def draw_stop_bar_at(node):
     x, y = nodes[node]
     length = 24
@@ -414,17 +331,17 @@ def remove_stop_bar_draw(node):
         stop_bar_draw_ids.pop(node, None)
 
 def toggle_stop_bar(node):
-    if stop_bars.get(node):
-        stop_bars[node] = False
-        remove_stop_bar_draw(node)
-    else:
-        stop_bars[node] = True
+    if sim.toggle_stop_bar(node):
         draw_stop_bar_at(node)
+    else:
+        remove_stop_bar_draw(node)
+        if sim.moving:
+            scheduler.start()
     refresh_stopbar_list()
 
 def clear_stop_bar(node):
     if stop_bars.get(node):
-        stop_bars[node] = False
+        sim.set_stop_bar(node, False)
         remove_stop_bar_draw(node)
         refresh_stopbar_list()
         resume_aircraft_waiting_at(node)
@@ -435,18 +352,46 @@ def refresh_stopbar_list():
     for node, active in sorted(stop_bars.items()):
         if active:
             stopbar_list.insert("", "end", values=(node, "ON"))
+    for node in sorted(closure_draw_ids):
+        stopbar_list.insert("", "end", values=(node, "CLOSED"))
 
 def clear_selected_stopbar():
     sel = stopbar_list.selection()
     if not sel: return
-    node = stopbar_list.item(sel[0], "values")[0]
-    clear_stop_bar(node)
+    node, status = stopbar_list.item(sel[0], "values")
+    if status == "CLOSED":
+        toggle_closure(node)
+    else:
+        clear_stop_bar(node)
 
 def resume_aircraft_waiting_at(node):
-    for callsign, ac in active_aircraft.items():
-        if ac.waiting_for_stopbar and ac.route:
-            ac.waiting_for_stopbar = False
-            move_aircraft(ac, speed=2)
+    # only aircraft held at this node rejoin the simulation's step loop
+    sim.resume_aircraft_waiting_at(node)
+    if sim.moving:
+        scheduler.start()
+
+# ==============================
+# CLOSURES
+# in stop-bar mode a right-click closes or reopens a node; aircraft due to
+# pass it are rerouted from where they are
+def toggle_closure(node):
+    if node in closure_draw_ids:
+        for cid in closure_draw_ids.pop(node):
+            canvas.delete(cid)
+        rerouted = sim.reopen_node(node)
+    else:
+        x, y = nodes[node]
+        closure_draw_ids[node] = (canvas.create_line(x - 7, y - 7, x + 7, y + 7, width=3, fill="red"),
+                                  canvas.create_line(x - 7, y + 7, x + 7, y - 7, width=3, fill="red"))
+        rerouted = sim.close_node(node)
+    if rerouted:
+        scheduler.start()
+    refresh_stopbar_list()
+
+def closure_click(event):
+    node = nearest_node_to(event.x, event.y, max_dist=50)
+    if node:
+        toggle_closure(node)
 
 place_btn = ctk.CTkButton(stopbar_frame, text="Stop-Bar Mode: OFF", command=enter_stopbar_mode)
 place_btn.pack(pady=6)
@@ -457,9 +402,6 @@ stopbar_list.column("node", width=100)
 stopbar_list.column("status", width=80)
 stopbar_list.pack(pady=6)
 
-for n in nodes:
-    stop_bars[n] = False
-
 
 def show_home_screen():
     """Replace the interactive canvas with a static 'home screen' layout inspired by the provided PNG.
@@ -476,9 +418,8 @@ def show_home_screen():
     top_frame = ctk.CTkFrame(app, fg_color="#00c853", width=int(screen_width*0.96), height=260)
     top_frame.place(relx=0.5, rely=0.03, anchor="n")
     try:
-        top_img = Image.open("EGNX_Map.tif")
-        # scale image to fit inside top_frame while keeping aspect
-        top_img = top_img.resize((1400, 200), Image.Resampling.LANCZOS)
+        # scale image to fit inside top_frame (cached after the first build)
+        top_img = map_assets.scaled("EGNX_Map.tif", (1400, 200))
         top_photo = ImageTk.PhotoImage(top_img)
         # warn if not CTkImage (CTkImage supports HighDPI scaling)
         try:
@@ -549,4 +490,6 @@ def check_snap(event):
             app.state("normal")
 
 app.bind("<Configure>", check_snap)
-app.mainloop()
+# --profile=cprofile,tracemalloc (or EGNX_PROFILE) writes profiler reports on exit
+with profiling(profile_switch()):
+    app.mainloop()
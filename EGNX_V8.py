@@ -1,10 +1,11 @@
-from PIL import Image, ImageTk
-import warnings
-import math
-import heapq
-from tkinter import ttk
-import tkinter as tk
 import os
+import time
+
+from startup import StartupTimer, wants_timing
+
+# started before anything heavy is imported; run with --startup-timing to
+# print the breakdown up to the first frame and each deferred load
+startup = StartupTimer()
 
 # Screen defaults (used for image sizing and any layout calculations)
 screen_width = 1920
@@ -14,127 +15,111 @@ screen_height = 1080
 script_dir = os.path.dirname(os.path.abspath(__file__))
 
 # ==============================
-# NODES & EDGES
-nodes = {
-    "STAND1a": (846, 200), "STAND1b": (846, 215),
-    "STAND2a": (892, 200), "STAND2b": (892, 215),
-    "STAND3a": (938, 200), "STAND3b": (938, 215),
-    "STAND4a": (984, 200), "STAND4b": (984, 215),
-    "STAND5a": (1089, 200), "STAND5b": (1089, 215),
-    "STAND6a": (1135, 200), "STAND6b": (1135, 215),
-    "STAND7a": (1181, 200), "STAND7b": (1181, 215),
-    "STAND8a": (1227, 200), "STAND8b": (1227, 215),
-    "STAND1N": (846, 241), "STAND2N": (892, 241),
-    "STAND3N": (938, 241), "STAND4N": (984, 241),
-    "STAND5N": (1089, 241), "STAND6N": (1135, 241),
-    "STAND7N": (1181, 241), "STAND8N": (1227, 241),
-    "AQ": (790, 152), "NQ": (790, 241),
-    "AR": (1282, 152), "NR": (1282, 241),
-    "AS": (1036, 152), "NS": (1036, 241),
-    "TXY_A1": (1730, 152), "RWY27_A1": (1730, 90),
-    "TXY_B1": (1498, 152), "RWY27_B1": (1498, 90),
-    "TXY_C1": (675, 152), "RWY09_C1": (675, 90),
-    "TXY_D1": (287, 152), "RWY09_D1": (287, 90),
-    "TXY_E1": (190, 152), "RWY09_E1": (190, 90),
-}
-
-edges = {
-    "RWY27_A1": ["TXY_A1","RWY27_B1"],
-    "RWY27_B1": ["TXY_B1","RWY09_C1"],
-    "RWY09_C1": ["TXY_C1","RWY09_D1"],
-    "RWY09_D1": ["RWY09_E1","TXY_D1"],
-    "TXY_E1": ["RWY09_E1","TXY_D1"],
-    "TXY_C1": ["TXY_D1","AQ"],
-    "AQ": ["NQ","AS"],
-    "NS": ["AS","NQ","NR","STAND1N","STAND2N","STAND3N","STAND4N","STAND5N","STAND6N","STAND7N","STAND8N"],
-    "NQ": ["STAND1N","STAND2N","STAND3N","STAND4N"],
-    "NR": ["STAND5N","STAND6N","STAND7N","STAND8N"],
-    "AR": ["AS","NR","TXY_B1"],
-    "TXY_B1": ["TXY_A1"],
-    "STAND1b": ["STAND1N","STAND1a"],
-    "STAND2b": ["STAND2N","STAND2a"],
-    "STAND3b": ["STAND3N","STAND3a"],
-    "STAND4b": ["STAND4N","STAND4a"],
-    "STAND5b": ["STAND5N","STAND5a"],
-    "STAND6b": ["STAND6N","STAND6a"],
-    "STAND7b": ["STAND7N","STAND7a"],
-    "STAND8b": ["STAND8N","STAND8a"],
-}
-
-# Build bidirectional edges
-for node, neighbors in list(edges.items()):
-    for neighbor in neighbors:
-        if neighbor not in edges:
-            edges[neighbor] = []
-        if node not in edges[neighbor]:
-            edges[neighbor].append(node)
+# LAZY CORE
+# The graph, the simulation and what they import (NumPy through the fleet)
+# are built on first use, so the window can appear before any of it has
+# loaded; the home screen loads them just after its first frame.
+# --layout=<file> (or EGNX_LAYOUT) swaps the built-in EGNX layout for a
+# GeoJSON/CSV one, served from its compiled cache.
+_layout = None
+_graph = None
+_sim = None
+_node_index = None
+
+def get_layout():
+    """The CompiledLayout asked for on the command line, or None for the built-in EGNX layout."""
+    global _layout
+    if _layout is None:
+        from layout_loader import layout_switch, load_layout
+        startup.mark("import layout_loader")
+        path = layout_switch()
+        _layout = load_layout(path) if path else False
+        startup.mark("layout")
+    return _layout or None
+
+def get_graph():
+    """Compiled taxiway graph: integer ids, CSR adjacency and precomputed edge lengths."""
+    global _graph
+    if _graph is None:
+        layout = get_layout()
+        if layout is not None:
+            _graph = layout.graph
+        else:
+            from egnx_layout import nodes, edges, metres_per_pixel
+            startup.mark("import egnx_layout")
+            from taxi_graph import TaxiGraph
+            startup.mark("import taxi_graph")
+            _graph = TaxiGraph(nodes, edges, metres_per_pixel)
+        startup.mark("taxiway graph")
+    return _graph
+
+def traffic_for(flow, hours=24.0):
+    """Seeded traffic over the layout's stands and runway entries."""
+    from traffic import TrafficGenerator
+    layout = get_layout()
+    if layout is not None:
+        generator = TrafficGenerator(layout.stands, layout.runway_entries, flow)
+    else:
+        generator = TrafficGenerator.for_graph(get_graph(), flow)
+    return generator.stream(hours * 3600.0)
+
+def get_sim():
+    """Headless simulation core; the GUI only reads its state.
+
+    Fed departures push back PUSHBACK_TIME after off-block and take off
+    (and leave it) a runway occupancy after reaching their runway entry;
+    finished aircraft are cleared BOARD_CLEAR_AFTER later.
+    """
+    global _sim
+    if _sim is None:
+        graph = get_graph()
+        from event_sim import PUSHBACK_TIME, RUNWAY_OCCUPANCY
+        startup.mark("import event_sim")
+        from simulation import Simulation
+        startup.mark("import simulation")
+        layout = get_layout()
+        # with finished aircraft cleared the board's fleet stays near ten,
+        # well under the ~20 movers where the NumPy batch step starts to pay
+        # (see step/N and step_vectorized/N in benchmark.py), so step per aircraft
+        options = dict(vectorized=False, takeoff_after=RUNWAY_OCCUPANCY, track_status=True,
+                       pushback_time=PUSHBACK_TIME, clear_after=BOARD_CLEAR_AFTER)
+        if layout is not None:
+            _sim = Simulation(graph, layout.route_cache(), runway_entries=layout.runway_entries, **options)
+        else:
+            _sim = Simulation(graph, **options)
+        startup.mark("simulation core")
+    return _sim
+
+def __getattr__(name):
+    # module attributes that used to be built at import time
+    if name == "graph":
+        return get_graph()
+    if name == "sim":
+        return get_sim()
+    if name == "active_aircraft":
+        return get_sim().active_aircraft
+    if name == "stop_bars":
+        return get_sim().stop_bars
+    if name == "node_index":
+        return get_node_index()
+    if name == "layout":
+        return get_layout()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ==============================
 # DIJKSTRA PATHFINDING
 def dijkstra(start, goal):
     """Return shortest path as list of node names from start to goal using Euclidean edge costs."""
-    if start not in nodes or goal not in nodes:
+    graph = get_graph()
+    start_id = graph.id_of(start)
+    goal_id = graph.id_of(goal)
+    if start_id is None or goal_id is None:
         return None
-
-    dist = {start: 0.0}
-    prev = {}
-    pq = [(0.0, start)]
-
-    while pq:
-        cur_cost, node = heapq.heappop(pq)
-        if node == goal:
-            path = []
-            while node in prev:
-                path.append(node)
-                node = prev[node]
-            path.append(start)
-            return list(reversed(path))
-
-        if cur_cost > dist.get(node, float('inf')):
-            continue
-
-        for nxt in edges.get(node, []):
-            if node not in nodes or nxt not in nodes:
-                continue
-            edge_cost = math.dist(nodes[node], nodes[nxt])
-            new_cost = cur_cost + edge_cost
-            if new_cost < dist.get(nxt, float('inf')):
-                dist[nxt] = new_cost
-                prev[nxt] = node
-                heapq.heappush(pq, (new_cost, nxt))
-
-    return None
+    path = graph.dijkstra(start_id, goal_id)
+    return graph.path_names(path) if path is not None else None
 
 # ==============================
-# AIRCRAFT CLASS
-class Aircraft:
-    def __init__(self, callsign, node):
-        self.callsign = callsign
-        self.node = node
-        self.coords = nodes.get(node) if node in nodes else (0, 0)
-        self.triangle_id = None
-        self.label_id = None
-        self.route = []
-        self.spline_points = []
-        self.spline_route_idx_map = []
-        self.dist_along_path = 0.0
-        self.waiting_for_stopbar = False
-        self.status = "At Stand"
-
-# ==============================
-# CATMULL-ROM SPLINE
-def catmull_rom_spline(P0, P1, P2, P3, n_points=20):
-    """Generate Catmull-Rom spline points."""
-    points = []
-    for i in range(n_points):
-        t = i / n_points
-        t2 = t * t
-        t3 = t2 * t
-        x = 0.5 * ((2*P1[0]) + (-P0[0]+P2[0])*t + (2*P0[0]-5*P1[0]+4*P2[0]-P3[0])*t2 + (-P0[0]+3*P1[0]-3*P2[0]+P3[0])*t3)
-        y = 0.5 * ((2*P1[1]) + (-P0[1]+P2[1])*t + (2*P0[1]-5*P1[1]+4*P2[1]-P3[1])*t2 + (-P0[1]+3*P1[1]-3*P2[1]+P3[1])*t3)
-        points.append((x, y))
-    return points
-
+# AIRCRAFT & SPLINES
 def build_spline_path(route, points_per_segment=20):
     """Build a Catmull-Rom spline for the given route.
     
@@ -142,54 +127,115 @@ def build_spline_path(route, points_per_segment=20):
     is the index j such that spline_points[i] corresponds to motion from route[j]
     towards route[j+1].
     """
-    spline_points = []
-    spline_route_idx_map = []
-    if not route or len(route) == 0:
-        return [], []
-    if len(route) == 1:
-        pt = nodes.get(route[0], (0, 0))
-        return [pt], [0]
-
-    n = len(route)
-    for i in range(n-1):
-        P0 = nodes[route[i-1]] if i > 0 else nodes[route[i]]
-        P1 = nodes[route[i]]
-        P2 = nodes[route[i+1]]
-        P3 = nodes[route[i+2]] if i+2 < n else nodes[route[i+1]]
-        seg = catmull_rom_spline(P0, P1, P2, P3, n_points=points_per_segment)
-        spline_points.extend(seg)
-        spline_route_idx_map.extend([i] * len(seg))
-
-    return spline_points, spline_route_idx_map
+    import spline
+    return spline.build_spline_path(get_graph(), route, points_per_segment)
+
+def get_node_index():
+    """Grid index over the layout so clicks and hover need not scan every node."""
+    global _node_index
+    if _node_index is None:
+        from spatial_index import GridIndex
+        graph = get_graph()
+        _node_index = GridIndex.from_points(zip(graph.names, graph.points), cell_size=50)
+    return _node_index
 
 def nearest_node_to(x, y, max_dist=50):
     """Return the node name nearest to (x,y) within max_dist pixels, else None."""
-    best = None
-    best_d = float('inf')
-    for name, (nx, ny) in nodes.items():
-        d = math.hypot(nx - x, ny - y)
-        if d < best_d:
-            best_d = d
-            best = name
-    if best_d <= max_dist:
-        return best
-    return None
+    return get_node_index().nearest(x, y, max_dist)
 
 # ==============================
 # CUSTOMTKINTER GUI SETUP
 try:
     import customtkinter as ctk
+    import tkinter as tk
     HAS_CTK = True
 except Exception:
     ctk = None
     HAS_CTK = False
     print("customtkinter not available — GUI creation will be disabled when imported.")
+startup.mark("import customtkinter")
 
-active_aircraft = {}
+LIVE_TIME_SCALE = 60.0         # simulated seconds per wall-clock second on the status board
+STATUS_REFRESH_MS = 250
+STATUS_ROWS = 10               # row widgets per status-board column
+BOARD_CLEAR_AFTER = 300.0      # simulated seconds arrived/airborne aircraft stay on the board
 aircraft_rows = {}
-stop_bars = {}
 stop_bar_draw_ids = {}
 
+# ==============================
+# INSTRUMENTATION
+def toggle_instruments(event=None):
+    """Switch hot-path timing on or off (the hooks import the simulation, so only on first use)."""
+    from instrumentation import instruments, install_hot_path_hooks
+    install_hot_path_hooks()
+    if instruments.toggle():
+        instruments.reset()
+    print(f"Instrumentation {'on' if instruments.enabled else 'off'}")
+
+def dump_instruments(event=None):
+    from instrumentation import instruments
+    path = instruments.dump_json(f"egnx-instruments-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    print(f"Instrumentation written to {path}")
+
+# ==============================
+# MAP ASSETS
+# pre-scaled map variants are cached on disk; zoomed views come from tiles
+_map_assets = None
+MAP_MAX_ZOOM = 8.0
+
+def get_map_assets():
+    global _map_assets
+    if _map_assets is None:
+        from map_assets import MapAssets
+        startup.mark("import map_assets")
+        _map_assets = MapAssets()
+    return _map_assets
+
+def bind_map_zoom(label, map_path, fitted, size):
+    """Zoom the banner map with the mouse wheel (about the cursor) and pan it by dragging."""
+    pyramid = get_map_assets().pyramid(map_path)
+    source_w, source_h = pyramid.sizes[0]
+    width, height = size
+    base = width / source_w
+    view = {"scale": base, "x": 0.0, "y": 0.0, "drag": None}
+
+    def show():
+        scale = view["scale"]
+        view["x"] = min(max(view["x"], 0.0), source_w - width / scale)
+        view["y"] = min(max(view["y"], 0.0), source_h - height / scale)
+        image = fitted if scale == base else pyramid.view(scale, view["x"], view["y"], width, height)
+        ctk_img = ctk.CTkImage(light_image=image, size=size)
+        label.configure(image=ctk_img)
+        label.image = ctk_img
+
+    def zoom(event):
+        old = view["scale"]
+        new = old * 1.25 if event.num == 4 or getattr(event, "delta", 0) > 0 else old / 1.25
+        new = min(max(new, base), base * MAP_MAX_ZOOM)
+        if new == old:
+            return
+        # keep the map point under the cursor where it is
+        view["x"] += event.x / old - event.x / new
+        view["y"] += event.y / old - event.y / new
+        view["scale"] = new
+        show()
+
+    def start_pan(event):
+        view["drag"] = (event.x, event.y)
+
+    def pan(event):
+        if view["drag"] is None or view["scale"] == base:
+            return
+        x0, y0 = view["drag"]
+        view["drag"] = (event.x, event.y)
+        view["x"] -= (event.x - x0) / view["scale"]
+        view["y"] -= (event.y - y0) / view["scale"]
+        show()
+
+    for sequence, handler in (("<MouseWheel>", zoom), ("<Button-4>", zoom), ("<Button-5>", zoom),
+                              ("<ButtonPress-1>", start_pan), ("<B1-Motion>", pan)):
+        label.bind(sequence, handler)
+
 # ==============================
 # HOME SCREEN DISPLAY
 def build_home_screen():
@@ -200,32 +246,37 @@ def build_home_screen():
         widget.destroy()
 
     # ===== TOP SECTION: Airport Map in green banner =====
-    try:
-        map_path = os.path.join(script_dir, "EGNX_Map_Zoom.tif")
-        top_img = Image.open(map_path)
-
-        # Resize to fit screen width while maintaining aspect ratio
-        # Image is 2234x464, so aspect ratio is ~4.81:1
-        # Target height of ~300px, calculate width to maintain aspect ratio
-        target_height = 310
-        original_width, original_height = top_img.size
-        aspect_ratio = original_width / original_height  # width:height ratio
-        new_width = int(target_height * aspect_ratio)
-        top_img = top_img.resize((new_width, target_height), Image.Resampling.LANCZOS)
-        # Convert PIL Image to CTkImage so customtkinter can handle HighDPI scaling
+    # a placeholder of the banner's size; load_home_screen() fills it in
+    # after the first frame
+    map_label = ctk.CTkLabel(app, text="Loading map…", height=310, font=("Arial", 16, "bold"))
+    map_label.pack(fill="x", expand=False, padx=0, pady=0)
+
+    def load_banner_map():
         try:
-            top_ctk_img = ctk.CTkImage(light_image=top_img, size=(new_width, target_height))
-            img_label = ctk.CTkLabel(app, image=top_ctk_img, text="")
-            img_label.image = top_ctk_img
-        except Exception:
-            top_photo = ImageTk.PhotoImage(top_img)
-            img_label = ctk.CTkLabel(app, image=top_photo, text="")
-            img_label.image = top_photo
-        img_label.pack(fill="x", expand=False, padx=0, pady=0)
-    except Exception as e:
-        print(f"Error loading map image: {e}")
-        placeholder = ctk.CTkLabel(app, text="[Map image not available]", font=("Arial", 16, "bold"), text_color="white")
-        placeholder.pack(pady=10)
+            map_path = os.path.join(script_dir, "EGNX_Map_Zoom.tif")
+            map_assets = get_map_assets()
+
+            # Fit to a height of ~310px, keeping the map's aspect ratio (the
+            # image is 2234x464, ~4.81:1); the scaled copy comes from the disk
+            # cache after the first run
+            target_height = 310
+            new_width, target_height = map_assets.fit_height(map_path, target_height)
+            top_img = map_assets.scaled(map_path, (new_width, target_height))
+            # Convert PIL Image to CTkImage so customtkinter can handle HighDPI scaling
+            try:
+                top_ctk_img = ctk.CTkImage(light_image=top_img, size=(new_width, target_height))
+                map_label.configure(image=top_ctk_img, text="")
+                map_label.image = top_ctk_img
+            except Exception:
+                from PIL import ImageTk
+                top_photo = ImageTk.PhotoImage(top_img)
+                map_label.configure(image=top_photo, text="")
+                map_label.image = top_photo
+            bind_map_zoom(map_label, map_path, top_img, (new_width, target_height))
+        except Exception as e:
+            print(f"Error loading map image: {e}")
+            map_label.configure(text="[Map image not available]", text_color="white")
+        startup.mark("banner map")
 
     # ===== MIDDLE SECTION: Controls Row =====
     controls_main = ctk.CTkFrame(app)
@@ -261,6 +312,8 @@ def build_home_screen():
     ctk.CTkCheckBox(lvp_frame, text="Stop bars", variable=lvp_stop_bars_var).pack(anchor="w", pady=5)
     ctk.CTkCheckBox(lvp_frame, text="Reduced separation", variable=lvp_reduced_sep_var).pack(anchor="w", pady=5)
     ctk.CTkCheckBox(lvp_frame, text="Adaptive sequencing", variable=lvp_adaptive_seq_var).pack(anchor="w", pady=5)
+    # reduced separation switches the simulation's conflict-detection minimum
+    lvp_reduced_sep_var.trace_add("write", lambda *_: get_sim().set_reduced_separation(lvp_reduced_sep_var.get()))
 
     # Center: Movements per hour / Delays in columnar format (matches status board style)
     data_frame = ctk.CTkFrame(controls_main)
@@ -279,6 +332,29 @@ def build_home_screen():
         ("Runway Utilisation", runway_util_var),
     ]
 
+    def run_fast_forward():
+        """Simulate a day of arrivals and departures for the selected settings and show the results."""
+        from event_sim import Scenario, run_day
+        from route_cache import RouteCache
+        scenario = Scenario(
+            ops=ops_var.get(),
+            flow=tfr_var.get(),
+            stop_bars=lvp_stop_bars_var.get(),
+            reduced_separation=lvp_reduced_sep_var.get(),
+            adaptive_sequencing=lvp_adaptive_seq_var.get(),
+        )
+        layout = get_layout()
+        # a cache of its own, so the live session's stop bars and closures
+        # stay out of the day and the day's repairs stay out of the session
+        routes = layout.route_cache() if layout is not None else RouteCache(get_graph())
+        results = run_day(get_graph(), scenario, route_cache=routes, traffic=traffic_for(scenario.flow),
+                          runway_entries=layout.runway_entries if layout is not None else None)
+        movements_per_hour_var.set(f"{results['movements_per_hour']:.1f}")
+        delays_var.set(f"{results['avg_delay'] / 60.0:.1f}min")
+        avg_taxi_time_var.set(f"{results['avg_taxi_time'] / 60.0:.1f}min")
+        runway_util_var.set(f"{results['runway_utilisation'] * 100.0:.0f}%")
+        start_live_run(scenario)
+
     for title, var in metrics:
         col_frame = ctk.CTkFrame(data_frame)
         col_frame.pack(side="left", fill="both", expand=True, padx=2, pady=2)
@@ -313,7 +389,7 @@ def build_home_screen():
         hover_color="#1565c0",
         height=80,
         width=200,
-        command=lambda: None
+        command=run_fast_forward
     )
     run_btn.pack(side="right", padx=20, pady=10)
 
@@ -321,28 +397,84 @@ def build_home_screen():
     status_frame = ctk.CTkFrame(app)
     status_frame.pack(fill="both", expand=True, padx=10, pady=10)
 
-    # Header row with 5 columns
-    columns = ["Departures", "Taxiing", "Runway", "Airborne", "Arrivals"]
-    for col_name in columns:
-        col_frame = ctk.CTkFrame(status_frame, corner_radius=10)
-        col_frame.pack(side="left", fill="both", expand=True, padx=2, pady=2)
-        col_frame.pack_propagate(False)
-        
-        header = ctk.CTkLabel(
-            col_frame, 
-            text=col_name, 
-            font=("Arial", 12, "bold"),
-            fg_color="#99ccff",
-            text_color="black",
-            height=40
-        )
-        header.pack(fill="x")
-        
-        content = ctk.CTkFrame(col_frame, fg_color="#cce5ff")
-        content.pack(fill="both", expand=True)
-        content.pack_propagate(False)
-        content.configure(height=80)
-
+    # Header row with 5 columns; each lists its aircraft through a fixed
+    # set of row labels, however many movements the day has. Built by
+    # load_home_screen() once the simulation core has loaded.
+    live = {"board": None, "lists": {}, "scheduler": None}
+
+    def build_status_board():
+        from scheduler import FrameScheduler
+        from status_board import STATUS_COLUMNS, StatusBoard, VirtualList
+
+        status_lists = live["lists"]
+        for col_name in STATUS_COLUMNS:
+            col_frame = ctk.CTkFrame(status_frame, corner_radius=10)
+            col_frame.pack(side="left", fill="both", expand=True, padx=2, pady=2)
+            col_frame.pack_propagate(False)
+            
+            header = ctk.CTkLabel(
+                col_frame, 
+                text=col_name, 
+                font=("Arial", 12, "bold"),
+                fg_color="#99ccff",
+                text_color="black",
+                height=40
+            )
+            header.pack(fill="x")
+            
+            content = ctk.CTkFrame(col_frame, fg_color="#cce5ff")
+            content.pack(fill="both", expand=True)
+            content.pack_propagate(False)
+            content.configure(height=80)
+            status_lists[col_name] = VirtualList(
+                content,
+                lambda parent: ctk.CTkLabel(parent, text="", anchor="w", text_color="black", font=("Arial", 11), height=18),
+                visible_rows=STATUS_ROWS,
+            )
+
+        live["board"] = StatusBoard()
+        live["scheduler"] = FrameScheduler(app, get_sim(), refresh_status_board, interval_ms=STATUS_REFRESH_MS,
+                                           time_scale=LIVE_TIME_SCALE)
+        startup.mark("status board")
+
+    def refresh_status_board(moving, stopped):
+        board = live["board"]
+        sim = get_sim()
+        board.apply(sim.drain_status_changes())
+        for callsign in sim.drain_cleared():
+            board.remove(callsign)
+        for column in board.drain_changed():
+            live["lists"][column].set_rows(board.rows(column))
+
+    def start_live_run(scenario):
+        """Replay the scenario's traffic through the live simulation onto the status board."""
+        if live["board"] is None:
+            build_status_board()
+        sim = get_sim()
+        for callsign in list(sim.active_aircraft):
+            sim.remove_aircraft(callsign)
+        sim.drain_status_changes()
+        sim.drain_cleared()
+        live["board"].clear()
+        sim.feed_traffic(traffic_for(scenario.flow))
+        refresh_status_board((), ())
+        live["scheduler"].start()
+
+    def load_home_screen(steps):
+        """Run the deferred loads one per event-loop turn, so the window stays live meanwhile."""
+        if not steps:
+            startup.mark("home screen loaded")
+            if wants_timing():
+                print(startup.report())
+            return
+        steps[0]()
+        app.after(1, load_home_screen, steps[1:])
+
+    def build_status_board_once():
+        if live["board"] is None:
+            build_status_board()
+
+    app.after(1, load_home_screen, [load_banner_map, get_sim, build_status_board_once])
 
 if __name__ == "__main__":
     if not HAS_CTK:
@@ -353,6 +485,18 @@ if __name__ == "__main__":
         app.geometry(f"{screen_width}x{screen_height}+100+100")
         app.minsize(800, 600)
         app.state("zoomed")
-        # Build the home screen and start the GUI
+        startup.mark("window")
+        # Build the home screen (the map, simulation core and status board
+        # load just after the first frame) and start the GUI
         build_home_screen()
-        app.mainloop()
\ No newline at end of file
+        startup.mark("home screen widgets")
+        app.update()
+        startup.mark("first frame")
+        # F12 times the hot paths (and the status board's frames), F11
+        # writes what was gathered; --profile=cprofile,tracemalloc (or
+        # EGNX_PROFILE) writes profiler reports on exit
+        from instrumentation import profile_switch, profiling
+        app.bind("<F12>", toggle_instruments)
+        app.bind("<F11>", dump_instruments)
+        with profiling(profile_switch()):
+            app.mainloop()
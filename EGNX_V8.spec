@@ -1,11 +1,13 @@
 # -*- mode: python ; coding: utf-8 -*-
-
+# One-folder build: a one-file exe unpacks every library to a temp folder
+# on each start before the window can appear; a folder starts straight
+# away. The map ships alongside the code (EGNX_V8 looks for it there).
 
 a = Analysis(
     ['EGNX_V8.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[('EGNX_Map_Zoom.tif', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -19,16 +21,14 @@ pyz = PYZ(a.pure)
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.datas,
     [],
+    exclude_binaries=True,
     name='EGNX_V8',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
     upx=True,
     upx_exclude=[],
-    runtime_tmpdir=None,
     console=False,
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -36,3 +36,12 @@ exe = EXE(
     codesign_identity=None,
     entitlements_file=None,
 )
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=True,
+    upx_exclude=[],
+    name='EGNX_V8',
+)
@@ -0,0 +1,533 @@
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import time
+
+from egnx_layout import nodes, edges, metres_per_pixel, runway_entries
+from taxi_graph import TaxiGraph
+from routing import RoutingEngine
+from route_cache import RouteCache
+from simulation import Simulation
+from fleet import HAS_NUMPY
+import spline
+from spline import SplinePath, catmull_rom_spline
+from spatial_index import GridIndex
+from conflicts import ConflictDetector
+from reservations import ReservationPlanner
+from event_sim import Scenario, run_day
+from render_layer import SpriteLayer
+
+# ==============================
+# SYNTHETIC LAYOUTS
+def scaled_layout(copies, tile_width=1800, tile_height=300):
+    """Tile the EGNX layout `copies` times on a grid and link neighbouring tiles.
+
+    Returns (nodes, edges) dicts in the same shape as egnx_layout, with node
+    names suffixed "#<tile>". Tiles are joined runway-to-runway and
+    taxiway-to-taxiway sideways, and apron-to-apron vertically.
+    """
+    cols = max(1, int(round(copies ** 0.5)))
+    big_nodes = {}
+    big_edges = {}
+    for c in range(copies):
+        dx = (c % cols) * tile_width
+        dy = (c // cols) * tile_height
+        for name, (x, y) in nodes.items():
+            big_nodes[f"{name}#{c}"] = (x + dx, y + dy)
+        for name, neighbors in edges.items():
+            big_edges[f"{name}#{c}"] = [f"{n}#{c}" for n in neighbors]
+        if c % cols:
+            big_edges.setdefault(f"RWY27_A1#{c - 1}", []).append(f"RWY09_E1#{c}")
+            big_edges.setdefault(f"TXY_A1#{c - 1}", []).append(f"TXY_E1#{c}")
+        if c >= cols:
+            big_edges.setdefault(f"NS#{c - cols}", []).append(f"AS#{c}")
+            big_edges.setdefault(f"NR#{c - cols}", []).append(f"AR#{c}")
+    return big_nodes, big_edges
+
+
+# ==============================
+# ROUTING
+def bench_routing(copies=1, queries=200, seed=0):
+    """Time each routing algorithm on random stand->runway queries.
+
+    Returns {algorithm: (mean_us_per_query, mean_nodes_expanded)}.
+    """
+    layout_nodes, layout_edges = scaled_layout(copies) if copies > 1 else (nodes, edges)
+    graph = TaxiGraph(layout_nodes, layout_edges)
+    engine = RoutingEngine(graph)
+    rng = random.Random(seed)
+    stands = [i for i, name in enumerate(graph.names) if name.split("#")[0].endswith("a")]
+    runways = [i for i, name in enumerate(graph.names) if name.split("#")[0] in runway_entries]
+    pairs = [(rng.choice(stands), rng.choice(runways)) for _ in range(queries)]
+
+    results = {}
+    for algorithm in RoutingEngine.ALGORITHMS:
+        expanded = 0
+        t0 = time.perf_counter()
+        for start, goal in pairs:
+            expanded += engine.route_ids(start, goal, algorithm).expanded
+        elapsed = time.perf_counter() - t0
+        results[algorithm] = (elapsed / queries * 1e6, expanded / queries)
+    return results
+
+
+# ==============================
+# NEAREST-NODE QUERIES
+def bench_nearest(copies=1, queries=2000, seed=0):
+    """Time nearest-node lookups, linear scan vs GridIndex; returns (scan us, grid us)."""
+    layout_nodes, _ = scaled_layout(copies)
+    index = GridIndex.from_points(layout_nodes.items(), cell_size=50)
+    rng = random.Random(seed)
+    xs = [x for x, _ in layout_nodes.values()]
+    ys = [y for _, y in layout_nodes.values()]
+    points = [(rng.uniform(min(xs), max(xs)), rng.uniform(min(ys), max(ys))) for _ in range(queries)]
+
+    t0 = time.perf_counter()
+    for x, y in points:
+        min(layout_nodes, key=lambda n: math.hypot(layout_nodes[n][0] - x, layout_nodes[n][1] - y))
+    scan = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for x, y in points:
+        index.nearest(x, y, 50)
+    grid = time.perf_counter() - t0
+    return scan / queries * 1e6, grid / queries * 1e6
+
+
+# ==============================
+# CONFLICT DETECTION
+def bench_conflicts(n_aircraft=1000, checks=50, seed=0):
+    """Time one separation check over n_aircraft spread across a scaled layout; returns us per check."""
+    copies = max(1, n_aircraft // 50)
+    layout_nodes, _ = scaled_layout(copies)
+    rng = random.Random(seed)
+    points = list(layout_nodes.values())
+    traffic = []
+    for i in range(n_aircraft):
+        x, y = rng.choice(points)
+        traffic.append((f"BM{i}", x + rng.uniform(-40, 40), y + rng.uniform(-40, 40),
+                        rng.uniform(-math.pi, math.pi), rng.uniform(0.0, 3000.0)))
+    detector = ConflictDetector(metres_per_pixel)
+    t0 = time.perf_counter()
+    for _ in range(checks):
+        detector.find_holds(traffic)
+    return (time.perf_counter() - t0) / checks * 1e6
+
+
+# ==============================
+# RESERVATION PLANNING
+def bench_reservations(n_aircraft=100, interval=20.0, seed=0):
+    """Plan n_aircraft stand-to-runway departures released every `interval` seconds.
+
+    Several departures can share a stand, so some only fit by leaving later
+    (see ReservationPlanner.retry_step). Returns (ms per plan, states
+    expanded per plan, plans found).
+    """
+    graph = TaxiGraph(nodes, edges, metres_per_pixel)
+    planner = ReservationPlanner(graph)
+    rng = random.Random(seed)
+    stands = [s for s in nodes if s.endswith("a")]
+    found = 0
+    t0 = time.perf_counter()
+    for i in range(n_aircraft):
+        if planner.plan(f"BM{i}", rng.choice(stands), rng.choice(runway_entries), i * interval, 7.7):
+            found += 1
+    elapsed = time.perf_counter() - t0
+    return elapsed / n_aircraft * 1e3, planner.expanded / n_aircraft, found
+
+
+# ==============================
+# SPLINE BUILDING
+def bench_spline_build(routes=500, seed=0):
+    """Time SplinePath.from_route for stand-to-runway routes, cold vs cached segments.
+
+    Returns (cold us/route, warm us/route).
+    """
+    graph = TaxiGraph(nodes, edges, metres_per_pixel)
+    rng = random.Random(seed)
+    stands = [graph.id_of(s) for s in nodes if s.endswith("a")]
+    runways = [graph.id_of(r) for r in runway_entries]
+    pairs = [(rng.choice(stands), rng.choice(runways)) for _ in range(routes)]
+    paths = [graph.path_names(graph.dijkstra(a, b)) for a, b in pairs]
+    timings = []
+    for clear in (True, False):
+        total = 0.0
+        for route in paths:
+            if clear:
+                spline.segment_samples.cache_clear()
+                spline.segment_coefficients.cache_clear()
+            t0 = time.perf_counter()
+            SplinePath.from_route(graph, route, metres_per_pixel)
+            total += time.perf_counter() - t0
+        timings.append(total / routes * 1e6)
+    return tuple(timings)
+
+
+# ==============================
+# STEPPING
+def bench_stepping(n_aircraft=1000, steps=200, vectorized=True, seed=0):
+    """Time Simulation.step() with n_aircraft taxiing; returns mean us per step."""
+    graph = TaxiGraph(nodes, edges, metres_per_pixel)
+    sim = Simulation(graph, vectorized=vectorized, conflict_detection=False)
+    rng = random.Random(seed)
+    stands = [s for s in nodes if s.endswith("a")]
+    for i in range(n_aircraft):
+        callsign = f"BM{i}"
+        sim.add_aircraft(callsign, rng.choice(stands))
+        # slow enough that nobody arrives during the timed steps
+        sim.taxi_to(callsign, rng.choice(runway_entries), speed=rng.uniform(1.0, 5.0))
+    t0 = time.perf_counter()
+    for _ in range(steps):
+        sim.step()
+    return (time.perf_counter() - t0) / steps * 1e6
+
+
+# ==============================
+# FAST-FORWARD
+def bench_event_day(ops="Normal Ops", flow="High", hours=24.0, seed=0):
+    """Time a discrete-event run of `hours` of traffic; returns (seconds, movements)."""
+    graph = TaxiGraph(nodes, edges, metres_per_pixel)
+    t0 = time.perf_counter()
+    results = run_day(graph, Scenario(ops, flow), seed=seed, hours=hours)
+    return time.perf_counter() - t0, results["movements"]
+
+
+# ==============================
+# LATENCY STATISTICS
+def percentile(sorted_values, q):
+    """q-th percentile (0-100) of an already sorted list, linearly interpolated."""
+    if not sorted_values:
+        return math.nan
+    k = (len(sorted_values) - 1) * q / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def latency_stats(samples, per_call=1):
+    """Summary of per-call wall times in seconds: throughput and latency percentiles in us.
+
+    per_call is the number of operations each sample covers (e.g. aircraft
+    in a step), so throughput counts operations rather than calls.
+    """
+    ordered = sorted(samples)
+    total = sum(ordered)
+    return {
+        "calls": len(ordered),
+        "ops_per_s": len(ordered) * per_call / total if total > 0.0 else math.inf,
+        "mean_us": total / len(ordered) * 1e6,
+        "p50_us": percentile(ordered, 50) * 1e6,
+        "p90_us": percentile(ordered, 90) * 1e6,
+        "p99_us": percentile(ordered, 99) * 1e6,
+        "max_us": ordered[-1] * 1e6,
+    }
+
+
+def time_each(fn, items, per_call=1):
+    """Call fn(item) for every item, timing each call; return latency_stats()."""
+    clock = time.perf_counter
+    samples = []
+    for item in items:
+        t0 = clock()
+        fn(item)
+        samples.append(clock() - t0)
+    return latency_stats(samples, per_call)
+
+
+# ==============================
+# RENDERING (no Tk)
+class StubCanvas:
+    """Stands in for a Tk canvas: hands out item ids and counts calls, draws nothing."""
+
+    def __init__(self):
+        self.items = 0
+        self.calls = 0
+
+    def create_polygon(self, *args, **kwargs):
+        self.items += 1
+        self.calls += 1
+        return self.items
+
+    create_text = create_polygon
+
+    def coords(self, item, *args):
+        self.calls += 1
+
+    def itemconfigure(self, item, **kwargs):
+        self.calls += 1
+
+
+def render_frames(n_aircraft, frames=60, vectorized=True, seed=0, frame_dt=1.0 / 3.0):
+    """Draw frames of a taxiing fleet through SpriteLayer onto a StubCanvas.
+
+    Each frame advances the simulation by frame_dt (the GUI's 10x time
+    scale at 30 fps) outside the timing, then times the render pass the
+    GUI does. Returns (latency_stats per frame, canvas calls per frame).
+    """
+    graph = TaxiGraph(nodes, edges, metres_per_pixel)
+    sim = Simulation(graph, vectorized=vectorized and HAS_NUMPY, conflict_detection=False)
+    canvas = StubCanvas()
+    sprites = SpriteLayer(canvas)
+    rng = random.Random(seed)
+    stands = [s for s in nodes if s.endswith("a")]
+    for i in range(n_aircraft):
+        ac = sim.add_aircraft(f"BM{i}", rng.choice(stands))
+        sim.taxi_to(ac.callsign, rng.choice(runway_entries), speed=rng.uniform(1.0, 5.0))
+        sprites.add(ac)
+    fleet = sim.fleet
+    calls = canvas.calls
+    samples = []
+    for _ in range(frames):
+        sim.advance(frame_dt)
+        t0 = time.perf_counter()
+        sim.sync_positions()
+        triangles = fleet.triangles().tolist() if fleet is not None else None
+        for ac in sim.moving.values():
+            sprites.draw(ac, triangles[ac.slot] if triangles else None)
+        for ac in sim.drain_stopped():
+            sprites.draw(ac, force=True)
+        samples.append(time.perf_counter() - t0)
+    return latency_stats(samples, n_aircraft), (canvas.calls - calls) / frames
+
+
+# ==============================
+# SUITE
+SCALES = (1, 10, 100, 1000)            # copies of the EGNX layout
+FLEETS = (10, 100, 1000, 10000)        # aircraft
+QUICK_SCALES = (1, 10)
+QUICK_FLEETS = (10, 100)
+
+
+def _stand_runway_pairs(graph, count, rng):
+    stands = [i for i, name in enumerate(graph.names) if name.split("#")[0].endswith("a")]
+    runways = [i for i, name in enumerate(graph.names) if name.split("#")[0] in runway_entries]
+    return [(rng.choice(stands), rng.choice(runways)) for _ in range(count)]
+
+
+def run_suite(scales=SCALES, fleets=FLEETS, seed=0, budget=2000):
+    """Time every hot path over the layout scales and fleet sizes.
+
+    budget bounds the work per entry: fewer queries on bigger graphs and
+    fewer steps for bigger fleets, so the full suite stays in minutes.
+    Returns {"meta": ..., "results": {name: latency_stats()}} ready for
+    JSON; names read "<hot path>/<size>".
+    """
+    rng = random.Random(seed)
+    results = {}
+    for copies in scales:
+        layout_nodes, layout_edges = scaled_layout(copies) if copies > 1 else (nodes, edges)
+        graph = TaxiGraph(layout_nodes, layout_edges, metres_per_pixel)
+        engine = RoutingEngine(graph)
+        queries = max(10, budget // (10 * copies))
+        pairs = _stand_runway_pairs(graph, queries, rng)
+        results[f"dijkstra/{copies}x"] = time_each(lambda p: graph.dijkstra(*p), pairs)
+        for algorithm in ("astar", "bidirectional"):
+            results[f"{algorithm}/{copies}x"] = time_each(lambda p: engine.route_ids(p[0], p[1], algorithm), pairs)
+        index = GridIndex.from_points(layout_nodes.items(), cell_size=50)
+        xs = [x for x, _ in layout_nodes.values()]
+        ys = [y for _, y in layout_nodes.values()]
+        points = [(rng.uniform(min(xs), max(xs)), rng.uniform(min(ys), max(ys))) for _ in range(budget)]
+        results[f"nearest_node/{copies}x"] = time_each(lambda p: index.nearest(p[0], p[1], 50), points)
+        # close and reopen a node with one copy's runway-entry trees cached
+        cache = RouteCache(graph, [name for name in graph.names if name.split("#")[0] in runway_entries][:5])
+        closures = rng.sample(graph.names, min(len(graph), max(10, budget // (20 * copies))))
+        results[f"closure_repair/{copies}x"] = time_each(
+            lambda name: (cache.close_node(name), cache.reopen_node(name)), closures, per_call=2)
+
+    graph = TaxiGraph(nodes, edges, metres_per_pixel)
+    routes = [graph.path_names(graph.dijkstra(a, b)) for a, b in _stand_runway_pairs(graph, 200, rng)]
+    controls = [[nodes[n] for n in rng.sample(list(nodes), 4)] for _ in range(budget)]
+    results["catmull_rom_spline/segment"] = time_each(lambda c: catmull_rom_spline(*c), controls)
+    results["build_spline_path/route"] = time_each(lambda r: spline.build_spline_path(graph, r), routes)
+
+    def from_route_cold(route):
+        spline.segment_samples.cache_clear()
+        spline.segment_coefficients.cache_clear()
+        SplinePath.from_route(graph, route, metres_per_pixel)
+    results["spline_path/cold"] = time_each(from_route_cold, routes)
+    results["spline_path/warm"] = time_each(lambda r: SplinePath.from_route(graph, r, metres_per_pixel), routes)
+
+    stands = [s for s in nodes if s.endswith("a")]
+    for n_aircraft in fleets:
+        steps = max(5, min(200, budget * 10 // n_aircraft))
+        modes = (False, True) if HAS_NUMPY else (False,)
+        for vectorized in modes:
+            sim = Simulation(graph, vectorized=vectorized, conflict_detection=False)
+            for i in range(n_aircraft):
+                sim.add_aircraft(f"BM{i}", rng.choice(stands))
+                sim.taxi_to(f"BM{i}", rng.choice(runway_entries), speed=rng.uniform(1.0, 5.0))
+            name = "step_vectorized" if vectorized else "step"
+            results[f"{name}/{n_aircraft}"] = time_each(lambda _: sim.step(), range(steps), n_aircraft)
+        frames = max(5, min(60, budget * 10 // n_aircraft))
+        stats, calls = render_frames(n_aircraft, frames, seed=seed)
+        stats["canvas_calls_per_frame"] = calls
+        results[f"render/{n_aircraft}"] = stats
+    return {"meta": run_metadata(), "results": results}
+
+
+# ==============================
+# SELF-CHECKS
+def check_closure_repair(copies=1, steps=300, seed=0):
+    """Compare repaired route trees with freshly built ones after random closures.
+
+    Closes and reopens random nodes and edges and lights random stop bars on
+    a RouteCache, and after each change checks every cached tree against a
+    new RouteCache built with the same constraints: costs must match and each
+    next hop must be an open edge on a shortest route. Returns a list of
+    mismatches (empty when the repairs agree) and the repair count.
+    """
+    rng = random.Random(seed)
+    layout_nodes, layout_edges = scaled_layout(copies) if copies > 1 else (nodes, edges)
+    graph = TaxiGraph(layout_nodes, layout_edges, metres_per_pixel)
+    roots = [name for name in graph.names
+             if name.split("#")[0] in runway_entries or name.startswith("STAND")][:30]
+    cache = RouteCache(graph, roots)
+    pairs = [(graph.names[u], graph.names[v]) for u, v, _ in graph.edge_items() if u < v]
+    problems = []
+
+    def compare(step):
+        fresh = RouteCache(graph, stop_bar_penalty=cache.stop_bar_penalty)
+        fresh.penalty = list(cache.penalty)
+        fresh.closed_nodes = list(cache.closed_nodes)
+        fresh.closed_edges = set(cache.closed_edges)
+        for root, tree in cache.trees.items():
+            fresh.cost(graph.names[root], graph.names[root])
+            expected = fresh.trees[root].dist
+            for u in range(len(graph)):
+                got, want = tree.dist[u], expected[u]
+                if not (got == want or math.isclose(got, want, rel_tol=1e-12)):
+                    problems.append(f"step {step}: cost {graph.names[u]}->{graph.names[root]} {got} != {want}")
+                    continue
+                if u == root or got == math.inf:
+                    continue
+                v = tree.next_hop[u]
+                weight = graph.edge_weight(u, v)
+                if (weight is None or cache.closed_nodes[v] or (min(u, v), max(u, v)) in cache.closed_edges
+                        or not math.isclose(got, tree.dist[v] + cache.penalty[v] + weight, rel_tol=1e-12)):
+                    problems.append(f"step {step}: bad next hop {graph.names[u]}->{graph.names[v]}")
+
+    for step in range(steps):
+        r = rng.random()
+        closed = [name for name, c in zip(graph.names, cache.closed_nodes) if c]
+        if r < 0.25:
+            cache.close_node(rng.choice(graph.names))
+        elif r < 0.45 and closed:
+            cache.reopen_node(rng.choice(closed))
+        elif r < 0.65:
+            cache.close_edge(*rng.choice(pairs))
+        elif r < 0.8 and cache.closed_edges:
+            u, v = rng.choice(sorted(cache.closed_edges))
+            cache.reopen_edge(graph.names[u], graph.names[v])
+        else:
+            cache.set_stop_bar(rng.choice(graph.names), rng.random() < 0.5)
+        compare(step)
+        if problems:
+            break
+    return problems, cache.repairs
+
+
+def run_metadata():
+    """Where and on what a suite ran, stored alongside its results."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return {
+        "commit": commit or None,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": HAS_NUMPY,
+    }
+
+
+def format_suite(suite):
+    lines = [f"{'hot path':<30} {'ops/s':>12} {'p50 us':>10} {'p90 us':>10} {'p99 us':>10}"]
+    for name, stats in suite["results"].items():
+        lines.append(f"{name:<30} {stats['ops_per_s']:12.1f} {stats['p50_us']:10.1f} "
+                     f"{stats['p90_us']:10.1f} {stats['p99_us']:10.1f}")
+    return "\n".join(lines)
+
+
+def compare_suites(baseline, current, threshold=0.10):
+    """Lines for entries whose p50 latency moved by more than threshold (a fraction)."""
+    lines = []
+    for name, stats in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None or not old["p50_us"]:
+            continue
+        change = stats["p50_us"] / old["p50_us"] - 1.0
+        if abs(change) > threshold:
+            verdict = "slower" if change > 0 else "faster"
+            lines.append(f"{name:<30} {old['p50_us']:10.1f} -> {stats['p50_us']:10.1f} us  {change * 100:+6.1f}% {verdict}")
+    return lines
+
+
+def print_classic():
+    """The original per-path report (algorithm and implementation comparisons)."""
+    for copies in (1, 10, 100):
+        print(f"Routing, {copies}x EGNX ({copies * len(nodes)} nodes)")
+        for algorithm, (us, expanded) in bench_routing(copies).items():
+            print(f"  {algorithm:<14} {us:10.1f} us/query  {expanded:10.1f} nodes expanded/query")
+    for copies in (1, 10, 100):
+        scan, grid = bench_nearest(copies)
+        print(f"Nearest node, {copies}x EGNX")
+        print(f"  linear scan    {scan:10.1f} us/query")
+        print(f"  grid index     {grid:10.1f} us/query")
+    ms, expanded, found = bench_reservations()
+    print(f"Reservation planning, 100 departures  {ms:8.2f} ms/plan  {expanded:8.1f} states/plan  {found} booked")
+    cold, warm = bench_spline_build()
+    print("Spline building, EGNX stand-to-runway routes")
+    print(f"  uncached       {cold:10.1f} us/route")
+    print(f"  cached         {warm:10.1f} us/route")
+    for n_aircraft in (10, 100, 1000):
+        print(f"Separation check, {n_aircraft} aircraft  {bench_conflicts(n_aircraft):10.1f} us/check")
+    for n_aircraft in (10, 100, 1000):
+        print(f"Stepping, {n_aircraft} aircraft")
+        print(f"  per-aircraft   {bench_stepping(n_aircraft, vectorized=False):10.1f} us/step")
+        if HAS_NUMPY:
+            print(f"  vectorized     {bench_stepping(n_aircraft):10.1f} us/step")
+    for ops in ("Normal Ops", "Low Visibility Ops"):
+        seconds, movements = bench_event_day(ops)
+        print(f"Event-driven 24 h High day, {ops:<18} {seconds:8.3f} s  {movements} movements")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks for routing, splines, stepping and rendering")
+    parser.add_argument("--json", metavar="PATH", help="write suite results to PATH")
+    parser.add_argument("--compare", metavar="PATH", help="baseline JSON to compare p50 latencies against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative p50 change to report (default 0.10)")
+    parser.add_argument("--quick", action="store_true", help="only the small scales and fleets")
+    parser.add_argument("--classic", action="store_true", help="print the algorithm comparison report instead")
+    parser.add_argument("--check", action="store_true",
+                        help="check closure repairs against fresh route trees instead of timing")
+    args = parser.parse_args()
+    if args.check:
+        failed = False
+        for copies in (1, 4):
+            problems, repairs = check_closure_repair(copies, steps=300 if copies == 1 else 100)
+            print(f"closure repair, {copies}x EGNX: {repairs} repairs, "
+                  f"{'ok' if not problems else f'{len(problems)} mismatches'}")
+            if problems:
+                print("\n".join(problems[:10]))
+                failed = True
+        raise SystemExit(1 if failed else 0)
+    if args.classic:
+        print_classic()
+    else:
+        scales, fleets = (QUICK_SCALES, QUICK_FLEETS) if args.quick else (SCALES, FLEETS)
+        suite = run_suite(scales, fleets)
+        print(format_suite(suite))
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(suite, f, indent=2)
+        if args.compare:
+            with open(args.compare) as f:
+                baseline = json.load(f)
+            changes = compare_suites(baseline, suite, args.threshold)
+            print(f"\nAgainst {args.compare} (commit {baseline['meta'].get('commit')}):")
+            print("\n".join(changes) if changes else f"  no p50 change above {args.threshold * 100:.0f}%")
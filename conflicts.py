@@ -0,0 +1,147 @@
+import math
+
+from spatial_index import GridIndex
+
+# ==============================
+# SEPARATION MINIMA
+SEPARATION = 60.0              # metres between taxiing aircraft
+REDUCED_SEPARATION = 30.0      # metres with the "Reduced separation" LVP improvement
+# another aircraft is "ahead" when it lies within +/-30 degrees of our heading
+AHEAD_COS = math.cos(math.radians(30.0))
+
+
+# ==============================
+# CONFLICT DETECTION
+class ConflictDetector:
+    """Find taxiing aircraft that must hold to keep separation.
+
+    Broad phase: positions go into a GridIndex whose cells are one
+    separation minimum wide, so only aircraft in neighbouring cells are
+    ever compared. Narrow phase: a pair closer than the minimum is a
+    conflict, and the aircraft that has the other ahead of it (the
+    trailing one) holds. When both face each other the one with further
+    to go gives way. Rings of aircraft all waiting on one another (e.g.
+    opposite-direction traffic meeting on a single taxilane) are broken by
+    releasing one member, since holding alone cannot resolve them.
+    """
+
+    def __init__(self, metres_per_pixel=1.0, separation=SEPARATION, reduced_separation=REDUCED_SEPARATION):
+        self.metres_per_pixel = metres_per_pixel
+        self.separation = separation
+        self.reduced_separation = reduced_separation
+        self.reduced = False
+        self._index = GridIndex(self.radius)
+
+    @property
+    def minimum(self):
+        """Separation minimum in force, in metres."""
+        return self.reduced_separation if self.reduced else self.separation
+
+    @property
+    def radius(self):
+        """Separation minimum in force, in layout pixels."""
+        return self.minimum / self.metres_per_pixel
+
+    def set_reduced(self, reduced):
+        self.reduced = bool(reduced)
+        self._index = GridIndex(self.radius)
+
+    def find_holds(self, traffic):
+        """Return {trailing callsign: leader callsign} for every conflict.
+
+        traffic is an iterable of (callsign, x, y, heading, remaining) with
+        x/y in pixels, heading in radians and remaining the metres left on
+        the aircraft's route.
+        """
+        index = self._index
+        state = {}
+        for callsign, x, y, heading, remaining in traffic:
+            index.move(callsign, x, y)
+            state[callsign] = (x, y, math.cos(heading), math.sin(heading), remaining)
+        for callsign in [k for k in index.positions if k not in state]:
+            index.remove(callsign)
+
+        leaders = {}
+        for a, b, d in index.pairs(self.radius):
+            xa, ya, ca, sa, rem_a = state[a]
+            xb, yb, cb, sb, rem_b = state[b]
+            if d > 0.0:
+                dx = (xb - xa) / d
+                dy = (yb - ya) / d
+                b_ahead_of_a = ca * dx + sa * dy >= AHEAD_COS
+                a_ahead_of_b = -(cb * dx + sb * dy) >= AHEAD_COS
+            else:
+                b_ahead_of_a = a_ahead_of_b = True
+            if b_ahead_of_a and a_ahead_of_b:
+                # nose to nose (or crossing): the one with further to go waits
+                if (rem_a, a) > (rem_b, b):
+                    leaders.setdefault(a, []).append((d, b))
+                else:
+                    leaders.setdefault(b, []).append((d, a))
+            elif b_ahead_of_a:
+                leaders.setdefault(a, []).append((d, b))
+            elif a_ahead_of_b:
+                leaders.setdefault(b, []).append((d, a))
+
+        # aircraft waiting on each other in a ring would hold forever; let the
+        # one nearest the end of its route in each ring go, and look again
+        # since a group can hold more than one ring
+        rings = _waiting_rings(leaders)
+        while rings:
+            for ring in rings:
+                leaders.pop(min(ring, key=lambda c: (state[c][4], c)))
+            rings = _waiting_rings(leaders)
+        return {callsign: min(found)[1] for callsign, found in leaders.items()}
+
+
+def _waiting_rings(leaders):
+    """Return the strongly connected groups (2+ aircraft) of the waits-for graph.
+
+    leaders maps each held callsign to [(distance, leader callsign), ...].
+    Iterative Tarjan, so long queues cannot hit the recursion limit.
+    """
+    index = {}
+    low = {}
+    on_stack = set()
+    stack = []
+    rings = []
+    counter = 0
+    for root in leaders:
+        if root in index:
+            continue
+        work = [(root, iter(leaders.get(root, ())))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, edges = work[-1]
+            advanced = False
+            for _, nxt in edges:
+                if nxt not in index:
+                    index[nxt] = low[nxt] = counter
+                    counter += 1
+                    stack.append(nxt)
+                    on_stack.add(nxt)
+                    work.append((nxt, iter(leaders.get(nxt, ()))))
+                    advanced = True
+                    break
+                if nxt in on_stack:
+                    low[node] = min(low[node], index[nxt])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                group = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    group.append(member)
+                    if member == node:
+                        break
+                if len(group) > 1:
+                    rings.append(group)
+    return rings
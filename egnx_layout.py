@@ -0,0 +1,56 @@
+# ==============================
+# EGNX TAXIWAY LAYOUT
+# Node coordinates are canvas pixels on the EGNX_Map_Zoom.tif banner.
+# Edges only need to be listed in one direction; TaxiGraph makes them
+# bidirectional when it compiles the layout.
+nodes = {
+    "STAND1a": (846, 200), "STAND1b": (846, 215),
+    "STAND2a": (892, 200), "STAND2b": (892, 215),
+    "STAND3a": (938, 200), "STAND3b": (938, 215),
+    "STAND4a": (984, 200), "STAND4b": (984, 215),
+    "STAND5a": (1089, 200), "STAND5b": (1089, 215),
+    "STAND6a": (1135, 200), "STAND6b": (1135, 215),
+    "STAND7a": (1181, 200), "STAND7b": (1181, 215),
+    "STAND8a": (1227, 200), "STAND8b": (1227, 215),
+    "STAND1N": (846, 241), "STAND2N": (892, 241),
+    "STAND3N": (938, 241), "STAND4N": (984, 241),
+    "STAND5N": (1089, 241), "STAND6N": (1135, 241),
+    "STAND7N": (1181, 241), "STAND8N": (1227, 241),
+    "AQ": (790, 152), "NQ": (790, 241),
+    "AR": (1282, 152), "NR": (1282, 241),
+    "AS": (1036, 152), "NS": (1036, 241),
+    "TXY_A1": (1730, 152), "RWY27_A1": (1730, 90),
+    "TXY_B1": (1498, 152), "RWY27_B1": (1498, 90),
+    "TXY_C1": (675, 152), "RWY09_C1": (675, 90),
+    "TXY_D1": (287, 152), "RWY09_D1": (287, 90),
+    "TXY_E1": (190, 152), "RWY09_E1": (190, 90),
+}
+
+edges = {
+    "RWY27_A1": ["TXY_A1","RWY27_B1"],
+    "RWY27_B1": ["TXY_B1","RWY09_C1"],
+    "RWY09_C1": ["TXY_C1","RWY09_D1"],
+    "RWY09_D1": ["RWY09_E1","TXY_D1"],
+    "TXY_E1": ["RWY09_E1","TXY_D1"],
+    "TXY_C1": ["TXY_D1","AQ"],
+    "AQ": ["NQ","AS"],
+    "NS": ["AS","NQ","NR","STAND1N","STAND2N","STAND3N","STAND4N","STAND5N","STAND6N","STAND7N","STAND8N"],
+    "NQ": ["STAND1N","STAND2N","STAND3N","STAND4N"],
+    "NR": ["STAND5N","STAND6N","STAND7N","STAND8N"],
+    "AR": ["AS","NR","TXY_B1"],
+    "TXY_B1": ["TXY_A1"],
+    "STAND1b": ["STAND1N","STAND1a"],
+    "STAND2b": ["STAND2N","STAND2a"],
+    "STAND3b": ["STAND3N","STAND3a"],
+    "STAND4b": ["STAND4N","STAND4a"],
+    "STAND5b": ["STAND5N","STAND5a"],
+    "STAND6b": ["STAND6N","STAND6a"],
+    "STAND7b": ["STAND7N","STAND7a"],
+    "STAND8b": ["STAND8N","STAND8a"],
+}
+
+# Approximate ground scale: the A1 and E1 holds on runway 09/27 are ~2.7 km apart
+metres_per_pixel = 1.75
+
+# Runway holding points offered by the "Taxi to Runway" selector
+runway_entries = ["RWY27_A1", "RWY27_B1", "RWY09_C1", "RWY09_D1", "RWY09_E1"]
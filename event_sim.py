@@ -0,0 +1,396 @@
+import heapq
+import math
+
+from conflicts import SEPARATION, REDUCED_SEPARATION
+from route_cache import RouteCache
+from simulation import TAXI_SPEED, KT_TO_MS
+from spline import SplinePath
+from traffic import ARRIVAL, TRAFFIC_FLOW_RATES, TrafficGenerator
+
+# ==============================
+# OPERATING PARAMETERS
+PUSHBACK_TIME = 120.0             # seconds from off-block to taxi start
+RUNWAY_OCCUPANCY = 60.0           # seconds a departure holds the runway
+LVP_RUNWAY_OCCUPANCY = 80.0       # ILS sensitive areas protected under LVP
+ARRIVAL_OCCUPANCY = 50.0          # seconds from touchdown to vacating the runway
+LVP_ARRIVAL_OCCUPANCY = 90.0      # ... with the wider LVP landing spacing
+LVP_TAXI_SPEED = 10.0 * KT_TO_MS
+LVP_SEPARATION_FACTOR = 2.0
+LVP_CLEARANCE_DELAY = 30.0        # seconds to clear the next departure onto the runway by R/T
+STOP_BAR_CLEARANCE_DELAY = 10.0   # ... and with switchable stop bars at the holds
+
+# Event kinds, in the order they happen to a departure (reaching a lit
+# stop bar is handled inside EDGE_ENTRY, as the aircraft holds where it is)
+PUSHBACK = "pushback"
+EDGE_ENTRY = "edge_entry"
+STOP_BAR_CLEARED = "stop_bar_cleared"
+STOP_BAR_LIT = "stop_bar_lit"
+RUNWAY_ENTRY = "runway_entry"
+TAKEOFF = "takeoff"
+# ... and to an arrival (which then taxis with EDGE_ENTRY events)
+LANDING = "landing"
+IN_BLOCKS = "in_blocks"
+
+
+class Scenario:
+    """Home-screen settings and the simulation parameters they imply.
+
+    ops is "Normal Ops" or "Low Visibility Ops" and flow one of
+    TRAFFIC_FLOW_RATES. The three LVP improvements only change anything
+    under Low Visibility Ops.
+    """
+
+    __slots__ = ("ops", "flow", "stop_bars", "reduced_separation", "adaptive_sequencing")
+
+    def __init__(self, ops="Normal Ops", flow="Low", stop_bars=False, reduced_separation=False,
+                 adaptive_sequencing=False):
+        self.ops = ops
+        self.flow = flow
+        self.stop_bars = stop_bars
+        self.reduced_separation = reduced_separation
+        self.adaptive_sequencing = adaptive_sequencing
+
+    def __repr__(self):
+        improvements = [name for name in ("stop_bars", "reduced_separation", "adaptive_sequencing")
+                        if getattr(self, name)]
+        return f"Scenario({self.ops!r}, {self.flow!r}, {'+'.join(improvements) or 'baseline'})"
+
+    @property
+    def lvp(self):
+        return self.ops == "Low Visibility Ops"
+
+    @property
+    def movements_per_hour(self):
+        return TRAFFIC_FLOW_RATES[self.flow]
+
+    @property
+    def taxi_speed(self):
+        return LVP_TAXI_SPEED if self.lvp else TAXI_SPEED
+
+    @property
+    def separation(self):
+        """In-trail separation in metres."""
+        if not self.lvp:
+            return SEPARATION
+        base = REDUCED_SEPARATION if self.reduced_separation else SEPARATION
+        return base * LVP_SEPARATION_FACTOR
+
+    @property
+    def runway_occupancy(self):
+        return LVP_RUNWAY_OCCUPANCY if self.lvp else RUNWAY_OCCUPANCY
+
+    @property
+    def arrival_occupancy(self):
+        return LVP_ARRIVAL_OCCUPANCY if self.lvp else ARRIVAL_OCCUPANCY
+
+    @property
+    def clearance_delay(self):
+        if not self.lvp:
+            return 0.0
+        return STOP_BAR_CLEARANCE_DELAY if self.stop_bars else LVP_CLEARANCE_DELAY
+
+    @property
+    def sequencing(self):
+        """True when departures are sent to the nearest runway entry."""
+        return self.lvp and self.adaptive_sequencing
+
+
+class _Movement:
+    """Event-driven state of one departure or arrival."""
+
+    __slots__ = ("callsign", "stand", "runway", "arrival", "route", "path", "state", "j", "t_edge",
+                 "scheduled", "runway_ready", "runway_enter", "runway_exit", "held_since", "unimpeded")
+
+    def __init__(self, callsign, stand, runway, scheduled, arrival=False):
+        self.callsign = callsign
+        self.stand = stand
+        self.runway = runway
+        self.arrival = arrival
+        self.route = None
+        self.path = None
+        self.state = "Approach" if arrival else "At Stand"
+        # at route[j]; left it along the next edge at t_edge while taxiing
+        self.j = 0
+        self.t_edge = scheduled
+        # off-block time of a departure, landing time of an arrival
+        self.scheduled = scheduled
+        self.runway_ready = None
+        self.runway_enter = None
+        self.runway_exit = None
+        self.held_since = None
+        self.unimpeded = 0.0
+
+
+# ==============================
+# DISCRETE-EVENT SIMULATION
+class EventSimulation:
+    """Arrival and departure flow simulated by jumping between events.
+
+    The calendar is a heap of (time, seq, kind, payload). Aircraft only
+    generate an event when something happens to them (pushback or landing,
+    reaching a node, a stop bar, the runway, takeoff or in-blocks), so idle
+    or holding aircraft cost nothing between events. In-trail separation is
+    kept at nodes: an aircraft may not reach a node within one headway
+    (separation / speed) of the previous one and waits at the node before
+    instead. The runway takes one movement at a time. Positions are
+    computed from the last event only when position() is called.
+    """
+
+    def __init__(self, graph, scenario=None, route_cache=None, runway_entries=None):
+        self.graph = graph
+        self.scenario = scenario or Scenario()
+        self.route_cache = route_cache or RouteCache(graph)
+        # runway entries adaptive sequencing picks from (by default the RWY* nodes)
+        if runway_entries is None:
+            runway_entries = [name for name in graph.names if name.startswith("RWY")]
+        self.runway_entries = list(runway_entries)
+        self.time = 0.0
+        self.calendar = []
+        self._seq = 0
+        self.aircraft = {}
+        # (arrival, scheduled, runway enter, runway exit, finished, unimpeded)
+        self.completed = []
+        # traffic stream being consumed by run(), and its next movement
+        self._traffic = None
+        self._next_movement = None
+        self.lit = [False] * len(graph)
+        self.waiters = {}
+        self.node_free = [0.0] * len(graph)
+        self.runway_free = 0.0
+        self.events = 0
+        self._handlers = {
+            PUSHBACK: self._pushback,
+            LANDING: self._landing,
+            EDGE_ENTRY: self._edge_entry,
+            STOP_BAR_LIT: self._stop_bar_lit,
+            STOP_BAR_CLEARED: self._stop_bar_cleared,
+            RUNWAY_ENTRY: self._runway_entry,
+            TAKEOFF: self._takeoff,
+        }
+
+    # ------------------------------
+    # Calendar
+    def schedule(self, t, kind, payload=None):
+        self._seq += 1
+        heapq.heappush(self.calendar, (t, self._seq, kind, payload))
+
+    def add_departure(self, callsign, stand, runway, off_block):
+        """Book a departure from stand to runway entry, pushing back at off_block seconds."""
+        self.aircraft[callsign] = _Movement(callsign, stand, runway, off_block)
+        self.schedule(off_block, PUSHBACK, callsign)
+
+    def add_arrival(self, callsign, runway, stand, landing):
+        """Book an arrival landing at `landing` seconds and vacating at runway to taxi to stand."""
+        self.aircraft[callsign] = _Movement(callsign, stand, runway, landing, arrival=True)
+        self.schedule(landing, LANDING, callsign)
+
+    def add_movement(self, movement):
+        """Book a traffic.Movement."""
+        if movement.kind == ARRIVAL:
+            self.add_arrival(movement.callsign, movement.runway, movement.stand, movement.time)
+        else:
+            self.add_departure(movement.callsign, movement.stand, movement.runway, movement.time)
+
+    def feed(self, movements):
+        """Consume an iterable of Movements in time order lazily as run() reaches them."""
+        self._traffic = iter(movements)
+        self._next_movement = next(self._traffic, None)
+
+    def set_stop_bar(self, node, lit, t=None):
+        """Light or clear a stop bar at time t (now by default)."""
+        self.schedule(self.time if t is None else t, STOP_BAR_LIT if lit else STOP_BAR_CLEARED, node)
+
+    def run(self, until=math.inf):
+        """Process every event up to `until` seconds; return the number handled.
+
+        Movements from feed() are booked only once the calendar reaches
+        their time, so a long schedule is never held in memory at once.
+        """
+        handled = 0
+        calendar = self.calendar
+        while True:
+            pending = self._next_movement
+            while pending is not None and pending.time <= until and (not calendar or pending.time <= calendar[0][0]):
+                self.add_movement(pending)
+                pending = self._next_movement = next(self._traffic, None)
+            if not calendar or calendar[0][0] > until:
+                break
+            t, _, kind, payload = heapq.heappop(calendar)
+            self.time = t
+            self._handlers[kind](payload)
+            handled += 1
+        if until != math.inf:
+            self.time = until
+        self.events += handled
+        return handled
+
+    # ------------------------------
+    # Event handlers
+    def _pushback(self, callsign):
+        ac = self.aircraft[callsign]
+        scenario = self.scenario
+        cache = self.route_cache
+        if scenario.sequencing:
+            ac.runway = min(self.runway_entries, key=lambda r: cache.cost(ac.stand, r))
+        ac.route = cache.route(ac.stand, ac.runway)
+        if not ac.route:
+            del self.aircraft[callsign]
+            return
+        ac.path = SplinePath.from_route(self.graph, ac.route, scale=self.graph.metres_per_pixel)
+        ac.state = "Pushback"
+        ac.unimpeded = (PUSHBACK_TIME + ac.path.length / scenario.taxi_speed + scenario.clearance_delay
+                        + scenario.runway_occupancy)
+        self.schedule(self.time + PUSHBACK_TIME, EDGE_ENTRY, (callsign, 0))
+
+    def _landing(self, callsign):
+        ac = self.aircraft[callsign]
+        scenario = self.scenario
+        ac.route = self.route_cache.route(ac.runway, ac.stand)
+        if not ac.route:
+            del self.aircraft[callsign]
+            return
+        ac.path = SplinePath.from_route(self.graph, ac.route, scale=self.graph.metres_per_pixel)
+        # a busy runway keeps the arrival airborne until it is free
+        ac.state = "Landing"
+        ac.runway_enter = max(self.time, self.runway_free)
+        ac.runway_exit = self.runway_free = ac.runway_enter + scenario.arrival_occupancy
+        ac.t_edge = ac.runway_exit
+        ac.unimpeded = scenario.arrival_occupancy + ac.path.length / scenario.taxi_speed
+        self.schedule(ac.runway_exit, EDGE_ENTRY, (callsign, 0))
+
+    def _edge_entry(self, payload):
+        callsign, j = payload
+        ac = self.aircraft[callsign]
+        ac.j = j
+        ac.t_edge = self.time
+        route = ac.route
+        if j == len(route) - 1:
+            if ac.arrival:
+                self._in_blocks(callsign)
+            else:
+                self._runway_entry(callsign)
+            return
+        nxt = self.graph.id_of(route[j + 1])
+        if self.lit[nxt]:
+            self._stop_bar_reached(callsign, nxt)
+            return
+        speed = self.scenario.taxi_speed
+        node_dist = ac.path.node_dist
+        arrive = self.time + (node_dist[j + 1] - node_dist[j]) / speed
+        if self.node_free[nxt] > arrive:
+            # too close behind the previous aircraft: wait here first
+            ac.t_edge += self.node_free[nxt] - arrive
+            arrive = self.node_free[nxt]
+        self.node_free[nxt] = arrive + self.scenario.separation / speed
+        ac.state = "Taxiing"
+        self.schedule(arrive, EDGE_ENTRY, (callsign, j + 1))
+
+    def _stop_bar_reached(self, callsign, node_id):
+        # hold short of the lit bar until STOP_BAR_CLEARED for this node
+        ac = self.aircraft[callsign]
+        ac.state = "Holding"
+        ac.held_since = self.time
+        self.waiters.setdefault(node_id, []).append(callsign)
+
+    def _stop_bar_lit(self, node):
+        node_id = self.graph.id_of(node)
+        self.lit[node_id] = True
+        self.route_cache.set_stop_bar(node, True)
+
+    def _stop_bar_cleared(self, node):
+        node_id = self.graph.id_of(node)
+        self.lit[node_id] = False
+        self.route_cache.set_stop_bar(node, False)
+        # wake only the aircraft holding at this bar
+        for callsign in self.waiters.pop(node_id, ()):
+            ac = self.aircraft[callsign]
+            ac.held_since = None
+            self.schedule(self.time, EDGE_ENTRY, (callsign, ac.j))
+
+    def _runway_entry(self, callsign):
+        ac = self.aircraft[callsign]
+        scenario = self.scenario
+        ac.state = "Runway"
+        # the clearance is only given once the runway is free, so it adds
+        # to every departure's runway cycle
+        ac.runway_ready = self.time
+        ac.runway_enter = max(self.time, self.runway_free) + scenario.clearance_delay
+        ac.runway_exit = self.runway_free = ac.runway_enter + scenario.runway_occupancy
+        self.schedule(self.runway_free, TAKEOFF, callsign)
+
+    def _takeoff(self, callsign):
+        ac = self.aircraft.pop(callsign)
+        ac.state = "Airborne"
+        self.completed.append((False, ac.scheduled, ac.runway_enter, ac.runway_exit, self.time, ac.unimpeded))
+
+    def _in_blocks(self, callsign):
+        ac = self.aircraft.pop(callsign)
+        ac.state = "On Stand"
+        self.completed.append((True, ac.scheduled, ac.runway_enter, ac.runway_exit, self.time, ac.unimpeded))
+
+    # ------------------------------
+    # Queries
+    def position(self, callsign, t=None):
+        """(x, y) of an aircraft at time t (now by default), or None while airborne."""
+        ac = self.aircraft.get(callsign)
+        if ac is None or ac.path is None:
+            if ac is not None and not ac.arrival:
+                return self.graph.coords(ac.stand)
+            return None
+        t = self.time if t is None else t
+        if ac.arrival and t < ac.runway_enter:
+            return None
+        node_dist = ac.path.node_dist
+        d = node_dist[ac.j]
+        if ac.state == "Taxiing" and t > ac.t_edge:
+            d = min(d + (t - ac.t_edge) * self.scenario.taxi_speed, node_dist[ac.j + 1])
+        return ac.path.position_at(d)
+
+    def metrics(self, hours=None):
+        """Summarise completed movements over the first `hours` (all of the run by default).
+
+        Returns movements (takeoffs and landings in the window, also split
+        into departures and arrivals), movements_per_hour, runway_utilisation
+        (fraction of the window the runway was occupied), and for every
+        completed movement avg_taxi_time (off-block to takeoff, or runway
+        exit to in-blocks, seconds) and avg_delay (over the unimpeded
+        time, seconds).
+        """
+        hours = self.time / 3600.0 if hours is None else hours
+        end = hours * 3600.0
+        done = self.completed
+        n = len(done)
+        taxi = [finished - (exit_ if arrival else scheduled)
+                for arrival, scheduled, _, exit_, finished, _ in done]
+        delay = [finished - scheduled - unimpeded for _, scheduled, _, _, finished, unimpeded in done]
+        in_window = [arrival for arrival, _, enter, _, _, _ in done if enter <= end]
+        arrivals = sum(in_window)
+        movements = len(in_window)
+        busy = sum(max(0.0, min(exit_, end) - enter) for _, _, enter, exit_, _, _ in done if enter < end)
+        return {
+            "movements": movements,
+            "departures": movements - arrivals,
+            "arrivals": arrivals,
+            "movements_per_hour": movements / hours if hours > 0 else 0.0,
+            "avg_taxi_time": sum(taxi) / n if n else 0.0,
+            "avg_delay": sum(delay) / n if n else 0.0,
+            "runway_utilisation": busy / end if end > 0 else 0.0,
+            "events": self.events,
+        }
+
+
+# ==============================
+# FAST-FORWARD RUNS
+def run_day(graph, scenario=None, seed=0, hours=24.0, route_cache=None, traffic=None, runway_entries=None):
+    """Simulate `hours` of traffic for a scenario and return EventSimulation.metrics().
+
+    traffic is an iterable of Movements; by default a seeded TrafficGenerator
+    at the scenario's flow rate.
+    """
+    scenario = scenario or Scenario()
+    sim = EventSimulation(graph, scenario, route_cache, runway_entries)
+    if traffic is None:
+        traffic = TrafficGenerator.for_graph(graph, scenario.flow, seed).stream(hours * 3600.0)
+    sim.feed(traffic)
+    sim.run()
+    return sim.metrics(hours)
@@ -0,0 +1,229 @@
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+# ==============================
+# VECTORIZED FLEET STATE
+BUFFER_FIELDS = ("px", "py", "sg")
+
+
+class FleetState:
+    """Structure-of-arrays state for a whole fleet, stepped in one batch.
+
+    Each aircraft owns a slot in the per-aircraft arrays (x, y, heading,
+    offset along its path in metres, speed, ...). The samples of every
+    SplinePath live in one flat buffer (px/py) and a slot points at its run
+    of samples through start/last. sg holds each path's cumulative arc
+    length shifted by a per-path base so the whole buffer is increasing,
+    which lets one searchsorted locate every aircraft at once. The
+    Simulation's Aircraft keep only their route bookkeeping (see
+    SplinePath.without_samples), so samples are stored once. Stop bars
+    reach the fleet as bar_at, the distance at which each slot must hold
+    for its next lit bar, so the stop-bar check is one comparison per slot.
+    """
+
+    def __init__(self, capacity=64):
+        if not HAS_NUMPY:
+            raise RuntimeError("FleetState needs NumPy; use the per-aircraft Simulation step instead")
+        self.count = 0
+        self.free = []
+        self._alloc_slots(capacity)
+        self.px = np.empty(1024)
+        self.py = np.empty(1024)
+        self.sg = np.zeros(1024)
+        self.buf_len = 0
+        self.garbage = 0
+
+    def _alloc_slots(self, capacity):
+        old = self.__dict__.get("x")
+        fields = {
+            "x": np.float64, "y": np.float64, "heading": np.float64,
+            "offset": np.float64, "speed": np.float64,
+            "base": np.float64, "length": np.float64, "stop_at": np.float64, "bar_at": np.float64,
+            "start": np.int64, "last": np.int64,
+            "active": bool, "holding": bool, "has_path": bool, "blocked": bool,
+        }
+        for name, dtype in fields.items():
+            arr = np.zeros(capacity, dtype=dtype)
+            if old is not None:
+                prev = getattr(self, name)
+                arr[:len(prev)] = prev
+            setattr(self, name, arr)
+
+    # ------------------------------
+    # Slots and paths
+    def add(self, x=0.0, y=0.0):
+        """Allocate a slot for a new aircraft at (x, y) and return its index."""
+        if self.free:
+            slot = self.free.pop()
+        else:
+            if self.count == len(self.x):
+                self._alloc_slots(len(self.x) * 2)
+            slot = self.count
+            self.count += 1
+        self.x[slot], self.y[slot] = x, y
+        self.heading[slot] = 0.0
+        self.offset[slot] = self.base[slot] = self.length[slot] = 0.0
+        self.stop_at[slot] = self.bar_at[slot] = np.inf
+        self.start[slot] = self.last[slot] = 0
+        self.active[slot] = self.holding[slot] = self.has_path[slot] = False
+        self.blocked[slot] = False
+        return slot
+
+    def remove(self, slot):
+        self._release_path(slot)
+        self.active[slot] = self.holding[slot] = self.blocked[slot] = False
+        self.free.append(slot)
+
+    def set_path(self, slot, path, speed, offset=0.0, bar_at=None):
+        """Give a slot a SplinePath and start it moving at speed (m/s).
+
+        offset is the starting distance along the path and bar_at the
+        distance at which it must hold for a stop bar.
+        """
+        self._release_path(slot)
+        n = len(path)
+        if n == 0:
+            self.active[slot] = False
+            return
+        if self.buf_len + n > len(self.px):
+            self._make_room(n)
+        start = self.buf_len
+        end = start + n
+        base = self.sg[start - 1] + 1.0 if start else 0.0
+        self.px[start:end] = path.xs
+        self.py[start:end] = path.ys
+        self.sg[start:end] = np.frombuffer(path.s, dtype=np.float64) + base
+        self.buf_len = end
+        self.start[slot] = start
+        self.last[slot] = n - 1
+        self.base[slot] = base
+        self.length[slot] = path.length
+        self.offset[slot] = offset
+        self.stop_at[slot] = np.inf
+        self.bar_at[slot] = np.inf if bar_at is None else bar_at
+        self.speed[slot] = speed
+        x, y, heading, _ = path.sample(offset)
+        self.x[slot], self.y[slot] = x, y
+        if n > 1:
+            self.heading[slot] = heading
+        self.has_path[slot] = True
+        self.active[slot] = True
+        self.holding[slot] = self.blocked[slot] = False
+
+    def _release_path(self, slot):
+        if self.has_path[slot]:
+            self.garbage += int(self.last[slot]) + 1
+        self.has_path[slot] = False
+        self.start[slot] = self.last[slot] = 0
+        self.offset[slot] = self.base[slot] = self.length[slot] = 0.0
+
+    def _make_room(self, n):
+        """Ensure n more samples fit, compacting or growing the flat buffer."""
+        # Compact first if at least half the buffer belongs to dropped paths
+        if self.garbage * 2 >= self.buf_len:
+            self._compact()
+        needed = self.buf_len + n
+        if needed > len(self.px):
+            size = max(len(self.px) * 2, needed)
+            for name in BUFFER_FIELDS:
+                old = getattr(self, name)
+                arr = np.empty(size, dtype=old.dtype)
+                arr[:self.buf_len] = old[:self.buf_len]
+                setattr(self, name, arr)
+
+    def _compact(self):
+        """Squeeze out samples of dropped paths, keeping live ones in slot order."""
+        slots = np.flatnonzero(self.has_path[:self.count])
+        lengths = self.last[slots] + 1
+        if len(slots):
+            gather = np.concatenate([np.arange(s, s + n) for s, n in zip(self.start[slots], lengths)])
+        else:
+            gather = np.zeros(0, dtype=np.int64)
+        for name in BUFFER_FIELDS:
+            arr = getattr(self, name)
+            arr[:len(gather)] = arr[gather]
+        # re-base the arc-length runs so the buffer stays increasing
+        new_starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+        base = 0.0
+        for slot, start, n in zip(slots.tolist(), new_starts.tolist(), lengths.tolist()):
+            run = self.sg[start:start + n]
+            run += base - self.base[slot]
+            self.base[slot] = base
+            base = run[-1] + 1.0
+        self.start[slots] = new_starts
+        self.buf_len = len(gather)
+        self.garbage = 0
+
+    # ------------------------------
+    # Stepping
+    def _locate(self, n):
+        """Sample index k of the interval each of the first n slots is on."""
+        start = self.start[:n]
+        k = np.searchsorted(self.sg[:self.buf_len], self.base[:n] + self.offset[:n], side="right") - 1
+        return np.clip(k, start, start + np.maximum(self.last[:n] - 1, 0))
+
+    def step(self, dt):
+        """Advance every active slot by dt seconds.
+
+        Returns (arrived, held): index arrays of slots that reached the end
+        of their path or reached their bar_at during this step. The
+        simulation releases held slots by clearing `holding` and moving
+        bar_at on.
+        """
+        n = self.count
+        active = self.active[:n]
+        offset = self.offset[:n]
+        length = self.length[:n]
+
+        arrived = active & (offset >= length)
+        active &= ~arrived
+
+        # blocked slots (held for traffic by the simulation) are left alone
+        check = active & ~self.blocked[:n]
+        holding = self.holding[:n]
+        hold = check & (offset >= self.bar_at[:n])
+        held = hold & ~holding
+        holding |= held
+
+        move = check & ~holding
+        # stop_at and bar_at cap travel at a planned wait point or the next
+        # lit stop bar (never backwards)
+        limit = np.minimum(length, np.maximum(np.minimum(self.stop_at[:n], self.bar_at[:n]), offset))
+        np.minimum(offset + self.speed[:n] * dt * move, limit, out=offset)
+
+        k = self._locate(n)
+        kn = np.minimum(k + 1, self.start[:n] + self.last[:n])
+        sg, px, py = self.sg, self.px, self.py
+        span = sg[kn] - sg[k]
+        f = np.divide(self.base[:n] + offset - sg[k], span, out=np.zeros(n), where=span > 0.0)
+        dx = px[kn] - px[k]
+        dy = py[kn] - py[k]
+        self.x[:n] = np.where(move, px[k] + dx * f, self.x[:n])
+        self.y[:n] = np.where(move, py[k] + dy * f, self.y[:n])
+        self.heading[:n] = np.where(move, np.arctan2(dy, dx), self.heading[:n])
+
+        return np.flatnonzero(arrived), np.flatnonzero(held)
+
+    def triangles(self, size=12):
+        """Return a (count, 6) array of aircraft triangle vertices for drawing.
+
+        Matches the GUI shape: nose at heading, tail corners at heading
+        +/-0.5 rad behind. cos/sin(heading +/- 0.5) are expanded with the
+        angle-sum identities so only one cos/sin pair is evaluated.
+        """
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        c, s = np.cos(self.heading[:n]), np.sin(self.heading[:n])
+        c5, s5 = np.cos(0.5), np.sin(0.5)
+        out = np.empty((n, 6))
+        out[:, 0] = x + size * c
+        out[:, 1] = y + size * s
+        out[:, 2] = x - size * (c * c5 - s * s5)
+        out[:, 3] = y - size * (s * c5 + c * s5)
+        out[:, 4] = x - size * (c * c5 + s * s5)
+        out[:, 5] = y - size * (s * c5 - c * s5)
+        return out
@@ -0,0 +1,293 @@
+from contextlib import contextmanager
+import bisect
+import functools
+import json
+import math
+import os
+import time
+
+# ==============================
+# INSTRUMENTS
+# frame-time histogram bucket upper bounds, in ms (the last catches the rest)
+FRAME_BUCKETS_MS = (2.0, 4.0, 8.0, 16.7, 33.3, 50.0, 100.0, 250.0, math.inf)
+
+
+class FrameHistogram:
+    """Counts of frame times per FRAME_BUCKETS_MS bucket, with an approximate percentile."""
+
+    def __init__(self, bounds=FRAME_BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.total = 0
+        self.max_ms = 0.0
+
+    def add(self, ms):
+        self.counts[bisect.bisect_left(self.bounds, ms)] += 1
+        self.total += 1
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th percentile (max for the open bucket)."""
+        if not self.total:
+            return 0.0
+        target = self.total * q / 100.0
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= target:
+                return bound if bound != math.inf else self.max_ms
+        return self.max_ms
+
+    def as_dict(self):
+        return {
+            "frames": self.total,
+            "buckets_ms": {("inf" if b == math.inf else f"{b:g}"): c for b, c in zip(self.bounds, self.counts)},
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "max_ms": self.max_ms,
+        }
+
+
+class Instrumentation:
+    """Named timers and counters around hot paths, free while switched off.
+
+    wrap() names a method or function to time; nothing is patched until
+    enable(), which swaps in timing wrappers, and disable() puts the
+    originals back, so a disabled build runs exactly the uninstrumented
+    code. count() and timer() are for ad-hoc spots and cost one flag test
+    when off. Frame times go into a histogram (FrameScheduler feeds it).
+    snapshot() is the JSON-ready view; overlay_text() is a few lines for
+    an on-screen label.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        # name -> [calls, total seconds, max seconds]
+        self.timers = {}
+        self.counters = {}
+        self.frames = FrameHistogram()
+        # (owner, attribute, name) to patch on enable, and what was replaced
+        self._hooks = []
+        self._patched = []
+        self.started = None
+
+    # ------------------------------
+    # Switching
+    def wrap(self, owner, attr, name=None):
+        """Time owner.attr (a class, module or instance attribute) as `name` while enabled.
+
+        Wrapping the same attribute again does nothing.
+        """
+        if any(o is owner and a == attr for o, a, _ in self._hooks):
+            return
+        hook = (owner, attr, name or f"{getattr(owner, '__name__', type(owner).__name__)}.{attr}")
+        self._hooks.append(hook)
+        if self.enabled:
+            self._patch(*hook)
+
+    def enable(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self.started = time.perf_counter()
+        for hook in self._hooks:
+            self._patch(*hook)
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        for owner, attr, original, own in reversed(self._patched):
+            if own:
+                setattr(owner, attr, original)
+            else:
+                delattr(owner, attr)
+        self._patched.clear()
+
+    def toggle(self):
+        (self.disable if self.enabled else self.enable)()
+        return self.enabled
+
+    def reset(self):
+        self.timers.clear()
+        self.counters.clear()
+        self.frames = FrameHistogram()
+        self.started = time.perf_counter() if self.enabled else None
+
+    def _patch(self, owner, attr, name):
+        own = attr in vars(owner)
+        raw = vars(owner)[attr] if own else getattr(owner, attr)
+        if isinstance(raw, (classmethod, staticmethod)):
+            wrapped = type(raw)(self._timed(raw.__func__, name))
+        else:
+            wrapped = self._timed(raw, name)
+        setattr(owner, attr, wrapped)
+        self._patched.append((owner, attr, raw, own))
+
+    def _timed(self, fn, name):
+        timers = self.timers
+        clock = time.perf_counter
+
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            t0 = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = clock() - t0
+                stats = timers.get(name)
+                if stats is None:
+                    timers[name] = [1, elapsed, elapsed]
+                else:
+                    stats[0] += 1
+                    stats[1] += elapsed
+                    if elapsed > stats[2]:
+                        stats[2] = elapsed
+        return timed
+
+    # ------------------------------
+    # Recording
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextmanager
+    def timer(self, name):
+        """Time a with-block as `name` (a no-op while disabled)."""
+        if not self.enabled:
+            yield
+            return
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            stats = self.timers.setdefault(name, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] = max(stats[2], elapsed)
+
+    def record_frame(self, ms):
+        if self.enabled:
+            self.frames.add(ms)
+
+    # ------------------------------
+    # Reporting
+    def snapshot(self):
+        wall = time.perf_counter() - self.started if self.started is not None else 0.0
+        timers = {}
+        for name, (calls, total, worst) in sorted(self.timers.items(), key=lambda item: -item[1][1]):
+            timers[name] = {
+                "calls": calls,
+                "total_ms": total * 1000.0,
+                "mean_us": total / calls * 1e6,
+                "max_us": worst * 1e6,
+                "share": total / wall if wall > 0.0 else 0.0,
+            }
+        return {"wall_s": wall, "timers": timers, "counters": dict(self.counters), "frames": self.frames.as_dict()}
+
+    def dump_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        return path
+
+    def overlay_text(self, top=5):
+        snap = self.snapshot()
+        frames = snap["frames"]
+        lines = [f"frames {frames['frames']}  p50 {frames['p50_ms']:.1f} ms  p95 {frames['p95_ms']:.1f} ms  "
+                 f"max {frames['max_ms']:.1f} ms"]
+        for name, stats in list(snap["timers"].items())[:top]:
+            lines.append(f"{name:<24} {stats['calls']:7d} calls {stats['total_ms']:9.1f} ms "
+                         f"({stats['share'] * 100:4.1f}%)")
+        return "\n".join(lines)
+
+
+# shared by the GUI entry points, FrameScheduler and anything else that reports
+instruments = Instrumentation()
+
+
+def install_hot_path_hooks(inst=instruments):
+    """Register the simulation-side hot paths (routing, splines, stepping, lookups)."""
+    import spline
+    from route_cache import RouteCache
+    from routing import RoutingEngine
+    from simulation import Simulation
+    from spatial_index import GridIndex
+    from taxi_graph import TaxiGraph
+
+    inst.wrap(TaxiGraph, "dijkstra", "dijkstra")
+    inst.wrap(RoutingEngine, "route_ids", "routing")
+    inst.wrap(RouteCache, "route", "route_cache")
+    inst.wrap(spline, "build_spline_path", "build_spline_path")
+    inst.wrap(spline, "catmull_rom_spline", "catmull_rom_spline")
+    inst.wrap(spline.SplinePath, "from_route", "spline_path")
+    inst.wrap(Simulation, "step", "sim.step")
+    inst.wrap(Simulation, "check_conflicts", "sim.check_conflicts")
+    inst.wrap(GridIndex, "nearest", "nearest_node")
+
+
+# ==============================
+# PROFILING SWITCH
+PROFILE_MODES = ("cprofile", "tracemalloc")
+
+
+def profile_modes(value):
+    """Modes from a switch value such as "cprofile", "tracemalloc" or "cprofile,tracemalloc"."""
+    modes = {m.strip().lower() for m in (value or "").split(",") if m.strip()}
+    if "all" in modes or "both" in modes:
+        return set(PROFILE_MODES)
+    unknown = modes - set(PROFILE_MODES)
+    if unknown:
+        raise ValueError(f"unknown profile mode(s) {sorted(unknown)}; use {', '.join(PROFILE_MODES)}")
+    return modes
+
+
+def profile_switch(argv=None):
+    """Profile modes asked for by --profile=<modes> on the command line or EGNX_PROFILE."""
+    import sys
+    for arg in (sys.argv if argv is None else argv):
+        if arg.startswith("--profile="):
+            return profile_modes(arg.split("=", 1)[1])
+    return profile_modes(os.environ.get("EGNX_PROFILE"))
+
+
+@contextmanager
+def profiling(modes, out_dir=".", prefix="egnx", top=30):
+    """Run the with-block under cProfile and/or tracemalloc and write their reports.
+
+    Writes <prefix>.prof (load with pstats or snakeviz) and
+    <prefix>-cprofile.txt sorted by cumulative time, and
+    <prefix>-tracemalloc.txt with the top allocation sites and the peak.
+    Does nothing when modes is empty.
+    """
+    if isinstance(modes, str) or modes is None:
+        modes = profile_modes(modes)
+    profiler = None
+    if "tracemalloc" in modes:
+        import tracemalloc
+        tracemalloc.start(10)
+    if "cprofile" in modes:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        yield
+    finally:
+        base = os.path.join(out_dir, prefix)
+        if profiler is not None:
+            import io
+            import pstats
+            profiler.disable()
+            profiler.dump_stats(base + ".prof")
+            text = io.StringIO()
+            pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(top)
+            with open(base + "-cprofile.txt", "w") as f:
+                f.write(text.getvalue())
+        if "tracemalloc" in modes:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            with open(base + "-tracemalloc.txt", "w") as f:
+                f.write(f"current {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB\n\n")
+                for stat in snapshot.statistics("lineno")[:top]:
+                    f.write(f"{stat}\n")
@@ -0,0 +1,537 @@
+from array import array
+import csv
+import hashlib
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+
+# ==============================
+# LAYOUT FILES
+# A layout is read from GeoJSON or CSV, validated, and compiled once into a
+# binary cache keyed by the file's contents; later starts memory-map it.
+# Compiled layouts live next to the map variants (see map_assets)
+LAYOUT_CACHE_DIR = os.environ.get("EGNX_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "egnx")
+CACHE_MAGIC = b"EGNXLAY1"
+# part of every cache key: bump it when the header, the sections or the
+# TaxiGraph edge weighting change, so older .egnxbin files are not served
+CACHE_VERSION = 1
+# route tables (one dist and one next_hop array per stand and runway entry)
+# are only stored when they stay under this many entries in total
+MAX_TABLE_ENTRIES = 4_000_000
+EARTH_RADIUS = 6371008.8        # metres
+
+STAND = "stand"
+RUNWAY_ENTRY = "runway_entry"
+TAXIWAY = "taxiway"
+NODE_KINDS = (STAND, RUNWAY_ENTRY, TAXIWAY)
+
+
+class LayoutError(ValueError):
+    """A layout file that cannot be used; .problems lists everything found wrong."""
+
+    def __init__(self, source, problems):
+        self.source = source
+        self.problems = list(problems)
+        shown = "; ".join(self.problems[:10])
+        more = f" (and {len(self.problems) - 10} more)" if len(self.problems) > 10 else ""
+        super().__init__(f"{source}: {shown}{more}")
+
+
+def infer_kind(name):
+    """Node role from the EGNX naming convention (STAND*a stands, RWY* runway entries)."""
+    if name.startswith("RWY"):
+        return RUNWAY_ENTRY
+    if name.startswith("STAND") and name.endswith("a"):
+        return STAND
+    return TAXIWAY
+
+
+class Layout:
+    """Nodes, edges and node roles of an airport, in the shape of egnx_layout.
+
+    nodes maps name -> (x, y) in pixels and edges name -> neighbour names
+    (either direction is enough). Stands and runway entries are what the
+    traffic generator and the route tables use.
+    """
+
+    def __init__(self, nodes, edges, metres_per_pixel=1.0, runway_entries=None, stands=None):
+        self.nodes = nodes
+        self.edges = edges
+        self.metres_per_pixel = metres_per_pixel
+        if runway_entries is None:
+            runway_entries = [name for name in nodes if infer_kind(name) == RUNWAY_ENTRY]
+        if stands is None:
+            stands = [name for name in nodes if infer_kind(name) == STAND]
+        self.runway_entries = list(runway_entries)
+        self.stands = list(stands)
+
+    @classmethod
+    def from_module(cls, module):
+        """Layout of a module laid out like egnx_layout."""
+        return cls(module.nodes, module.edges, module.metres_per_pixel, getattr(module, "runway_entries", None))
+
+    def kinds(self):
+        """name -> node kind for every node."""
+        kinds = dict.fromkeys(self.nodes, TAXIWAY)
+        kinds.update(dict.fromkeys(self.stands, STAND))
+        kinds.update(dict.fromkeys(self.runway_entries, RUNWAY_ENTRY))
+        return kinds
+
+    def graph(self):
+        from taxi_graph import TaxiGraph
+        return TaxiGraph(self.nodes, self.edges, self.metres_per_pixel)
+
+
+# ------------------------------
+# Reading
+def read_layout(path):
+    """Parse and validate a .geojson/.json or .csv layout file into a Layout."""
+    with open(path, "rb") as f:
+        data = f.read()
+    return parse_layout(data, path)
+
+
+def parse_layout(data, source):
+    """Parse layout file contents; the format is taken from the source's extension."""
+    ext = os.path.splitext(source)[1].lower()
+    text = data.decode("utf-8-sig")
+    if ext in (".geojson", ".json"):
+        rows = _geojson_rows(text, source)
+    elif ext == ".csv":
+        rows = _csv_rows(text, source)
+    else:
+        raise LayoutError(source, [f"unknown layout format {ext!r} (use .geojson or .csv)"])
+    return build_layout(source, *rows)
+
+
+def _csv_rows(text, source):
+    """Rows of a CSV layout; the first column says what each row is.
+
+        node,<name>,<x>,<y>[,<kind>]     x, y in pixels (lon, lat with units,latlon)
+        edge,<from>,<to>
+        scale,<metres per pixel>
+        units,pixels|latlon
+
+    Blank lines and lines starting with # are skipped.
+    """
+    node_rows, edge_rows, problems = [], [], []
+    units, scale = "pixels", None
+    for line_no, row in enumerate(csv.reader(text.splitlines()), 1):
+        row = [cell.strip() for cell in row]
+        if not row or not row[0] or row[0].startswith("#"):
+            continue
+        record = row[0].lower()
+        where = f"line {line_no}"
+        if record == "node" and len(row) in (4, 5):
+            node_rows.append((where, row[1], row[2], row[3], row[4] if len(row) == 5 else None))
+        elif record == "edge" and len(row) == 3:
+            edge_rows.append((where, row[1], row[2]))
+        elif record == "scale" and len(row) == 2:
+            scale = row[1]
+        elif record == "units" and len(row) == 2:
+            units = row[1].lower()
+        else:
+            problems.append(f"{where}: cannot read {','.join(row)!r}")
+    return node_rows, edge_rows, units, scale, problems
+
+
+def _geojson_rows(text, source):
+    """Rows of a GeoJSON FeatureCollection layout.
+
+    Point features are nodes (properties: name, optional kind); LineString
+    features are edges between their first and last vertex, named by
+    "from"/"to" properties or else matched to the nodes at those
+    coordinates. The collection may carry "units" ("latlon", the GeoJSON
+    default, or "pixels") and "metres_per_pixel".
+    """
+    try:
+        doc = json.loads(text)
+    except ValueError as exc:
+        raise LayoutError(source, [f"not JSON: {exc}"]) from None
+    if not isinstance(doc, dict) or doc.get("type") != "FeatureCollection":
+        raise LayoutError(source, ["expected a GeoJSON FeatureCollection"])
+    features = doc.get("features") or []
+    if not isinstance(features, list):
+        raise LayoutError(source, ["features must be a list"])
+    node_rows, lines, problems = [], [], []
+    for n, feature in enumerate(features):
+        where = f"feature {n}"
+        if not isinstance(feature, dict):
+            problems.append(f"{where}: not a GeoJSON feature object")
+            continue
+        geometry = feature.get("geometry") or {}
+        props = feature.get("properties") or {}
+        if not isinstance(geometry, dict) or not isinstance(props, dict):
+            problems.append(f"{where}: geometry and properties must be objects")
+            continue
+        coords = geometry.get("coordinates")
+        if geometry.get("type") == "Point" and isinstance(coords, list) and len(coords) >= 2:
+            name = props.get("name")
+            node_rows.append((where, "" if name is None else str(name), coords[0], coords[1], props.get("kind")))
+        elif geometry.get("type") == "LineString" and isinstance(coords, list) and len(coords) >= 2:
+            lines.append((where, props.get("from"), props.get("to"), coords[0], coords[-1]))
+        else:
+            problems.append(f"{where}: not a Point node or LineString edge")
+    # edges without from/to are matched to nodes by coordinates
+    at = {}
+    for _, name, x, y, _ in node_rows:
+        at.setdefault(_coord_key((x, y)), name)
+    edge_rows = []
+    for where, a, b, p, q in lines:
+        a = a if a is not None else at.get(_coord_key(p))
+        b = b if b is not None else at.get(_coord_key(q))
+        if a is None or b is None:
+            problems.append(f"{where}: edge end does not lie on a node")
+            continue
+        edge_rows.append((where, str(a), str(b)))
+    return node_rows, edge_rows, str(doc.get("units", "latlon")).lower(), doc.get("metres_per_pixel"), problems
+
+
+def _coord_key(point):
+    try:
+        return round(float(point[0]), 9), round(float(point[1]), 9)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def project_latlon(points, metres_per_pixel=1.0):
+    """Map {name: (lon, lat)} to pixels: equirectangular, origin at the north-west corner, y down.
+
+    Fine at airport scale (a few km), where the error is far below a pixel.
+    """
+    lons = [p[0] for p in points.values()]
+    lats = [p[1] for p in points.values()]
+    lon0, lat0 = min(lons), max(lats)
+    kx = EARTH_RADIUS * math.cos(math.radians((min(lats) + lat0) / 2.0)) * math.pi / 180.0 / metres_per_pixel
+    ky = EARTH_RADIUS * math.pi / 180.0 / metres_per_pixel
+    return {name: ((lon - lon0) * kx, (lat0 - lat) * ky) for name, (lon, lat) in points.items()}
+
+
+def build_layout(source, node_rows, edge_rows, units="pixels", scale=None, problems=()):
+    """Validate parsed rows and return a Layout, or raise LayoutError listing every problem.
+
+    node_rows are (where, name, x, y, kind) and edge_rows (where, from, to).
+    """
+    problems = list(problems)
+    if units not in ("pixels", "latlon"):
+        problems.append(f"units must be pixels or latlon, not {units!r}")
+    metres_per_pixel = 1.0
+    if scale is not None:
+        try:
+            metres_per_pixel = float(scale)
+            if not (math.isfinite(metres_per_pixel) and metres_per_pixel > 0.0):
+                raise ValueError
+        except (TypeError, ValueError):
+            problems.append(f"metres per pixel must be a positive number, not {scale!r}")
+            metres_per_pixel = 1.0
+
+    points, kinds = {}, {}
+    for where, name, x, y, kind in node_rows:
+        if not name:
+            problems.append(f"{where}: node without a name")
+            continue
+        if name in points:
+            problems.append(f"{where}: duplicate node {name!r}")
+            continue
+        try:
+            x, y = float(x), float(y)
+            if not (math.isfinite(x) and math.isfinite(y)):
+                raise ValueError
+        except (TypeError, ValueError):
+            problems.append(f"{where}: node {name!r} has bad coordinates ({x!r}, {y!r})")
+            continue
+        if units == "latlon" and not (-180.0 <= x <= 180.0 and -90.0 <= y <= 90.0):
+            problems.append(f"{where}: node {name!r} is not a lon/lat ({x}, {y})")
+            continue
+        kind = kind or infer_kind(name)
+        if not isinstance(kind, str) or kind.lower() not in NODE_KINDS:
+            problems.append(f"{where}: node {name!r} has unknown kind {kind!r}")
+            continue
+        points[name] = (x, y)
+        kinds[name] = kind.lower()
+    if not points:
+        problems.append("no nodes")
+
+    edges = {}
+    seen = set()
+    for where, a, b in edge_rows:
+        unknown = [n for n in (a, b) if n not in points]
+        if unknown:
+            problems.append(f"{where}: edge {a}-{b} names unknown node(s) {', '.join(map(repr, unknown))}")
+            continue
+        if a == b:
+            problems.append(f"{where}: edge {a}-{b} loops on itself")
+            continue
+        key = (a, b) if a < b else (b, a)
+        if key not in seen:
+            seen.add(key)
+            edges.setdefault(a, []).append(b)
+
+    stands = [name for name, kind in kinds.items() if kind == STAND]
+    runway_entries = [name for name, kind in kinds.items() if kind == RUNWAY_ENTRY]
+    if points and not runway_entries:
+        problems.append("no runway entries")
+    elif stands:
+        unreachable = _unreachable(stands, runway_entries, edges)
+        if unreachable:
+            problems.append(f"stand(s) with no route to a runway: {', '.join(unreachable[:10])}")
+    if problems:
+        raise LayoutError(source, problems)
+
+    if units == "latlon":
+        points = project_latlon(points, metres_per_pixel)
+    return Layout(points, edges, metres_per_pixel, runway_entries, stands)
+
+
+def _unreachable(stands, runway_entries, edges):
+    adjacency = {}
+    for a, neighbors in edges.items():
+        for b in neighbors:
+            adjacency.setdefault(a, []).append(b)
+            adjacency.setdefault(b, []).append(a)
+    reached = set(runway_entries)
+    frontier = list(runway_entries)
+    while frontier:
+        for neighbor in adjacency.get(frontier.pop(), ()):
+            if neighbor not in reached:
+                reached.add(neighbor)
+                frontier.append(neighbor)
+    return [name for name in stands if name not in reached]
+
+
+# ------------------------------
+# Writing
+def write_csv(layout, path):
+    """Write a Layout as a CSV layout file (pixels)."""
+    with open(path, "w", newline="") as f:
+        out = csv.writer(f)
+        out.writerow(["scale", layout.metres_per_pixel])
+        out.writerow(["units", "pixels"])
+        kinds = layout.kinds()
+        for name, (x, y) in layout.nodes.items():
+            out.writerow(["node", name, x, y, kinds[name]])
+        for a, neighbors in layout.edges.items():
+            for b in neighbors:
+                out.writerow(["edge", a, b])
+    return path
+
+
+def write_geojson(layout, path):
+    """Write a Layout as a GeoJSON layout file (pixels)."""
+    nodes = layout.nodes
+    kinds = layout.kinds()
+    features = [
+        {"type": "Feature", "geometry": {"type": "Point", "coordinates": list(nodes[name])},
+         "properties": {"name": name, "kind": kinds[name]}}
+        for name in nodes
+    ]
+    for a, neighbors in layout.edges.items():
+        for b in neighbors:
+            features.append({"type": "Feature",
+                             "geometry": {"type": "LineString", "coordinates": [list(nodes[a]), list(nodes[b])]},
+                             "properties": {"from": a, "to": b}})
+    doc = {"type": "FeatureCollection", "units": "pixels", "metres_per_pixel": layout.metres_per_pixel,
+           "features": features}
+    with open(path, "w") as f:
+        json.dump(doc, f, indent=1)
+    return path
+
+
+# ==============================
+# COMPILED LAYOUT CACHE
+# File: CACHE_MAGIC, u64 header length, JSON header (names, roles, scale and
+# where each section sits), padding to 8 bytes, then the raw little-endian
+# sections: xs/ys ('d'), CSR offsets/targets ('q'), weights ('d') and, for
+# the table roots, dist ('d') and next_hop ('q') stacked root after root.
+class CompiledLayout:
+    """A layout as served from the binary cache: graph, roles and route tables.
+
+    The graph's coordinate, adjacency and weight arrays (and the tables)
+    are views straight into the mapped file, so loading costs little more
+    than reading the node names. nodes/edges rebuild the dict form (e.g.
+    for drawing) on first use.
+    """
+
+    def __init__(self, graph, runway_entries, stands, tables, source=None):
+        self.graph = graph
+        self.metres_per_pixel = graph.metres_per_pixel
+        self.runway_entries = runway_entries
+        self.stands = stands
+        # {root id: (dist, next_hop)} for RouteCache
+        self.tables = tables
+        self.source = source
+        self._nodes = None
+        self._edges = None
+
+    @property
+    def nodes(self):
+        if self._nodes is None:
+            self._nodes = dict(zip(self.graph.names, self.graph.points))
+        return self._nodes
+
+    @property
+    def edges(self):
+        if self._edges is None:
+            names = self.graph.names
+            edges = {}
+            for u, v, _ in self.graph.edge_items():
+                if u < v:
+                    edges.setdefault(names[u], []).append(names[v])
+            self._edges = edges
+        return self._edges
+
+    def route_cache(self, **kwargs):
+        """RouteCache over the graph, seeded with the precomputed tables."""
+        from route_cache import RouteCache
+        return RouteCache(self.graph, self.runway_entries + self.stands, tables=self.tables, **kwargs)
+
+
+def layout_key(data, max_table_entries=MAX_TABLE_ENTRIES):
+    """Cache key of a layout file's contents, the cache format and the route-table limit."""
+    stamp = f"{CACHE_VERSION}:{max_table_entries}:".encode()
+    return hashlib.sha1(CACHE_MAGIC + stamp + data).hexdigest()[:20]
+
+
+def compile_layout(layout, max_table_entries=MAX_TABLE_ENTRIES):
+    """Compile a Layout into the bytes of a cache file."""
+    from route_cache import RouteCache
+    graph = layout.graph()
+    n = len(graph)
+    roots = [graph.id_of(name) for name in layout.runway_entries + layout.stands]
+    if len(roots) * n > max_table_entries:
+        roots = []
+    cache = RouteCache(graph, [graph.names[r] for r in roots])
+    dist, next_hop = array('d'), array('q')
+    for root in roots:
+        tree = cache.trees[root]
+        dist.extend(tree.dist)
+        next_hop.extend(tree.next_hop)
+    sections = [
+        ("xs", graph.xs), ("ys", graph.ys),
+        ("offsets", array('q', graph.offsets)), ("targets", array('q', graph.targets)),
+        ("weights", graph.weights), ("dist", dist), ("next_hop", next_hop),
+    ]
+    blobs, layout_info, offset = [], {}, 0
+    for name, values in sections:
+        blob = values.tobytes() if sys.byteorder == "little" else _little_endian(values)
+        layout_info[name] = [offset, values.typecode, len(values)]
+        blobs.append(blob)
+        offset += len(blob)
+    header = json.dumps({
+        "names": graph.names,
+        "metres_per_pixel": layout.metres_per_pixel,
+        "runway_entries": layout.runway_entries,
+        "stands": layout.stands,
+        "table_roots": roots,
+        "sections": layout_info,
+    }).encode()
+    start = len(CACHE_MAGIC) + 8 + len(header)
+    padding = b"\0" * (-start % 8)
+    return b"".join([CACHE_MAGIC, struct.pack("<Q", len(header) + len(padding)), header, padding] + blobs)
+
+
+def _little_endian(values):
+    values = array(values.typecode, values)
+    values.byteswap()
+    return values.tobytes()
+
+
+def open_compiled(buffer, source=None):
+    """CompiledLayout over a cache file's bytes (an mmap or bytes object)."""
+    view = memoryview(buffer)
+    if bytes(view[:len(CACHE_MAGIC)]) != CACHE_MAGIC:
+        raise ValueError("not a compiled layout")
+    (header_len,) = struct.unpack_from("<Q", view, len(CACHE_MAGIC))
+    body = len(CACHE_MAGIC) + 8
+    header = json.loads(bytes(view[body:body + header_len]).decode().rstrip("\0"))
+    base = body + header_len
+    if sys.byteorder != "little":
+        raise ValueError("compiled layouts are little-endian")
+
+    def section(name):
+        offset, typecode, count = header["sections"][name]
+        size = struct.calcsize(typecode)
+        return view[base + offset:base + offset + count * size].cast(typecode)
+
+    from taxi_graph import TaxiGraph
+    graph = TaxiGraph.from_arrays(header["names"], section("xs"), section("ys"), section("offsets"),
+                                  section("targets"), section("weights"), header["metres_per_pixel"])
+    n = len(graph)
+    dist, next_hop = section("dist"), section("next_hop")
+    tables = {root: (dist[i * n:(i + 1) * n], next_hop[i * n:(i + 1) * n])
+              for i, root in enumerate(header["table_roots"])}
+    return CompiledLayout(graph, header["runway_entries"], header["stands"], tables, source)
+
+
+def load_layout(path, cache_dir=LAYOUT_CACHE_DIR):
+    """Load a layout file, compiling it on the first run and memory-mapping the cache after.
+
+    Raises LayoutError if the file is not a usable layout. If the cache
+    folder cannot be written the compiled layout is still returned, just
+    not kept.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    limit = MAX_TABLE_ENTRIES
+    cached = os.path.join(cache_dir, f"{os.path.splitext(os.path.basename(path))[0]}_{layout_key(data, limit)}.egnxbin")
+    try:
+        with open(cached, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        mapped = None
+    if mapped is not None:
+        try:
+            return open_compiled(mapped, path)
+        except (ValueError, KeyError, TypeError, IndexError, struct.error):
+            pass
+        # outside the except block, so the failed views are gone and the map can close
+        mapped.close()
+    blob = compile_layout(parse_layout(data, path), limit)
+    tmp = f"{cached}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(tmp, "wb") as f:
+            f.write(blob)
+        os.replace(tmp, cached)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+    return open_compiled(blob, path)
+
+
+def layout_switch(argv=None):
+    """Layout file asked for by --layout=<path> on the command line or EGNX_LAYOUT, else None."""
+    for arg in (sys.argv if argv is None else argv):
+        if arg.startswith("--layout="):
+            return arg.split("=", 1)[1]
+    return os.environ.get("EGNX_LAYOUT") or None
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Export, check and compile airport layout files")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="write the built-in EGNX layout as .csv or .geojson")
+    export.add_argument("path")
+    check = commands.add_parser("compile", help="validate a layout file and compile its cache")
+    check.add_argument("path")
+    args = parser.parse_args()
+    if args.command == "export":
+        import egnx_layout
+        layout = Layout.from_module(egnx_layout)
+        write = write_csv if args.path.lower().endswith(".csv") else write_geojson
+        print(f"wrote {write(layout, args.path)}")
+    else:
+        try:
+            compiled = load_layout(args.path)
+        except LayoutError as exc:
+            sys.exit("\n".join([f"{exc.source}:"] + [f"  {p}" for p in exc.problems]))
+        graph = compiled.graph
+        print(f"{args.path}: {len(graph)} nodes, {graph.edge_count() // 2} edges, "
+              f"{len(compiled.stands)} stands, {len(compiled.runway_entries)} runway entries, "
+              f"{len(compiled.tables)} route tables")
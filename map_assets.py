@@ -0,0 +1,173 @@
+from collections import OrderedDict
+import hashlib
+import math
+import os
+
+try:
+    from PIL import Image
+    HAS_PIL = True
+except ImportError:
+    Image = None
+    HAS_PIL = False
+
+# ==============================
+# MAP ASSET CACHE
+# Pre-scaled map variants are kept here between runs (outside the app
+# folder, which a one-file build unpacks afresh every start)
+MAP_CACHE_DIR = os.environ.get("EGNX_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "egnx")
+TILE_SIZE = 256
+MAX_TILES = 256            # tiles kept in memory per pyramid
+
+
+class MapAssets:
+    """Scaled copies of map images, resampled once and then read from disk.
+
+    A variant is keyed by the source path, its modification time and size
+    and the target size, so editing or replacing the map invalidates its
+    variants without any bookkeeping. Images are only opened when first
+    asked for and stay in memory afterwards. If the cache folder cannot
+    be written the variant is still returned, just not kept.
+    """
+
+    def __init__(self, cache_dir=MAP_CACHE_DIR):
+        if not HAS_PIL:
+            raise RuntimeError("MapAssets needs Pillow")
+        self.cache_dir = cache_dir
+        self._images = {}
+        self._pyramids = {}
+        self.hits = 0
+        self.misses = 0
+
+    def source_size(self, path):
+        """(width, height) of a source image (reads only its header)."""
+        with Image.open(path) as image:
+            return image.size
+
+    def fit_height(self, path, height):
+        """Target size for a height, keeping the source's aspect ratio."""
+        width, source_height = self.source_size(path)
+        return int(height * width / source_height), height
+
+    def _key(self, path, size):
+        st = os.stat(path)
+        text = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}|{size[0]}x{size[1]}"
+        return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+    def scaled(self, path, size):
+        """Return the image at path resized (LANCZOS) to size, from memory or disk if cached."""
+        size = (int(size[0]), int(size[1]))
+        key = self._key(path, size)
+        image = self._images.get(key)
+        if image is not None:
+            return image
+        stem = os.path.splitext(os.path.basename(path))[0]
+        cached = os.path.join(self.cache_dir, f"{stem}_{size[0]}x{size[1]}_{key}.tga")
+        try:
+            with Image.open(cached) as f:
+                image = f.copy()
+            self.hits += 1
+        except (OSError, ValueError):
+            with Image.open(path) as source:
+                image = source.resize(size, Image.Resampling.LANCZOS) if source.size != size else source.copy()
+            self.misses += 1
+            self._store(image, cached)
+        self._images[key] = image
+        return image
+
+    def _store(self, image, cached):
+        # uncompressed TGA (keeps alpha) loads several times faster than PNG;
+        # write then rename so a crash never leaves a half-written variant
+        tmp = f"{cached}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            image.save(tmp, format="TGA")
+            os.replace(tmp, cached)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    def pyramid(self, path, tile_size=TILE_SIZE):
+        """The TilePyramid of a source image (one per path)."""
+        pyramid = self._pyramids.get(path)
+        if pyramid is None or pyramid.stale():
+            pyramid = self._pyramids[path] = TilePyramid(self, path, tile_size)
+        return pyramid
+
+
+# ==============================
+# TILE PYRAMID
+class TilePyramid:
+    """Halving levels of an image cut into tiles, for panning and zooming.
+
+    Level 0 is the source; each further level halves it (and is itself a
+    cached MapAssets variant) down to a single tile. view() picks the
+    level nearest above the wanted scale, pastes just the tiles under the
+    viewport and resamples that viewport-sized patch, so a pan or zoom
+    step never resizes the whole map. Tiles are kept in a small LRU.
+    """
+
+    def __init__(self, assets, path, tile_size=TILE_SIZE, max_tiles=MAX_TILES):
+        self.assets = assets
+        self.path = path
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles
+        self._stamp = os.stat(path).st_mtime_ns
+        width, height = assets.source_size(path)
+        self.sizes = [(width, height)]
+        while max(width, height) > tile_size:
+            width, height = max(1, (width + 1) // 2), max(1, (height + 1) // 2)
+            self.sizes.append((width, height))
+        self._tiles = OrderedDict()
+
+    def stale(self):
+        return os.stat(self.path).st_mtime_ns != self._stamp
+
+    @property
+    def levels(self):
+        return len(self.sizes)
+
+    def level_for(self, scale):
+        """Smallest level still at least as detailed as scale (1.0 = source pixels)."""
+        if scale >= 1.0:
+            return 0
+        return min(int(math.floor(math.log2(1.0 / scale))), self.levels - 1)
+
+    def level_image(self, level):
+        return self.assets.scaled(self.path, self.sizes[level])
+
+    def tile(self, level, col, row):
+        """One tile_size square (smaller at the right and bottom edges) of a level."""
+        key = (level, col, row)
+        tile = self._tiles.get(key)
+        if tile is not None:
+            self._tiles.move_to_end(key)
+            return tile
+        image = self.level_image(level)
+        t = self.tile_size
+        box = (col * t, row * t, min((col + 1) * t, image.width), min((row + 1) * t, image.height))
+        tile = self._tiles[key] = image.crop(box)
+        if len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+        return tile
+
+    def view(self, scale, x, y, width, height):
+        """Viewport of width x height screen pixels showing the map at scale from source point (x, y)."""
+        level = self.level_for(scale)
+        level_w, level_h = self.sizes[level]
+        factor = level_w / self.sizes[0][0]
+        # viewport in level pixels
+        lx0, ly0 = x * factor, y * factor
+        lx1, ly1 = lx0 + width * factor / scale, ly0 + height * factor / scale
+        t = self.tile_size
+        # tiles under the viewport; the patch also spans any part off the map
+        c0, r0 = math.floor(lx0 / t), math.floor(ly0 / t)
+        c1, r1 = math.ceil(lx1 / t), math.ceil(ly1 / t)
+        cols, rows = math.ceil(level_w / t), math.ceil(level_h / t)
+        patch = Image.new(self.level_image(level).mode, ((c1 - c0) * t, (r1 - r0) * t))
+        for row in range(max(r0, 0), min(r1, rows)):
+            for col in range(max(c0, 0), min(c1, cols)):
+                patch.paste(self.tile(level, col, row), ((col - c0) * t, (row - r0) * t))
+        box = (lx0 - c0 * t, ly0 - r0 * t, lx1 - c0 * t, ly1 - r0 * t)
+        return patch.resize((int(width), int(height)), Image.Resampling.BILINEAR, box=box)
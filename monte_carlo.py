@@ -0,0 +1,124 @@
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import itertools
+import math
+import os
+import statistics
+import time
+
+from egnx_layout import nodes, edges, metres_per_pixel
+from event_sim import Scenario, run_day
+from route_cache import RouteCache
+from taxi_graph import TaxiGraph
+from traffic import TRAFFIC_FLOW_RATES
+
+# ==============================
+# SWEEP SETTINGS
+OPS_MODES = ("Normal Ops", "Low Visibility Ops")
+IMPROVEMENTS = ("stop_bars", "reduced_separation", "adaptive_sequencing")
+# none and all three. They only apply under LVP, so Normal Ops runs without
+# them only: with three flow rates, 9 configurations
+IMPROVEMENT_SETS = ((), IMPROVEMENTS)
+SWEEP_METRICS = ("movements_per_hour", "avg_delay", "avg_taxi_time", "runway_utilisation")
+Z_95 = 1.96
+
+
+def scenario_grid(ops_modes=OPS_MODES, flows=tuple(TRAFFIC_FLOW_RATES), improvement_sets=IMPROVEMENT_SETS):
+    """Return a Scenario for every distinct combination of the home-screen settings.
+
+    The improvements change nothing outside Low Visibility Ops, so other
+    ops modes get one scenario without them rather than repeats of it.
+    """
+    scenarios = []
+    seen = set()
+    for ops, flow, chosen in itertools.product(ops_modes, flows, improvement_sets):
+        scenario = Scenario(ops, flow, **{name: name in chosen for name in IMPROVEMENTS})
+        if not scenario.lvp:
+            scenario = Scenario(ops, flow)
+        key = repr(scenario)
+        if key not in seen:
+            seen.add(key)
+            scenarios.append(scenario)
+    return scenarios
+
+
+def confidence_interval(values, z=Z_95):
+    """Return (mean, low, high), a normal-approximation interval for the mean."""
+    mean = statistics.fmean(values)
+    if len(values) < 2:
+        return mean, mean, mean
+    half = z * statistics.stdev(values) / math.sqrt(len(values))
+    return mean, mean - half, mean + half
+
+
+# ==============================
+# WORKERS
+# Each worker process builds the graph and route cache once in its
+# initializer and keeps them here, so tasks only carry (scenario, seed).
+_worker_graph = None
+_worker_routes = None
+
+
+def _init_worker(layout_nodes, layout_edges, scale):
+    global _worker_graph, _worker_routes
+    _worker_graph = TaxiGraph(layout_nodes, layout_edges, scale)
+    _worker_routes = RouteCache(_worker_graph)
+
+
+def _run_task(task):
+    index, scenario, seed, hours = task
+    return index, run_day(_worker_graph, scenario, seed=seed, hours=hours, route_cache=_worker_routes)
+
+
+# ==============================
+# SWEEP
+def run_sweep(scenarios, seeds, hours=24.0, workers=None, layout=(nodes, edges, metres_per_pixel)):
+    """Run every scenario once per seed and summarise the results.
+
+    Runs in a ProcessPoolExecutor with `workers` processes (os.cpu_count()
+    by default); workers=1 runs in this process. Returns a list of
+    (scenario, runs, summary) in scenario order, where summary maps each
+    of SWEEP_METRICS to confidence_interval() of its per-seed values.
+    """
+    seeds = list(seeds)
+    tasks = [(i, scenario, seed, hours) for i, scenario in enumerate(scenarios) for seed in seeds]
+    results = [[] for _ in scenarios]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(*layout)
+        for index, metrics in map(_run_task, tasks):
+            results[index].append(metrics)
+    else:
+        # several tasks per round trip; the runs are short
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=layout) as pool:
+            for index, metrics in pool.map(_run_task, tasks, chunksize=chunksize):
+                results[index].append(metrics)
+    return [(scenario, runs, {name: confidence_interval([run[name] for run in runs]) for name in SWEEP_METRICS})
+            for scenario, runs in zip(scenarios, results)]
+
+
+def format_summary(sweep):
+    """Return the sweep as a text table, one row per scenario."""
+    lines = [f"{'scenario':<88} {'mov/h':>14} {'delay min':>16} {'taxi min':>16} {'rwy util %':>16}"]
+    for scenario, runs, summary in sweep:
+        cells = []
+        for name, scale in zip(SWEEP_METRICS, (1.0, 1 / 60.0, 1 / 60.0, 100.0)):
+            mean, low, high = summary[name]
+            cells.append(f"{mean * scale:7.2f} ±{(high - mean) * scale:5.2f}")
+        lines.append(f"{repr(scenario):<88} {cells[0]:>14} {cells[1]:>16} {cells[2]:>16} {cells[3]:>16}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monte Carlo sweep of the home-screen scenarios")
+    parser.add_argument("--seeds", type=int, default=20, help="runs per scenario")
+    parser.add_argument("--hours", type=float, default=24.0, help="simulated hours per run")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args()
+    scenarios = scenario_grid()
+    t0 = time.perf_counter()
+    sweep = run_sweep(scenarios, range(args.seeds), args.hours, args.workers)
+    print(format_summary(sweep))
+    print(f"{len(scenarios)} scenarios x {args.seeds} seeds in {time.perf_counter() - t0:.1f} s "
+          "(improvements only swept under Low Visibility Ops, the only mode they change)")
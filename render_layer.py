@@ -0,0 +1,154 @@
+import math
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+    HAS_PIL = True
+except ImportError:
+    Image = ImageDraw = ImageFont = None
+    HAS_PIL = False
+
+# ==============================
+# STATIC LAYER
+EDGE_COLOUR = "yellow"
+EDGE_DASH = (4, 2)             # pixels on, pixels off (as the old canvas dash)
+NODE_COLOUR = "red"
+LABEL_COLOUR = "white"
+BACKGROUND_COLOUR = "black"
+
+
+def dashed_line(draw, p, q, fill=EDGE_COLOUR, width=2, dash=EDGE_DASH):
+    """Draw p->q as dashes on a PIL ImageDraw (it has no dash option)."""
+    (x1, y1), (x2, y2) = p, q
+    length = math.hypot(x2 - x1, y2 - y1)
+    if length == 0.0:
+        return
+    ux, uy = (x2 - x1) / length, (y2 - y1) / length
+    on, off = dash
+    s = 0.0
+    while s < length:
+        e = min(s + on, length)
+        draw.line((x1 + ux * s, y1 + uy * s, x1 + ux * e, y1 + uy * e), fill=fill, width=width)
+        s = e + off
+
+
+def compose_static_layer(size, nodes, edges, background=None, offset=(0, 0), labels=True):
+    """Return the map with the taxiway graph drawn on it as one RGB image.
+
+    Everything that does not move (map, edges, nodes, node names) becomes a
+    single canvas image item instead of a few hundred lines, ovals and
+    texts that Tk would otherwise redraw under every moving aircraft.
+    background is a PIL image pasted at offset. Each undirected edge is
+    drawn once.
+    """
+    if not HAS_PIL:
+        raise RuntimeError("compose_static_layer needs Pillow")
+    image = Image.new("RGB", size, BACKGROUND_COLOUR)
+    if background is not None:
+        image.paste(background.convert("RGB"), offset)
+    draw = ImageDraw.Draw(image)
+    drawn = set()
+    for node, neighbors in edges.items():
+        for neighbor in neighbors:
+            if (neighbor, node) in drawn:
+                continue
+            drawn.add((node, neighbor))
+            dashed_line(draw, nodes[node], nodes[neighbor])
+    font = ImageFont.load_default()
+    for name, (x, y) in nodes.items():
+        draw.ellipse((x - 3, y - 3, x + 3, y + 3), fill=NODE_COLOUR, outline="black")
+        if labels:
+            draw.text((x, y - 10), name, fill=LABEL_COLOUR, font=font, anchor="mm")
+    return image
+
+
+# ==============================
+# AIRCRAFT SPRITES
+SPRITE_SIZE = 12
+POSITION_THRESHOLD = 1.0                   # pixels
+HEADING_THRESHOLD = math.radians(1.0)      # radians
+
+
+def triangle(x, y, heading, size=SPRITE_SIZE):
+    """Flat vertex list of the aircraft triangle, nose along heading."""
+    c, s = math.cos(heading), math.sin(heading)
+    cl, sl = math.cos(heading + 0.5), math.sin(heading + 0.5)
+    cr, sr = math.cos(heading - 0.5), math.sin(heading - 0.5)
+    return [x + size * c, y + size * s, x - size * cl, y - size * sl, x - size * cr, y - size * sr]
+
+
+class SpriteLayer:
+    """Aircraft drawn as canvas items that are reused and moved only when it shows.
+
+    Each aircraft gets a triangle and a label item (stored on its
+    triangle_id/label_id). draw() compares the aircraft with where its
+    sprite was last drawn and skips the canvas calls unless it moved by a
+    pixel or turned by a degree, so slow or queued aircraft cost nothing;
+    the label is moved only when the position changed. Items of removed
+    aircraft are hidden and handed to the next aircraft added rather than
+    deleted and recreated.
+    """
+
+    def __init__(self, canvas, size=SPRITE_SIZE, fill="blue", font=("Arial", 10, "bold"),
+                 position_threshold=POSITION_THRESHOLD, heading_threshold=HEADING_THRESHOLD):
+        self.canvas = canvas
+        self.size = size
+        self.fill = fill
+        self.font = font
+        self.position_threshold = position_threshold
+        self.heading_threshold = heading_threshold
+        # callsign -> [x, y, heading] as last drawn
+        self.drawn = {}
+        # hidden (triangle_id, label_id) pairs ready for reuse
+        self._free = []
+        self.moves = 0
+        self.skips = 0
+
+    def __len__(self):
+        return len(self.drawn)
+
+    def add(self, ac):
+        """Give an aircraft a sprite and draw it where it is."""
+        canvas = self.canvas
+        x, y = ac.coords
+        if self._free:
+            ac.triangle_id, ac.label_id = self._free.pop()
+            canvas.itemconfigure(ac.triangle_id, state="normal")
+            canvas.itemconfigure(ac.label_id, text=ac.callsign, state="normal")
+        else:
+            ac.triangle_id = canvas.create_polygon(*triangle(x, y, ac.heading, self.size), fill=self.fill)
+            ac.label_id = canvas.create_text(x, y - self.size - 10, text=ac.callsign, fill="white", font=self.font)
+        self.drawn[ac.callsign] = [math.nan, math.nan, math.nan]
+        self.draw(ac, force=True)
+
+    def remove(self, ac):
+        if self.drawn.pop(ac.callsign, None) is None:
+            return
+        self.canvas.itemconfigure(ac.triangle_id, state="hidden")
+        self.canvas.itemconfigure(ac.label_id, state="hidden")
+        self._free.append((ac.triangle_id, ac.label_id))
+        ac.triangle_id = ac.label_id = None
+
+    def draw(self, ac, coords=None, force=False):
+        """Move an aircraft's sprite if it changed visibly; return whether it moved.
+
+        coords is the triangle's vertex list when already computed (e.g.
+        FleetState.triangles()); force redraws regardless, e.g. for an
+        aircraft that just stopped, so it rests exactly on its final spot.
+        """
+        last = self.drawn.get(ac.callsign)
+        if last is None:
+            return False
+        x, y = ac.coords
+        heading = ac.heading
+        moved = force or abs(x - last[0]) >= self.position_threshold or abs(y - last[1]) >= self.position_threshold
+        turned = abs((heading - last[2] + math.pi) % (2.0 * math.pi) - math.pi) >= self.heading_threshold
+        if not (moved or turned):
+            self.skips += 1
+            return False
+        canvas = self.canvas
+        canvas.coords(ac.triangle_id, *(coords if coords is not None else triangle(x, y, heading, self.size)))
+        if moved:
+            canvas.coords(ac.label_id, x, y - self.size - 10)
+        last[0], last[1], last[2] = x, y, heading
+        self.moves += 1
+        return True
@@ -0,0 +1,431 @@
+import heapq
+import math
+
+from conflicts import SEPARATION
+from route_cache import RouteCache
+from spatial_index import GridIndex
+from spline import MIN_SEGMENT_SAMPLES, SAMPLE_SPACING, SplinePath, segment_samples
+
+# ==============================
+# RESERVATION DEFAULTS
+WAIT_STEP = 5.0          # seconds an aircraft may wait at a node per search step
+TIME_BUCKET = 1.0        # seconds; search states closer in time than this at a node merge
+PLAN_HORIZON = 1800.0    # give up on plans that would need longer than this
+PLAN_RETRY_STEP = 30.0   # seconds between later departures tried when no plan fits
+GOAL_DWELL = 90.0        # seconds a runway hold stays booked after arrival
+ON_EDGE_TOLERANCE = 2.0  # pixels; nodes this close to an edge lie on it
+MAX_TURN = 135.0         # degrees; sharper turns at a node count as U-turns
+
+
+class Plan:
+    """A booked route: timeline[j] = (node name, arrival time, departure time)."""
+
+    __slots__ = ("owner", "route", "timeline", "blocked")
+
+    def __init__(self, owner, route, timeline, blocked):
+        self.owner = owner
+        self.route = route
+        self.timeline = timeline
+        # stop-bar nodes that were lit (and avoided) when this plan was made
+        self.blocked = blocked
+
+    @property
+    def arrival(self):
+        return self.timeline[-1][1] if self.timeline else 0.0
+
+    def waits(self):
+        """Yield (route index, until) for every planned wait at a node."""
+        for j, (_, t_arr, t_dep) in enumerate(self.timeline):
+            if t_dep > t_arr + 1e-6:
+                yield j, t_dep
+
+
+# ==============================
+# RESERVATION TABLE
+class ReservationTable:
+    """Time windows booked on nodes and directed edges.
+
+    A node window [start, end) belongs to one aircraft; nobody else may
+    overlap it. Edge windows are kept per direction; the planner decides
+    which directed edges a move must find clear (taxilanes are
+    single-lane, so that is the opposite direction).
+    """
+
+    def __init__(self):
+        self.nodes = {}
+        self.edges = {}
+        self.owned = {}
+
+    def book_node(self, node, start, end, owner):
+        self.nodes.setdefault(node, []).append((start, end, owner))
+        self.owned.setdefault(owner, []).append((self.nodes, node))
+
+    def book_edge(self, u, v, start, end, owner):
+        self.edges.setdefault((u, v), []).append((start, end, owner))
+        self.owned.setdefault(owner, []).append((self.edges, (u, v)))
+
+    def node_free(self, node, start, end, owner=None):
+        for s, e, who in self.nodes.get(node, ()):
+            if s < end and start < e and who != owner:
+                return False
+        return True
+
+    def edge_free(self, edge, start, end, owner=None):
+        """True if nobody is booked on the directed edge (u, v) during [start, end)."""
+        for s, e, who in self.edges.get(edge, ()):
+            if s < end and start < e and who != owner:
+                return False
+        return True
+
+    def release(self, owner):
+        """Drop every booking held by owner."""
+        for table, key in self.owned.pop(owner, ()):
+            bookings = table.get(key)
+            if bookings:
+                bookings[:] = [b for b in bookings if b[2] != owner]
+                if not bookings:
+                    del table[key]
+
+    def owners_at(self, node, after=-math.inf):
+        """Owners with a window on node that ends after `after`."""
+        return {who for s, e, who in self.nodes.get(node, ()) if e > after}
+
+    def prune(self, before):
+        """Forget windows that ended before `before`; keeps scans short."""
+        for table in (self.nodes, self.edges):
+            for key in list(table):
+                kept = [b for b in table[key] if b[1] >= before]
+                if kept:
+                    table[key] = kept
+                else:
+                    del table[key]
+
+
+# ==============================
+# COOPERATIVE PLANNER
+class ReservationPlanner:
+    """Space-time A* over a TaxiGraph that plans around earlier bookings.
+
+    A search state is (node, previous node, time). From each state an
+    aircraft either taxis on along an edge at its speed (never turning
+    back by more than MAX_TURN) or waits WAIT_STEP seconds where it is.
+    A move is only allowed if it fits between the windows that other
+    aircraft have booked. Node windows are padded by one separation
+    headway (separation / speed) either side. Some layout edges run along
+    others (NS-STAND8N passes over STAND5N..STAND7N), so a move also books
+    the nodes it passes over and must find every collinear overlapping
+    edge clear in the opposite direction. The heuristic is the
+    stop-bar-free shortest distance to the goal divided by speed, so the
+    first plan found reaches the goal earliest. Lit stop bars are treated
+    as closed nodes; set_stop_bar() reports which plans to redo. Taxiway
+    closures (set_closed()) are never entered, not even as the goal.
+    """
+
+    def __init__(self, graph, separation=SEPARATION, wait_step=WAIT_STEP,
+                 horizon=PLAN_HORIZON, goal_dwell=GOAL_DWELL, retry_step=PLAN_RETRY_STEP):
+        self.graph = graph
+        self.separation = separation
+        self.wait_step = wait_step
+        self.horizon = horizon
+        self.goal_dwell = goal_dwell
+        self.retry_step = retry_step
+        self.table = ReservationTable()
+        self.plans = {}
+        self.blocked = set()
+        self.closed = set()
+        self.closed_edges = set()
+        # plain distance-to-goal trees for the heuristic
+        self._distances = RouteCache(graph, stop_bar_penalty=0.0)
+        self.expanded = 0
+        self.failed = 0
+        self._edge_lengths = {}
+        self._index_geometry()
+
+    def _edge_length(self, came_from, u, v):
+        """Metres of spline from u to v when arriving from came_from (-1 at the start).
+
+        Aircraft follow Catmull-Rom splines, which run a few percent longer
+        than the straight edges; timing moves on the spline keeps bookings
+        in step with the simulation.
+        """
+        key = (came_from, u, v)
+        length = self._edge_lengths.get(key)
+        if length is None:
+            pts = self.graph.points
+            P1, P2 = pts[u], pts[v]
+            P0 = pts[came_from] if came_from >= 0 else P1
+            n_points = max(MIN_SEGMENT_SAMPLES, math.ceil(math.dist(P1, P2) / SAMPLE_SPACING))
+            # the following node is not known yet; assume the route ends at v
+            length = segment_samples(P0, P1, P2, P2, n_points)[1][-1] * self.graph.metres_per_pixel
+            self._edge_lengths[key] = length
+        return length
+
+    def _index_geometry(self, tolerance=ON_EDGE_TOLERANCE):
+        """Precompute, per directed edge, the nodes it passes over and the opposing edges."""
+        graph = self.graph
+        pts = graph.points
+        nodes = GridIndex.from_points(enumerate(pts), cell_size=50)
+        self.interior = {}
+        for u, v, _ in graph.edge_items():
+            self.interior[(u, v)] = _nodes_on_segment(nodes, pts, u, v, tolerance)
+        self.opposing = {}
+        for (u, v), inside in self.interior.items():
+            (x1, y1), (x2, y2) = pts[u], pts[v]
+            ex, ey = x2 - x1, y2 - y1
+            seg_len2 = ex * ex + ey * ey
+            opposing = {(v, u)}
+            for w in [u, v] + [n for n, _ in inside]:
+                for b in graph.neighbors(w):
+                    if {w, b} == {u, v}:
+                        continue
+                    fractions = []
+                    for n in (w, b):
+                        px, py = pts[n][0] - x1, pts[n][1] - y1
+                        if abs(px * ey - py * ex) > tolerance * math.sqrt(seg_len2):
+                            break
+                        fractions.append((px * ex + py * ey) / seg_len2)
+                    else:
+                        lo, hi = sorted(fractions)
+                        if min(hi, 1.0) - max(lo, 0.0) > 1e-9:
+                            # collinear and overlapping: the edge running against u->v
+                            opposing.add((b, w) if fractions[1] > fractions[0] else (w, b))
+            self.opposing[(u, v)] = sorted(opposing)
+
+    def _distance_to(self, goal):
+        self._distances.route_ids(goal, goal)
+        return self._distances.trees[goal].dist
+
+    def plan(self, owner, start, goal, t0, speed):
+        """Plan and book a route from start to goal leaving no earlier than t0.
+
+        speed is in metres per second. If nothing fits from t0 (say the
+        start is still booked by an aircraft leaving it) the search is
+        retried every retry_step seconds later, up to the horizon, with the
+        aircraft holding at start until then. Returns the Plan, or None
+        (keeping any previous plan of owner, and counted in `failed`) if
+        nothing fits at all.
+        """
+        graph = self.graph
+        start_id = graph.id_of(start)
+        goal_id = graph.id_of(goal)
+        if start_id is None or goal_id is None or goal_id in self.closed:
+            return None
+        self.table.prune(t0 - self.goal_dwell)
+        retries = int(self.horizon // self.retry_step) if self.retry_step > 0 else 0
+        for delay in (k * self.retry_step for k in range(retries + 1)):
+            timeline = self._search(owner, start_id, goal_id, t0 + delay, speed)
+            if timeline is not None:
+                break
+        else:
+            self.failed += 1
+            return None
+        self.cancel(owner)
+        table = self.table
+        for kind, key, start_t, end_t in self._windows(timeline, t0 + delay, speed):
+            if kind == "node":
+                table.book_node(key, start_t, end_t, owner)
+            else:
+                table.book_edge(*key, start_t, end_t, owner)
+        # a late plan starts with a wait at the start node from t0; only the
+        # part of it that was searched (from t0 + delay) is booked
+        timeline[0][1] = t0
+        names = self.graph.names
+        plan = Plan(owner, [names[n] for n, _, _ in timeline],
+                    [(names[n], t_arr, t_dep) for n, t_arr, t_dep in timeline],
+                    set(self.blocked))
+        self.plans[owner] = plan
+        return plan
+
+    def _retime(self, states, t0, speed):
+        """Timeline [node, arrival, departure] of searched states, timed on the route's actual spline.
+
+        The search times each edge before the following node is known; the
+        spline the aircraft will fly bends towards it, so the times are
+        redone here, keeping the planned waits.
+        """
+        timeline = []
+        for node, _, t in states:
+            if timeline and timeline[-1][0] == node:
+                timeline[-1][2] = t
+            else:
+                timeline.append([node, t, t])
+        graph = self.graph
+        route = [graph.names[n] for n, _, _ in timeline]
+        node_dist = SplinePath.from_route(graph, route, scale=graph.metres_per_pixel).node_dist
+        t = t0
+        for j, entry in enumerate(timeline):
+            if j:
+                t += (node_dist[j] - node_dist[j - 1]) / speed
+            wait = entry[2] - entry[1]
+            entry[1], entry[2] = t, t + wait
+            t += wait
+        return timeline
+
+    def _windows(self, timeline, t0, speed):
+        """Yield the ("node", node, start, end) and ("edge", (u, v), start, end) windows a timeline books."""
+        headway = self.separation / speed
+        last = len(timeline) - 1
+        for j, (node, t_arr, t_dep) in enumerate(timeline):
+            start_t = t0 if j == 0 else t_arr - headway
+            end_t = t_arr + self.goal_dwell if j == last else t_dep + headway
+            yield "node", node, start_t, end_t
+            if j < last:
+                nxt, t_next = timeline[j + 1][0], timeline[j + 1][1]
+                yield "edge", (node, nxt), t_dep, t_next
+                for w, frac in self.interior[(node, nxt)]:
+                    t_pass = t_dep + frac * (t_next - t_dep)
+                    yield "node", w, t_pass - headway, t_pass + headway
+
+    def _fits(self, timeline, owner, t0, speed):
+        """True if none of the timeline's windows overlap another aircraft's booking."""
+        node_free, edge_free, opposing = self.table.node_free, self.table.edge_free, self.opposing
+        for kind, key, start_t, end_t in self._windows(timeline, t0, speed):
+            if kind == "node":
+                if not node_free(key, start_t, end_t, owner):
+                    return False
+            elif not all(edge_free(e, start_t, end_t, owner) for e in opposing[key]):
+                return False
+        return True
+
+    def cancel(self, owner):
+        self.table.release(owner)
+        return self.plans.pop(owner, None)
+
+    def set_stop_bar(self, node, lit, now):
+        """Close or reopen a node; return the owners whose plans should be redone.
+
+        Lighting a bar affects plans still due through that node; clearing
+        it affects plans made while it was lit, which may have detoured.
+        """
+        node_id = self.graph.id_of(node)
+        if lit:
+            self.blocked.add(node_id)
+            affected = self.table.owners_at(node_id, after=now)
+        else:
+            self.blocked.discard(node_id)
+            affected = {owner for owner, plan in self.plans.items()
+                        if node_id in plan.blocked and plan.arrival > now}
+        # in booking order, so replanning is deterministic
+        return [owner for owner in self.plans if owner in affected]
+
+    def set_closed(self, node, closed):
+        """Close or reopen a node for every later plan.
+
+        Plans already booked are left alone; Simulation reroutes the
+        aircraft a closure affects.
+        """
+        node_id = self.graph.id_of(node)
+        if node_id is None:
+            return
+        (self.closed.add if closed else self.closed.discard)(node_id)
+        (self._distances.close_node if closed else self._distances.reopen_node)(node)
+
+    def set_edge_closed(self, a, b, closed):
+        """Close or reopen the edge a-b (both ways) for every later plan."""
+        u, v = self.graph.id_of(a), self.graph.id_of(b)
+        if u is None or v is None:
+            return
+        (self.closed_edges.add if closed else self.closed_edges.discard)((min(u, v), max(u, v)))
+        (self._distances.close_edge if closed else self._distances.reopen_edge)(a, b)
+
+    def _search(self, owner, start, goal, t0, speed):
+        graph = self.graph
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        node_free, edge_free = self.table.node_free, self.table.edge_free
+        blocked, closed, closed_edges = self.blocked, self.closed, self.closed_edges
+        interior, opposing = self.interior, self.opposing
+        xs, ys = graph.xs, graph.ys
+        min_cos = math.cos(math.radians(MAX_TURN))
+        m_per_px = graph.metres_per_pixel
+        edge_length = self._edge_length
+        dist = self._distance_to(goal)
+        if dist[start] == math.inf:
+            return None
+        headway = self.separation / speed
+        wait_step = self.wait_step
+        deadline = t0 + self.horizon
+
+        def h(node):
+            return dist[node] * m_per_px / speed
+
+        parent = {}
+        seen = set()
+        counter = 0
+        start_state = (start, -1, t0)
+        pq = [(t0 + h(start), counter, start_state, None)]
+        heappop, heappush = heapq.heappop, heapq.heappush
+        while pq:
+            _, _, state, prev = heappop(pq)
+            u, came_from, t = state
+            key = (u, came_from, int(t // TIME_BUCKET))
+            if key in seen:
+                continue
+            seen.add(key)
+            parent[state] = prev
+            self.expanded += 1
+
+            if u == goal and node_free(u, t, t + self.goal_dwell, owner):
+                path = [state]
+                while parent[path[-1]] is not None:
+                    path.append(parent[path[-1]])
+                path.reverse()
+                # only return a plan whose spline-timed windows are all
+                # still free; otherwise keep searching (e.g. wait longer)
+                timeline = self._retime(path, t0, speed)
+                if self._fits(timeline, owner, t0, speed):
+                    return timeline
+
+            # taxi on along each edge
+            if u != goal:
+                if came_from >= 0:
+                    in_x, in_y = xs[u] - xs[came_from], ys[u] - ys[came_from]
+                    in_len = math.hypot(in_x, in_y)
+                for k in range(offsets[u], offsets[u + 1]):
+                    v = targets[k]
+                    if (v in blocked and v != goal) or v in closed:
+                        continue
+                    if closed_edges and (min(u, v), max(u, v)) in closed_edges:
+                        continue
+                    # no U-turns on a taxilane
+                    if came_from >= 0:
+                        out_x, out_y = xs[v] - xs[u], ys[v] - ys[u]
+                        if in_x * out_x + in_y * out_y < min_cos * in_len * weights[k]:
+                            continue
+                    ta = t + edge_length(came_from, u, v) / speed
+                    if dist[v] == math.inf or ta > deadline:
+                        continue
+                    if not all(edge_free(e, t, ta, owner) for e in opposing[(u, v)]):
+                        continue
+                    if not node_free(v, ta - headway, ta + headway, owner):
+                        continue
+                    if not all(node_free(w, tp - headway, tp + headway, owner)
+                               for w, tp in ((w, t + f * (ta - t)) for w, f in interior[(u, v)])):
+                        continue
+                    counter += 1
+                    heappush(pq, (ta + h(v), counter, (v, u, ta), state))
+
+            # or wait where we are
+            tw = t + wait_step
+            if tw <= deadline and node_free(u, t, tw + headway, owner):
+                counter += 1
+                heappush(pq, (tw + h(u), counter, (u, came_from, tw), state))
+        return None
+
+
+def _nodes_on_segment(nodes, pts, u, v, tolerance):
+    """Return [(node, fraction along u->v)] for nodes lying strictly inside edge u-v."""
+    (x1, y1), (x2, y2) = pts[u], pts[v]
+    ex, ey = x2 - x1, y2 - y1
+    length = math.hypot(ex, ey)
+    if length == 0.0:
+        return []
+    found = []
+    for w in nodes.within((x1 + x2) / 2, (y1 + y2) / 2, length / 2 + tolerance):
+        if w == u or w == v:
+            continue
+        px, py = pts[w][0] - x1, pts[w][1] - y1
+        frac = (px * ex + py * ey) / (length * length)
+        if 0.0 < frac < 1.0 and abs(px * ey - py * ex) / length <= tolerance:
+            found.append((w, frac))
+    found.sort(key=lambda item: item[1])
+    return found
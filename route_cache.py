@@ -0,0 +1,322 @@
+import heapq
+import math
+
+# ==============================
+# ROUTE CACHE
+# Lit stop bars are not hard blocks (aircraft hold at them), so they only make
+# a node more expensive to enter; closed nodes and edges cannot be entered.
+STOP_BAR_PENALTY = 300.0
+
+
+class _RouteTree:
+    """Shortest-path tree rooted at one destination (costs are cost-to-root)."""
+
+    __slots__ = ("root", "dist", "next_hop")
+
+    def __init__(self, root, dist, next_hop):
+        self.root = root
+        self.dist = dist
+        self.next_hop = next_hop
+
+
+class RouteCache:
+    """Serve shortest routes from per-destination trees built by reverse Dijkstra.
+
+    Trees for the runway entries and stands are built up front; any other
+    destination gets a tree on first use. A route is then a walk along
+    next_hop pointers, O(path length). Stop-bar and closure changes repair
+    the cached trees in place, touching only the nodes whose routes they
+    change, instead of rebuilding them. tables ({root id: (dist, next_hop)}, e.g.
+    from a compiled layout) seeds trees without building them; a tree
+    is copied the first time a repair writes to it.
+    """
+
+    def __init__(self, graph, destinations=(), stop_bar_penalty=STOP_BAR_PENALTY, tables=None):
+        self.graph = graph
+        self.stop_bar_penalty = stop_bar_penalty
+        self.penalty = [0.0] * len(graph)
+        self.closed_nodes = [False] * len(graph)
+        self.closed_edges = set()
+        self.trees = {}
+        self.hits = 0
+        self.builds = 0
+        self.repairs = 0
+        for root, (dist, next_hop) in (tables or {}).items():
+            self.trees[root] = _RouteTree(root, dist, next_hop)
+        for name in destinations:
+            node_id = graph.id_of(name)
+            if node_id is not None and node_id not in self.trees:
+                self.trees[node_id] = self._build_tree(node_id)
+
+    # ------------------------------
+    # Queries
+    def route(self, start, goal):
+        """Return the cached shortest route from start to goal as node names, or None."""
+        graph = self.graph
+        start_id = graph.id_of(start)
+        goal_id = graph.id_of(goal)
+        if start_id is None or goal_id is None:
+            return None
+        path = self.route_ids(start_id, goal_id)
+        return graph.path_names(path) if path is not None else None
+
+    def route_ids(self, start, goal):
+        """Return the cached shortest route between two node ids, or None."""
+        tree = self.trees.get(goal)
+        if tree is None:
+            tree = self.trees[goal] = self._build_tree(goal)
+        else:
+            self.hits += 1
+        if tree.dist[start] == math.inf:
+            return None
+        next_hop = tree.next_hop
+        path = [start]
+        node = start
+        while node != goal:
+            node = next_hop[node]
+            path.append(node)
+        return path
+
+    def cost(self, start, goal):
+        """Return the routing cost (including stop-bar penalties) from start to goal."""
+        start_id = self.graph.id_of(start)
+        goal_id = self.graph.id_of(goal)
+        tree = self.trees.get(goal_id)
+        if tree is None:
+            tree = self.trees[goal_id] = self._build_tree(goal_id)
+        return tree.dist[start_id]
+
+    # ------------------------------
+    # Dynamic constraints
+    # Each change repairs the cached trees in place (see _repair) and
+    # returns {root id: ids whose cost to that root changed}, so callers can
+    # tell which routes to revisit.
+    def set_stop_bar(self, name, lit):
+        """Record a stop bar being lit or cleared at a node."""
+        node_id = self.graph.id_of(name)
+        if node_id is None:
+            return {}
+        new_penalty = self.stop_bar_penalty if lit else 0.0
+        old_penalty = self.penalty[node_id]
+        if new_penalty == old_penalty:
+            return {}
+        self.penalty[node_id] = new_penalty
+        return self._node_changed(node_id, raised=new_penalty > old_penalty)
+
+    def sync_stop_bars(self, stop_bars):
+        """Apply a whole {node: lit} stop-bar dict, e.g. the GUI's `stop_bars`."""
+        for name, lit in stop_bars.items():
+            self.set_stop_bar(name, lit)
+
+    def close_node(self, name):
+        """Stop routes passing through a node (aircraft on it may still leave)."""
+        node_id = self.graph.id_of(name)
+        if node_id is None or self.closed_nodes[node_id]:
+            return {}
+        self.closed_nodes[node_id] = True
+        return self._node_changed(node_id, raised=True)
+
+    def reopen_node(self, name):
+        node_id = self.graph.id_of(name)
+        if node_id is None or not self.closed_nodes[node_id]:
+            return {}
+        self.closed_nodes[node_id] = False
+        return self._node_changed(node_id, raised=False)
+
+    def close_edge(self, a, b):
+        """Stop routes using the edge a-b in either direction."""
+        u, v = self.graph.id_of(a), self.graph.id_of(b)
+        if u is None or v is None:
+            return {}
+        key = (min(u, v), max(u, v))
+        if key in self.closed_edges:
+            return {}
+        self.closed_edges.add(key)
+        return self._repair_all([(u, v), (v, u)], raised=True)
+
+    def reopen_edge(self, a, b):
+        u, v = self.graph.id_of(a), self.graph.id_of(b)
+        if u is None or v is None:
+            return {}
+        key = (min(u, v), max(u, v))
+        if key not in self.closed_edges:
+            return {}
+        self.closed_edges.discard(key)
+        return self._repair_all([(u, v), (v, u)], raised=False)
+
+    def is_closed(self, a, b=None):
+        """True if node a (or the edge a-b) is closed."""
+        u = self.graph.id_of(a)
+        if b is None:
+            return u is not None and self.closed_nodes[u]
+        v = self.graph.id_of(b)
+        return u is not None and v is not None and (min(u, v), max(u, v)) in self.closed_edges
+
+    def invalidate(self):
+        """Drop every cached tree."""
+        self.trees.clear()
+
+    # ------------------------------
+    # Internals
+    def _node_changed(self, node_id, raised):
+        """Repair after entering node_id got dearer or cheaper (a penalty or closure change)."""
+        changes = {}
+        # a tree rooted at a closed node is empty, so closing or reopening
+        # its root just rebuilds it
+        tree = self.trees.get(node_id)
+        if tree is not None and self.closed_nodes[node_id] == (tree.dist[node_id] == 0.0):
+            self.trees[node_id] = self._build_tree(node_id)
+            changes[node_id] = set(range(len(self.graph)))
+        return self._repair_all([(u, node_id) for u in self.graph.neighbors(node_id)], raised, changes)
+
+    def _repair_all(self, arcs, raised, changes=None):
+        changes = {} if changes is None else changes
+        for root, tree in self.trees.items():
+            if root in changes:
+                continue
+            changed = self._repair(tree, arcs, raised)
+            if changed:
+                changes[root] = changed
+        return changes
+
+    def _repair(self, tree, arcs, raised):
+        """Bring one tree up to date after the arcs u->v got dearer (raised) or cheaper.
+
+        The tree is repaired in place, LPA*-style, touching only the nodes
+        whose cost to the root can change rather than rerunning Dijkstra
+        over the whole graph. When arcs get dearer, only nodes whose tree
+        path uses one of them can get worse. That is the subtree hanging
+        below each such arc. The subtree is cut loose, each of its nodes
+        is re-seeded from its best neighbour outside it, and Dijkstra
+        settles the subtree alone. When arcs get cheaper, their tail nodes
+        are improved and the improvement spreads out from there, stopping
+        at the first node it does not beat. Returns the ids whose
+        cost changed.
+        """
+        graph = self.graph
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        penalty, closed_nodes, closed_edges = self.penalty, self.closed_nodes, self.closed_edges
+        inf = math.inf
+        dist, next_hop = tree.dist, tree.next_hop
+        pq = []
+        changed = set()
+
+        if raised:
+            cut = set()
+            stale = []
+            for u, v in arcs:
+                if next_hop[u] != v or u in cut:
+                    continue
+                cut.add(u)
+                stack = [u]
+                while stack:
+                    x = stack.pop()
+                    stale.append(x)
+                    for k in range(offsets[x], offsets[x + 1]):
+                        y = targets[k]
+                        if next_hop[y] == x and y not in cut:
+                            cut.add(y)
+                            stack.append(y)
+            if not stale:
+                return changed
+            dist, next_hop = self._writable(tree)
+            old = [dist[x] for x in stale]
+            for x in stale:
+                dist[x] = inf
+                next_hop[x] = -1
+            for x in stale:
+                best, hop = inf, -1
+                for k in range(offsets[x], offsets[x + 1]):
+                    y = targets[k]
+                    if dist[y] == inf or closed_nodes[y]:
+                        continue
+                    if closed_edges and (min(x, y), max(x, y)) in closed_edges:
+                        continue
+                    nd = dist[y] + penalty[y] + weights[k]
+                    if nd < best:
+                        best, hop = nd, y
+                if hop >= 0:
+                    dist[x] = best
+                    next_hop[x] = hop
+                    pq.append((best, x))
+            heapq.heapify(pq)
+            changed.update(x for x, d in zip(stale, old) if d != inf)
+        else:
+            for u, v in arcs:
+                weight = graph.edge_weight(u, v)
+                if weight is None or dist[v] == inf or closed_nodes[v]:
+                    continue
+                if closed_edges and (min(u, v), max(u, v)) in closed_edges:
+                    continue
+                nd = dist[v] + penalty[v] + weight
+                if nd < dist[u]:
+                    if not pq:
+                        dist, next_hop = self._writable(tree)
+                    dist[u] = nd
+                    next_hop[u] = v
+                    heapq.heappush(pq, (nd, u))
+            if not pq:
+                return changed
+
+        self.repairs += 1
+        heappop, heappush = heapq.heappop, heapq.heappush
+        while pq:
+            d, v = heappop(pq)
+            if d > dist[v]:
+                continue
+            changed.add(v)
+            # Aircraft may leave a closed node but never route through it
+            if closed_nodes[v]:
+                continue
+            enter = d + penalty[v]
+            for k in range(offsets[v], offsets[v + 1]):
+                u = targets[k]
+                if closed_edges and (min(u, v), max(u, v)) in closed_edges:
+                    continue
+                nd = enter + weights[k]
+                if nd < dist[u]:
+                    dist[u] = nd
+                    next_hop[u] = v
+                    heappush(pq, (nd, u))
+        return changed
+
+    @staticmethod
+    def _writable(tree):
+        # tables from a compiled layout are read-only views; copy on first repair
+        if not isinstance(tree.dist, list):
+            tree.dist = list(tree.dist)
+            tree.next_hop = list(tree.next_hop)
+        return tree.dist, tree.next_hop
+
+    def _build_tree(self, root):
+        """Reverse Dijkstra from root; edge u->v costs its length plus v's penalty."""
+        self.builds += 1
+        graph = self.graph
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        penalty, closed_nodes, closed_edges = self.penalty, self.closed_nodes, self.closed_edges
+        inf = math.inf
+        dist = [inf] * len(graph)
+        next_hop = [-1] * len(graph)
+        if closed_nodes[root]:
+            return _RouteTree(root, dist, next_hop)
+
+        dist[root] = 0.0
+        pq = [(0.0, root)]
+        heappop, heappush = heapq.heappop, heapq.heappush
+        while pq:
+            d, v = heappop(pq)
+            if d > dist[v]:
+                continue
+            enter = d + penalty[v]
+            for k in range(offsets[v], offsets[v + 1]):
+                u = targets[k]
+                if closed_edges and (min(u, v), max(u, v)) in closed_edges:
+                    continue
+                nd = enter + weights[k]
+                if nd < dist[u]:
+                    dist[u] = nd
+                    next_hop[u] = v
+                    # Aircraft may leave a closed node but never route through it
+                    if not closed_nodes[u]:
+                        heappush(pq, (nd, u))
+        return _RouteTree(root, dist, next_hop)
@@ -0,0 +1,272 @@
+import heapq
+import math
+
+# ==============================
+# COST MODELS
+class CostModel:
+    """Plain Euclidean edge length.
+
+    edge_cost() returns the cost of moving u->v having arrived at u from prev
+    (-1 at the start of a route), or None if the move is not allowed. Costs
+    must never be below the edge length, otherwise the Euclidean A*
+    heuristic stops being admissible.
+    """
+
+    # Set when edge_cost depends on prev; searches then run over (prev, node) states
+    turn_dependent = False
+
+    def edge_cost(self, graph, prev, u, v, length):
+        return length
+
+
+class TaxiCostModel(CostModel):
+    """Edge length plus optional turn, runway-crossing and one-way rules.
+
+    turn_penalty is charged per radian of heading change at a node;
+    runway_crossing_penalty is charged for entering any node in
+    runway_nodes; one_way is an iterable of (from, to) node-name pairs that
+    may only be travelled in that direction. Unknown node names raise
+    ValueError.
+    """
+
+    def __init__(self, graph, turn_penalty=0.0, runway_nodes=(), runway_crossing_penalty=0.0, one_way=()):
+        self.turn_penalty = turn_penalty
+        self.turn_dependent = turn_penalty > 0.0
+        self.runway_crossing_penalty = runway_crossing_penalty
+        self.runway = [False] * len(graph)
+        for name in runway_nodes:
+            self.runway[_node_id(graph, name)] = True
+        self.forbidden = set()
+        for a, b in one_way:
+            self.forbidden.add((_node_id(graph, b), _node_id(graph, a)))
+
+    def edge_cost(self, graph, prev, u, v, length):
+        if (u, v) in self.forbidden:
+            return None
+        cost = length
+        if self.runway[v]:
+            cost += self.runway_crossing_penalty
+        if self.turn_dependent and prev >= 0:
+            xs, ys = graph.xs, graph.ys
+            a_in = math.atan2(ys[u] - ys[prev], xs[u] - xs[prev])
+            a_out = math.atan2(ys[v] - ys[u], xs[v] - xs[u])
+            turn = abs((a_out - a_in + math.pi) % (2 * math.pi) - math.pi)
+            cost += self.turn_penalty * turn
+        return cost
+
+
+def _node_id(graph, name):
+    node_id = graph.id_of(name)
+    if node_id is None:
+        raise ValueError(f"unknown node {name!r}")
+    return node_id
+
+
+# ==============================
+# ROUTING ENGINE
+class RouteResult:
+    __slots__ = ("path", "cost", "expanded")
+
+    def __init__(self, path, cost, expanded):
+        self.path = path
+        self.cost = cost
+        self.expanded = expanded
+
+    def __repr__(self):
+        return f"RouteResult(path={self.path}, cost={self.cost:.1f}, expanded={self.expanded})"
+
+
+class RoutingEngine:
+    """Shortest-path queries on a TaxiGraph with a selectable algorithm.
+
+    algorithm is one of "dijkstra", "astar" (Euclidean heuristic) or
+    "bidirectional" (bidirectional Dijkstra). Every query reports how many
+    nodes were expanded so the algorithms can be compared.
+    """
+
+    ALGORITHMS = ("dijkstra", "astar", "bidirectional")
+
+    def __init__(self, graph, cost_model=None, algorithm="astar"):
+        self.graph = graph
+        self.cost_model = cost_model or CostModel()
+        self.algorithm = algorithm
+
+    def route(self, start, goal, algorithm=None, cost_model=None):
+        """Return a RouteResult between two node names (path is None if unreachable)."""
+        graph = self.graph
+        start_id = graph.id_of(start)
+        goal_id = graph.id_of(goal)
+        if start_id is None or goal_id is None:
+            return RouteResult(None, math.inf, 0)
+        result = self.route_ids(start_id, goal_id, algorithm, cost_model)
+        if result.path is not None:
+            result.path = graph.path_names(result.path)
+        return result
+
+    def route_ids(self, start, goal, algorithm=None, cost_model=None):
+        """Same as route() but on node ids; the returned path holds ids."""
+        algorithm = algorithm or self.algorithm
+        cost_model = cost_model or self.cost_model
+        if algorithm == "dijkstra":
+            return self._best_first(start, goal, cost_model, False)
+        if algorithm == "astar":
+            return self._best_first(start, goal, cost_model, True)
+        if algorithm == "bidirectional":
+            if cost_model.turn_dependent:
+                raise ValueError("bidirectional search does not support turn-dependent cost models")
+            return self._bidirectional(start, goal, cost_model)
+        raise ValueError(f"Unknown routing algorithm: {algorithm!r}")
+
+    # ------------------------------
+    # Dijkstra / A*
+    def _best_first(self, start, goal, cost_model, use_heuristic):
+        if cost_model.turn_dependent:
+            return self._best_first_turns(start, goal, cost_model, use_heuristic)
+        graph = self.graph
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        xs, ys = graph.xs, graph.ys
+        gx, gy = xs[goal], ys[goal]
+        edge_cost = cost_model.edge_cost
+        plain = type(cost_model) is CostModel
+        inf = math.inf
+        dist = [inf] * len(graph)
+        prev = [-1] * len(graph)
+        dist[start] = 0.0
+        h = math.hypot(xs[start] - gx, ys[start] - gy) if use_heuristic else 0.0
+        pq = [(h, 0.0, start)]
+        heappop, heappush, hypot = heapq.heappop, heapq.heappush, math.hypot
+        expanded = 0
+
+        while pq:
+            _, cur_cost, node = heappop(pq)
+            if cur_cost > dist[node]:
+                continue
+            expanded += 1
+            if node == goal:
+                return RouteResult(_unwind(prev, start, goal), cur_cost, expanded)
+            came_from = prev[node]
+            for k in range(offsets[node], offsets[node + 1]):
+                nxt = targets[k]
+                step = weights[k] if plain else edge_cost(graph, came_from, node, nxt, weights[k])
+                if step is None:
+                    continue
+                new_cost = cur_cost + step
+                if new_cost < dist[nxt]:
+                    dist[nxt] = new_cost
+                    prev[nxt] = node
+                    h = hypot(xs[nxt] - gx, ys[nxt] - gy) if use_heuristic else 0.0
+                    heappush(pq, (new_cost + h, new_cost, nxt))
+
+        return RouteResult(None, inf, expanded)
+
+    def _best_first_turns(self, start, goal, cost_model, use_heuristic):
+        """Dijkstra/A* over (prev, node) states for turn-dependent costs."""
+        graph = self.graph
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        xs, ys = graph.xs, graph.ys
+        gx, gy = xs[goal], ys[goal]
+        edge_cost = cost_model.edge_cost
+        start_state = (-1, start)
+        dist = {start_state: 0.0}
+        parent = {}
+        h = math.hypot(xs[start] - gx, ys[start] - gy) if use_heuristic else 0.0
+        pq = [(h, 0.0, start_state)]
+        heappop, heappush, hypot = heapq.heappop, heapq.heappush, math.hypot
+        expanded = 0
+
+        while pq:
+            _, cur_cost, state = heappop(pq)
+            if cur_cost > dist[state]:
+                continue
+            expanded += 1
+            came_from, node = state
+            if node == goal:
+                path = [node]
+                while state in parent:
+                    state = parent[state]
+                    path.append(state[1])
+                path.reverse()
+                return RouteResult(path, cur_cost, expanded)
+            for k in range(offsets[node], offsets[node + 1]):
+                nxt = targets[k]
+                step = edge_cost(graph, came_from, node, nxt, weights[k])
+                if step is None:
+                    continue
+                new_cost = cur_cost + step
+                nxt_state = (node, nxt)
+                if new_cost < dist.get(nxt_state, math.inf):
+                    dist[nxt_state] = new_cost
+                    parent[nxt_state] = state
+                    h = hypot(xs[nxt] - gx, ys[nxt] - gy) if use_heuristic else 0.0
+                    heappush(pq, (new_cost + h, new_cost, nxt_state))
+
+        return RouteResult(None, math.inf, expanded)
+
+    # ------------------------------
+    # Bidirectional Dijkstra
+    def _bidirectional(self, start, goal, cost_model):
+        graph = self.graph
+        if start == goal:
+            return RouteResult([start], 0.0, 1)
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        edge_cost = cost_model.edge_cost
+        plain = type(cost_model) is CostModel
+        inf = math.inf
+        n = len(graph)
+        dist = ([inf] * n, [inf] * n)
+        prev = ([-1] * n, [-1] * n)
+        dist[0][start] = 0.0
+        dist[1][goal] = 0.0
+        queues = ([(0.0, start)], [(0.0, goal)])
+        heappop, heappush = heapq.heappop, heapq.heappush
+        best, meet = inf, -1
+        expanded = 0
+
+        while queues[0] and queues[1]:
+            if queues[0][0][0] + queues[1][0][0] >= best:
+                break
+            # Expand the side with the smaller frontier key
+            side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+            cur_cost, node = heappop(queues[side])
+            if cur_cost > dist[side][node]:
+                continue
+            expanded += 1
+            d_side, d_other, p_side = dist[side], dist[1 - side], prev[side]
+            for k in range(offsets[node], offsets[node + 1]):
+                nxt = targets[k]
+                if plain:
+                    step = weights[k]
+                elif side == 0:
+                    step = edge_cost(graph, -1, node, nxt, weights[k])
+                else:
+                    # backward search walks edges nxt->node in reverse
+                    step = edge_cost(graph, -1, nxt, node, weights[k])
+                if step is None:
+                    continue
+                new_cost = cur_cost + step
+                if new_cost < d_side[nxt]:
+                    d_side[nxt] = new_cost
+                    p_side[nxt] = node
+                    heappush(queues[side], (new_cost, nxt))
+                if new_cost + d_other[nxt] < best:
+                    best = new_cost + d_other[nxt]
+                    meet = nxt
+
+        if meet < 0:
+            return RouteResult(None, inf, expanded)
+        path = _unwind(prev[0], start, meet)
+        node = meet
+        while node != goal:
+            node = prev[1][node]
+            path.append(node)
+        return RouteResult(path, dist[0][meet] + dist[1][meet], expanded)
+
+
+def _unwind(prev, start, goal):
+    path = [goal]
+    node = goal
+    while node != start:
+        node = prev[node]
+        path.append(node)
+    path.reverse()
+    return path
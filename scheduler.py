@@ -0,0 +1,89 @@
+import math
+import time
+
+from instrumentation import instruments
+
+# ==============================
+# FRAME SCHEDULER
+class FrameScheduler:
+    """Drive a Simulation from a single Tk `after` loop.
+
+    Each frame advances the simulation by the wall-clock time since the
+    previous frame (in the simulation's fixed steps) and then calls
+    render(moving, stopped) once with the aircraft still moving and those
+    that went idle during the frame. When nothing is moving or waiting on
+    traffic ahead the loop stops; call start() again after giving an
+    aircraft a route or clearing a stop bar. time_scale runs simulated time
+    faster than the wall clock. Frame times (step + render) are kept for
+    display.
+
+    render_interval_ms decouples drawing from stepping: the simulation
+    advances every interval_ms but render() runs at most once per
+    render_interval_ms (and always on the frame the loop stops), so a
+    slow canvas does not hold the simulation back. Aircraft that went idle
+    between renders are all handed to the next one.
+    """
+
+    # cap catch-up after a stall so a slow frame cannot snowball
+    MAX_FRAME_GAP = 0.25
+
+    def __init__(self, app, sim, render, interval_ms=30, time_scale=1.0, render_interval_ms=None):
+        self.app = app
+        self.sim = sim
+        self.render = render
+        self.interval_ms = interval_ms
+        self.time_scale = time_scale
+        self.render_interval = (interval_ms if render_interval_ms is None else render_interval_ms) / 1000.0
+        self._after_id = None
+        self._last_tick = None
+        self._last_render = -math.inf
+        self.frames = 0
+        self.renders = 0
+        self.last_frame_ms = 0.0
+        self.avg_frame_ms = 0.0
+        self.max_frame_ms = 0.0
+
+    @property
+    def running(self):
+        return self._after_id is not None
+
+    def start(self):
+        """Start (or keep) the frame loop running."""
+        if self._after_id is None:
+            self._last_tick = time.perf_counter()
+            self._after_id = self.app.after(self.interval_ms, self._tick)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.app.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _tick(self):
+        t0 = time.perf_counter()
+        elapsed = min(t0 - self._last_tick, self.MAX_FRAME_GAP)
+        self._last_tick = t0
+        sim = self.sim
+        sim.advance(elapsed * self.time_scale)
+        # a little slack so a render interval equal to the tick interval renders every tick
+        if t0 - self._last_render >= self.render_interval * 0.9 or not sim.busy:
+            self._last_render = t0
+            sim.sync_positions()
+            self.render(list(sim.moving.values()), sim.drain_stopped())
+            self.renders += 1
+
+        frame_ms = (time.perf_counter() - t0) * 1000.0
+        self.frames += 1
+        self.last_frame_ms = frame_ms
+        self.avg_frame_ms += (frame_ms - self.avg_frame_ms) * 0.05
+        self.max_frame_ms = max(self.max_frame_ms, frame_ms)
+        instruments.record_frame(frame_ms)
+
+        if sim.busy:
+            self._after_id = self.app.after(self.interval_ms, self._tick)
+        else:
+            self._after_id = None
+
+    def stats(self):
+        """Return a short frame-time summary for the UI."""
+        return (f"{len(self.sim.moving)} moving | frame {self.last_frame_ms:.1f} ms "
+                f"(avg {self.avg_frame_ms:.1f}, max {self.max_frame_ms:.1f})")
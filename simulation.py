@@ -0,0 +1,762 @@
+import heapq
+import math
+
+from conflicts import ConflictDetector
+from fleet import FleetState
+from route_cache import RouteCache
+from spatial_index import GridIndex
+from spline import SplinePath
+from stop_bars import StopBarManager
+from traffic import ARRIVAL, DEPARTURE
+
+# ==============================
+# SIMULATION DEFAULTS
+FRAME_INTERVAL = 0.03                # seconds per GUI frame (the old app.after(30) chain)
+KT_TO_MS = 1852.0 / 3600.0
+TAXI_SPEED_KT = 15.0
+TAXI_SPEED = TAXI_SPEED_KT * KT_TO_MS   # metres per second
+AIRCRAFT_INDEX_CELL = 32.0           # pixels; about two aircraft symbols wide
+CONFLICT_CHECK_INTERVAL = 0.2        # seconds of simulated time between separation checks
+
+# Aircraft.status values and the changes allowed from each
+AT_STAND = "At Stand"
+TAXIING = "Taxiing"
+HOLDING = "Holding"
+RUNWAY = "Runway"
+ARRIVED = "Arrived"       # reached a destination that is not a runway entry
+AIRBORNE = "Airborne"
+STATUS_TRANSITIONS = {
+    AT_STAND: (TAXIING,),
+    TAXIING: (HOLDING, RUNWAY, ARRIVED),
+    HOLDING: (TAXIING, RUNWAY, ARRIVED),
+    RUNWAY: (TAXIING, AIRBORNE),
+    ARRIVED: (TAXIING,),
+    AIRBORNE: (),
+}
+
+# ==============================
+# AIRCRAFT CLASS
+class Aircraft:
+    __slots__ = ("callsign", "node", "coords", "heading", "triangle_id", "label_id", "route", "path",
+                 "dist_along_path", "speed", "waiting_for_stopbar", "waiting_for_traffic", "holding_for",
+                 "slot", "holding_at", "stop_bar_at", "waits", "kind", "status")
+
+    def __init__(self, callsign, node, coords=None, kind=DEPARTURE):
+        # logical node name where aircraft currently is (string)
+        self.callsign = callsign
+        self.node = node
+        # current coordinates (x,y) for drawing and movement
+        self.coords = coords if coords is not None else (0, 0)
+        self.heading = 0.0
+        self.triangle_id = None
+        self.label_id = None
+        self.route = []
+        # arc-length parameterised spline along route (SplinePath); when
+        # vectorized its samples live only in the FleetState buffer
+        self.path = None
+        # metres travelled along path, and speed in metres per second
+        self.dist_along_path = 0.0
+        self.speed = TAXI_SPEED
+        self.waiting_for_stopbar = False
+        # held behind another aircraft to keep separation, and by whom
+        self.waiting_for_traffic = False
+        self.holding_for = None
+        # index into the simulation's FleetState when stepping is vectorized
+        self.slot = None
+        # node whose stop bar is holding this aircraft, and the metres along
+        # path at which it must hold for the next lit bar on its route
+        self.holding_at = None
+        self.stop_bar_at = math.inf
+        # planned waits from a reservation plan: [(metres along path, until time)]
+        self.waits = []
+        # departures start on stand, arrivals on the runway they landed on;
+        # Simulation changes status only along STATUS_TRANSITIONS
+        self.kind = kind
+        self.status = RUNWAY if kind == ARRIVAL else AT_STAND
+
+    @property
+    def moving(self):
+        """True while the aircraft still has spline to follow."""
+        return self.path is not None and self.dist_along_path < self.path.length
+
+
+# ==============================
+# HEADLESS SIMULATION
+class Simulation:
+    """Taxi simulation core with no GUI dependencies.
+
+    Owns the aircraft, stop bars and route/spline state. step() advances
+    every aircraft by one fixed timestep; advance() and run() drive it for
+    a span of simulated time as fast as the CPU allows. A GUI only reads
+    aircraft state after each step and draws it.
+
+    With vectorized=True (needs NumPy) positions live in a FleetState and
+    all aircraft move in one batched NumPy step; Aircraft objects only get
+    their coords/heading copied back by sync_positions(), which a GUI calls
+    once per frame and headless runs can skip.
+    """
+
+    def __init__(self, graph, route_cache=None, dt=FRAME_INTERVAL, vectorized=False, conflict_detection=True,
+                 planner=None, takeoff_after=None, track_status=False, runway_entries=None, pushback_time=None,
+                 clear_after=None):
+        self.graph = graph
+        self.route_cache = route_cache or RouteCache(graph)
+        self.dt = dt
+        self.time = 0.0
+        self._accumulator = 0.0
+        self.active_aircraft = {}
+        # aircraft advanced by step(); idle ones (arrived/holding) drop out
+        self.moving = {}
+        # aircraft that left `moving` since the last drain_stopped()
+        self.stopped = []
+        # lit bars, who waits at each and each aircraft's next hold point
+        self.stop_bar_manager = StopBarManager(graph)
+        self.stop_bars = self.stop_bar_manager.lit
+        self.fleet = FleetState() if vectorized else None
+        self._slot_aircraft = {}
+        # aircraft positions for hit-testing and proximity queries,
+        # refreshed lazily when the simulation clock has moved on
+        self.aircraft_index = GridIndex(AIRCRAFT_INDEX_CELL)
+        self._indexed_at = None
+        # aircraft held for separation are re-checked every CONFLICT_CHECK_INTERVAL
+        self.conflicts = ConflictDetector(graph.metres_per_pixel) if conflict_detection else None
+        self.conflict_held = {}
+        self._next_conflict_check = 0.0
+        # optional ReservationPlanner; taxi_to then books conflict-free routes
+        self.planner = planner
+        self.plan_failures = 0
+        self._wait_heap = []
+        self._wait_seq = 0
+        # traffic stream (e.g. a TrafficGenerator) and its next movement
+        self._traffic_feed = None
+        self._traffic_start = 0.0
+        self._next_movement = None
+        # runway entry names (by default the layout's RWY* nodes)
+        if runway_entries is None:
+            runway_entries = (name for name in graph.names if name.startswith("RWY"))
+        self.runway_entries = set(runway_entries)
+        # seconds a departure spends on the runway before it takes off and
+        # leaves the simulation (None: it stays there)
+        self.takeoff_after = takeoff_after
+        self._takeoff_heap = []
+        # seconds a fed departure stays at its stand after its off-block time
+        # before it starts to taxi (None: it taxis at once)
+        self.pushback_time = pushback_time
+        self._pushback_heap = []
+        # seconds an arrived or airborne aircraft is kept before it is cleared
+        # for good (None: arrivals stay put); see drain_cleared()
+        self.clear_after = clear_after
+        self._clear_heap = []
+        self.cleared = []
+        # aircraft whose status changed since the last drain_status_changes(),
+        # kept only when track_status is on
+        self.status_changes = {} if track_status else None
+
+    # ------------------------------
+    # Aircraft
+    def add_aircraft(self, callsign, node, kind=DEPARTURE):
+        """Place a new aircraft at a node and return it."""
+        node_id = self.graph.id_of(node)
+        coords = self.graph.points[node_id] if node_id is not None else None
+        ac = Aircraft(callsign, node, coords, kind)
+        if self.fleet is not None:
+            ac.slot = self.fleet.add(*ac.coords)
+            self._slot_aircraft[ac.slot] = ac
+        self.active_aircraft[callsign] = ac
+        self.aircraft_index.insert(callsign, *ac.coords)
+        if self.status_changes is not None:
+            self.status_changes[callsign] = ac
+        return ac
+
+    def remove_aircraft(self, callsign):
+        self.moving.pop(callsign, None)
+        self.conflict_held.pop(callsign, None)
+        self.aircraft_index.remove(callsign)
+        if self.planner is not None:
+            self.planner.cancel(callsign)
+        ac = self.active_aircraft.pop(callsign, None)
+        if ac is not None:
+            self.stop_bar_manager.forget(ac)
+        if ac is not None and ac.slot is not None:
+            self.fleet.remove(ac.slot)
+            del self._slot_aircraft[ac.slot]
+        return ac
+
+    def take_off(self, callsign):
+        """Mark a departure airborne and remove it from the ground simulation."""
+        ac = self.remove_aircraft(callsign)
+        if ac is not None:
+            self._set_status(ac, AIRBORNE)
+            if self.clear_after is not None:
+                heapq.heappush(self._clear_heap, (self.time + self.clear_after, id(ac), ac))
+        return ac
+
+    def _set_status(self, ac, status):
+        if status == ac.status:
+            return
+        if status not in STATUS_TRANSITIONS[ac.status]:
+            raise ValueError(f"{ac.callsign}: cannot go from {ac.status} to {status}")
+        ac.status = status
+        if self.status_changes is not None:
+            self.status_changes[ac.callsign] = ac
+
+    def drain_cleared(self):
+        """Return and forget the callsigns cleared (see clear_after) since the last call.
+
+        Like drain_status_changes(), only filled with track_status=True.
+        """
+        cleared, self.cleared = self.cleared, []
+        return cleared
+
+    def _release_clears(self):
+        heap = self._clear_heap
+        while heap and heap[0][0] <= self.time + 1e-9:
+            _, _, ac = heapq.heappop(heap)
+            current = self.active_aircraft.get(ac.callsign)
+            if current is not None:
+                # the callsign is back in use, or the arrival was given a new route
+                if current is not ac or ac.status != ARRIVED:
+                    continue
+                self.remove_aircraft(ac.callsign)
+            if self.status_changes is not None:
+                self.cleared.append(ac.callsign)
+
+    def _release_pushbacks(self):
+        heap = self._pushback_heap
+        while heap and heap[0][0] <= self.time + 1e-9:
+            _, _, ac, destination = heapq.heappop(heap)
+            if self.active_aircraft.get(ac.callsign) is ac and ac.status == AT_STAND:
+                self.taxi_to(ac.callsign, destination)
+
+    def drain_status_changes(self):
+        """Return and forget the aircraft added or changed in status since the last call.
+
+        Always empty unless the simulation was made with track_status=True.
+        """
+        if self.status_changes is None:
+            return []
+        changed = list(self.status_changes.values())
+        self.status_changes.clear()
+        return changed
+
+    def _release_takeoffs(self):
+        heap = self._takeoff_heap
+        while heap and heap[0][0] <= self.time + 1e-9:
+            _, callsign = heapq.heappop(heap)
+            ac = self.active_aircraft.get(callsign)
+            # an aircraft given a new route meanwhile stays on the ground
+            if ac is not None and ac.status == RUNWAY:
+                self.take_off(callsign)
+
+    def taxi_to(self, callsign, destination, speed=None):
+        """Route an aircraft from its current node to destination; return the route or None.
+
+        speed is in metres per second (TAXI_SPEED, i.e. 15 kt, by default).
+        With a planner the route is booked around other aircraft's
+        reservations (leaving later if it must); if no booking fits at all
+        the aircraft stays where it is, is counted in plan_failures and
+        None is returned, as an unbooked route would ignore everyone
+        else's.
+        """
+        ac = self.active_aircraft[callsign]
+        if self.planner is not None:
+            plan = self.planner.plan(callsign, ac.node, destination, self.time, speed or ac.speed)
+            if plan is None:
+                self.plan_failures += 1
+                return None
+            self.assign_route(ac, plan.route, speed, waits=plan.waits())
+            return plan.route
+        route = self.route_cache.route(ac.node, destination)
+        if not route:
+            return None
+        self.assign_route(ac, route, speed)
+        return route
+
+    def assign_route(self, ac, route, speed=None, waits=(), start_dist=0.0, lead_in=None):
+        """Give an aircraft a route (list of node names) and build its spline.
+
+        waits are (route index, until time) pairs at which the aircraft
+        holds on its route node; start_dist starts it part way along, and
+        lead_in shapes the first edge (see SplinePath.from_route).
+        """
+        ac.route = route
+        ac.path = SplinePath.from_route(self.graph, route, scale=self.graph.metres_per_pixel, lead_in=lead_in)
+        ac.dist_along_path = start_dist
+        ac.waiting_for_stopbar = False
+        ac.holding_at = None
+        ac.waiting_for_traffic = False
+        ac.holding_for = None
+        self.conflict_held.pop(ac.callsign, None)
+        if speed is not None:
+            ac.speed = speed
+        x, y, heading, _ = ac.path.sample(start_dist)
+        ac.coords = (x, y)
+        ac.heading = heading
+        self.moving[ac.callsign] = ac
+        node_dist = ac.path.node_dist
+        ac.stop_bar_at = self.stop_bar_manager.assign(ac, route, node_dist, start_dist)
+        if ac.slot is not None:
+            self.fleet.set_path(ac.slot, ac.path, ac.speed, start_dist, ac.stop_bar_at)
+            ac.path = ac.path.without_samples()
+        ac.waits = [(node_dist[j], until) for j, until in waits if until > self.time]
+        self._apply_wait(ac)
+        self._set_status(ac, TAXIING)
+
+    def feed_traffic(self, movements, start=None):
+        """Spawn aircraft from an iterable of traffic.Movements as the clock reaches them.
+
+        Movement times count from `start` (the current time by default).
+        Only the next movement is read ahead, so the stream can be endless.
+        Each aircraft appears at its origin and taxis to its destination;
+        departures wait pushback_time at the stand first.
+        """
+        self._traffic_feed = iter(movements)
+        self._traffic_start = self.time if start is None else start
+        self._next_movement = next(self._traffic_feed, None)
+
+    def _spawn_traffic(self):
+        movement = self._next_movement
+        while movement is not None and self._traffic_start + movement.time <= self.time + 1e-9:
+            if movement.callsign not in self.active_aircraft and movement.origin in self.graph:
+                ac = self.add_aircraft(movement.callsign, movement.origin, movement.kind)
+                if movement.kind == DEPARTURE and self.pushback_time is not None:
+                    heapq.heappush(self._pushback_heap, (self.time + self.pushback_time, id(ac), ac,
+                                                         movement.destination))
+                else:
+                    self.taxi_to(movement.callsign, movement.destination)
+            movement = self._next_movement = next(self._traffic_feed, None)
+
+    def replan(self, ac):
+        """Re-book an aircraft's route to its destination from where it is now.
+
+        An aircraft between two nodes keeps going to the next one and the
+        new plan starts there. Returns the new route, or None (keeping the
+        old one) if no booking fits.
+        """
+        if self.planner is None or not ac.moving:
+            return None
+        self.sync_positions((ac,))
+        path, route, d = ac.path, ac.route, ac.dist_along_path
+        j = path.segment_at(d)
+        if d <= path.node_dist[j]:
+            plan = self.planner.plan(ac.callsign, route[j], route[-1], self.time, ac.speed)
+            if plan is None:
+                return None
+            self.assign_route(ac, plan.route, waits=plan.waits())
+            return plan.route
+        t_next = self.time + (path.node_dist[j+1] - d) / ac.speed
+        plan = self.planner.plan(ac.callsign, route[j+1], route[-1], t_next, ac.speed)
+        if plan is None:
+            return None
+        new_route = [route[j]] + plan.route
+        self.assign_route(ac, new_route, waits=[(i + 1, until) for i, until in plan.waits()],
+                          start_dist=d - path.node_dist[j], lead_in=self._lead_in(route, j))
+        return new_route
+
+    def _lead_in(self, route, j):
+        """Outer control points of edge j of a route, to keep an aircraft on it while rerouting."""
+        points, index = self.graph.points, self.graph.index
+        return (points[index[route[j - 1 if j > 0 else j]]],
+                points[index[route[j + 2 if j + 2 < len(route) else j + 1]]])
+
+    def _apply_wait(self, ac):
+        """Point the step loop at the aircraft's next planned wait, if any."""
+        stop_at = math.inf
+        if ac.waits:
+            stop_at, until = ac.waits[0]
+            self._wait_seq += 1
+            heapq.heappush(self._wait_heap, (until, self._wait_seq, ac.callsign, ac.waits[0]))
+        if ac.slot is not None:
+            self.fleet.stop_at[ac.slot] = stop_at
+
+    def _release_waits(self):
+        heap = self._wait_heap
+        while heap and heap[0][0] <= self.time + 1e-9:
+            _, _, callsign, wait = heapq.heappop(heap)
+            ac = self.active_aircraft.get(callsign)
+            # stale entries (re-routed or removed aircraft) are skipped
+            if ac is not None and ac.waits and ac.waits[0] is wait:
+                ac.waits.pop(0)
+                self._apply_wait(ac)
+
+    # ------------------------------
+    # Proximity queries
+    def position_of(self, ac):
+        """Current (x, y) of an aircraft, read from the fleet when vectorized."""
+        if ac.slot is not None and self.fleet.active[ac.slot]:
+            return float(self.fleet.x[ac.slot]), float(self.fleet.y[ac.slot])
+        return ac.coords
+
+    def _refresh_aircraft_index(self):
+        if self._indexed_at == self.time:
+            return
+        move = self.aircraft_index.move
+        for callsign, ac in self.active_aircraft.items():
+            move(callsign, *self.position_of(ac))
+        self._indexed_at = self.time
+
+    def aircraft_at(self, x, y, max_dist=15.0):
+        """Return the aircraft under (x, y) (within max_dist pixels), or None."""
+        self._refresh_aircraft_index()
+        callsign = self.aircraft_index.nearest(x, y, max_dist)
+        return self.active_aircraft[callsign] if callsign is not None else None
+
+    def aircraft_near(self, x, y, radius):
+        """Return the aircraft within radius pixels of (x, y), nearest first."""
+        self._refresh_aircraft_index()
+        return [self.active_aircraft[c] for c in self.aircraft_index.within(x, y, radius)]
+
+    # ------------------------------
+    # Stop bars
+    def set_stop_bar(self, node, lit):
+        """Light or clear a stop bar, updating only the aircraft whose routes cross it."""
+        self.route_cache.set_stop_bar(node, lit)
+        changed, woken = self.stop_bar_manager.set(node, lit, self._distance_along)
+        for ac, hold_at in changed:
+            ac.stop_bar_at = hold_at
+            if ac.slot is not None:
+                self.fleet.bar_at[ac.slot] = hold_at
+        for ac in woken:
+            self._resume_from_stop_bar(ac)
+        if self.planner is not None:
+            for callsign in self.planner.set_stop_bar(node, lit, self.time):
+                ac = self.active_aircraft.get(callsign)
+                if ac is not None:
+                    self.replan(ac)
+
+    def resume_aircraft_waiting_at(self, node):
+        """Send aircraft held by the stop bar at `node` across it and back into the step loop.
+
+        Clearing a bar with set_stop_bar() already does this, so it only
+        matters for a bar that is still lit: the aircraft cross it and hold
+        at the next lit bar on their route instead.
+        """
+        manager = self.stop_bar_manager
+        for ac in manager.waiting_at(node):
+            ac.stop_bar_at = manager.release(ac)
+            if ac.slot is not None:
+                self.fleet.bar_at[ac.slot] = ac.stop_bar_at
+            self._resume_from_stop_bar(ac)
+
+    def _distance_along(self, ac):
+        if ac.slot is not None and self.fleet.active[ac.slot]:
+            return float(self.fleet.offset[ac.slot])
+        return ac.dist_along_path
+
+    def _hold_at_stop_bar(self, ac):
+        ac.waiting_for_stopbar = True
+        ac.holding_at = self.stop_bar_manager.reach(ac)
+        self._set_status(ac, HOLDING)
+
+    def _resume_from_stop_bar(self, ac):
+        ac.waiting_for_stopbar = False
+        ac.holding_at = None
+        if ac.slot is not None:
+            self.fleet.holding[ac.slot] = False
+        if not ac.waiting_for_traffic:
+            self._set_status(ac, TAXIING)
+            self.moving[ac.callsign] = ac
+
+    def toggle_stop_bar(self, node):
+        self.set_stop_bar(node, not self.stop_bars.get(node))
+        return self.stop_bars[node]
+
+    # ------------------------------
+    # Closures
+    # The route cache repairs its trees in place; only aircraft whose route
+    # ahead crosses the closure (or could now be shortened) are rerouted.
+    def close_node(self, node):
+        """Close a node to routing and reroute aircraft due to pass through it.
+
+        Aircraft standing on it may still leave. Returns the callsigns rerouted.
+        """
+        self.route_cache.close_node(node)
+        if self.planner is not None:
+            self.planner.set_closed(node, True)
+        return self._reroute_where(lambda ahead: node in ahead)
+
+    def reopen_node(self, node):
+        """Reopen a node and reroute aircraft it now gives a shorter way."""
+        changes = self.route_cache.reopen_node(node)
+        if self.planner is not None:
+            self.planner.set_closed(node, False)
+        return self._reroute_improved(changes)
+
+    def close_edge(self, a, b):
+        """Close the edge a-b (both ways) and reroute aircraft due to use it.
+
+        An aircraft already on the edge carries on to its end. Returns the
+        callsigns rerouted.
+        """
+        self.route_cache.close_edge(a, b)
+        if self.planner is not None:
+            self.planner.set_edge_closed(a, b, True)
+        edge = {a, b}
+        return self._reroute_where(lambda ahead: a in ahead and any({x, y} == edge for x, y in zip(ahead, ahead[1:])))
+
+    def reopen_edge(self, a, b):
+        """Reopen the edge a-b and reroute aircraft it now gives a shorter way."""
+        changes = self.route_cache.reopen_edge(a, b)
+        if self.planner is not None:
+            self.planner.set_edge_closed(a, b, False)
+        return self._reroute_improved(changes)
+
+    def reroute(self, ac):
+        """Put a taxiing aircraft on the best route to its destination from where it is now.
+
+        Uses replan() when there is a planner, else the route cache. As in
+        replan(), an aircraft between two nodes keeps going to the next one
+        and the new route starts there, its spline continuing from the
+        aircraft's current position. Returns the new route, or None if the
+        aircraft keeps its old one (already the best, or no route left).
+        """
+        if self.planner is not None:
+            return self.replan(ac)
+        if not ac.moving:
+            return None
+        self.sync_positions((ac,))
+        path, route, d = ac.path, ac.route, ac.dist_along_path
+        i = self._next_route_index(ac, d)
+        ahead = self.route_cache.route(route[i], route[-1])
+        if not ahead or ahead == route[i:]:
+            return None
+        j = path.segment_at(d)
+        if i == j:
+            self.assign_route(ac, ahead)
+            return ahead
+        new_route = [route[j]] + ahead
+        self.assign_route(ac, new_route, start_dist=d - path.node_dist[j], lead_in=self._lead_in(route, j))
+        return new_route
+
+    def _next_route_index(self, ac, d=None):
+        """Route index of the node an aircraft is standing on or taxiing towards."""
+        path = ac.path
+        if d is None:
+            d = self._distance_along(ac)
+        j = path.segment_at(d)
+        return j if d <= path.node_dist[j] else j + 1
+
+    def _reroute_where(self, crosses):
+        """Reroute the aircraft whose route ahead `crosses` (a test on route names) accepts."""
+        rerouted = []
+        for ac in list(self.active_aircraft.values()):
+            if ac.moving and crosses(ac.route[self._next_route_index(ac):]) and self.reroute(ac) is not None:
+                rerouted.append(ac.callsign)
+        return rerouted
+
+    def _reroute_improved(self, changes):
+        """Reroute aircraft whose route ahead passes a node that got cheaper to their destination.
+
+        changes is what the route cache's repair returned: {root id: ids
+        whose cost to it changed}.
+        """
+        if not changes:
+            return []
+        index, rerouted = self.graph.index, []
+        for ac in list(self.active_aircraft.values()):
+            if not ac.moving:
+                continue
+            changed = changes.get(index.get(ac.route[-1]))
+            if not changed:
+                continue
+            ahead = ac.route[self._next_route_index(ac):]
+            if any(index[name] in changed for name in ahead) and self.reroute(ac) is not None:
+                rerouted.append(ac.callsign)
+        return rerouted
+
+    # ------------------------------
+    # Separation
+    def set_reduced_separation(self, reduced):
+        """Switch between the normal and reduced separation minima."""
+        if self.conflicts is not None:
+            self.conflicts.set_reduced(reduced)
+            self._next_conflict_check = self.time
+
+    def _traffic(self):
+        """Yield (callsign, x, y, heading, metres remaining) for aircraft still on a route."""
+        fleet = self.fleet
+        if fleet is not None:
+            n = fleet.count
+            slots = (fleet.active[:n] & (fleet.offset[:n] < fleet.length[:n])).nonzero()[0]
+            remaining = (fleet.length[slots] - fleet.offset[slots]).tolist()
+            for slot, x, y, heading, rem in zip(slots.tolist(), fleet.x[slots].tolist(),
+                                                fleet.y[slots].tolist(), fleet.heading[slots].tolist(), remaining):
+                yield self._slot_aircraft[slot].callsign, x, y, heading, rem
+            return
+        for callsign, ac in self.active_aircraft.items():
+            path = ac.path
+            if path is not None and ac.dist_along_path < path.length:
+                yield callsign, ac.coords[0], ac.coords[1], ac.heading, path.length - ac.dist_along_path
+
+    def check_conflicts(self):
+        """Hold trailing aircraft that are inside the separation minimum and release the rest."""
+        holds = self.conflicts.find_holds(self._traffic())
+        fleet = self.fleet
+        for callsign, leader in holds.items():
+            ac = self.active_aircraft[callsign]
+            if callsign in self.moving:
+                del self.moving[callsign]
+                if ac.slot is not None:
+                    fleet.blocked[ac.slot] = True
+                    self.sync_positions((ac,))
+                ac.waiting_for_traffic = True
+                self._set_status(ac, HOLDING)
+                self.conflict_held[callsign] = ac
+                self.stopped.append(ac)
+            if ac.waiting_for_traffic:
+                ac.holding_for = leader
+        for callsign in [c for c in self.conflict_held if c not in holds]:
+            ac = self.conflict_held.pop(callsign)
+            ac.waiting_for_traffic = False
+            ac.holding_for = None
+            if ac.slot is not None:
+                fleet.blocked[ac.slot] = False
+            # a stop bar that lit meanwhile keeps holding it
+            if not ac.waiting_for_stopbar:
+                self._set_status(ac, TAXIING)
+                self.moving[callsign] = ac
+
+    @property
+    def busy(self):
+        """True while aircraft are moving, held for traffic, queued (pushback, takeoff, clearing) or still to be fed in."""
+        return bool(self.moving or self._takeoff_heap or self._pushback_heap or self._clear_heap
+                    or self._next_movement is not None
+                    or self._awaiting_release())
+
+    def _awaiting_release(self):
+        """True if an aircraft held for traffic can be released without outside input.
+
+        Aircraft queued behind one held at a stop bar stay put until the bar
+        clears, so they alone do not keep the frame loop running.
+        """
+        active = self.active_aircraft
+        for ac in self.conflict_held.values():
+            leader = active.get(ac.holding_for)
+            if leader is None or not (leader.waiting_for_stopbar or leader.waiting_for_traffic):
+                return True
+        return False
+
+    # ------------------------------
+    # Stepping
+    def step(self, dt=None):
+        """Advance every moving aircraft by one timestep (the fixed dt by default)."""
+        dt = self.dt if dt is None else dt
+        if self._next_movement is not None:
+            self._spawn_traffic()
+        if self._pushback_heap:
+            self._release_pushbacks()
+        if self._takeoff_heap:
+            self._release_takeoffs()
+        if self._clear_heap:
+            self._release_clears()
+        if self._wait_heap:
+            self._release_waits()
+        if self.conflicts is not None and self.time >= self._next_conflict_check - 1e-9:
+            self.check_conflicts()
+            self._next_conflict_check = self.time + CONFLICT_CHECK_INTERVAL
+        if self.fleet is not None:
+            # a quiet spell (all aircraft parked or waiting) costs no batch step
+            if self.moving:
+                self._step_fleet(dt)
+            self.time += dt
+            return
+        for callsign, ac in list(self.moving.items()):
+            if not self.step_aircraft(ac, dt):
+                del self.moving[callsign]
+                self.stopped.append(ac)
+        self.time += dt
+
+    def drain_stopped(self):
+        """Return and forget the aircraft that stopped moving since the last call."""
+        stopped, self.stopped = self.stopped, []
+        return stopped
+
+    def advance(self, seconds):
+        """Advance by `seconds` of simulated time in fixed dt steps; return steps taken.
+
+        Leftover time below one step is carried into the next call, so a GUI
+        can feed wall-clock deltas and still get deterministic stepping.
+        """
+        self._accumulator += seconds
+        steps = 0
+        # tolerance keeps float drift from dropping a whole step
+        while self._accumulator >= self.dt * (1 - 1e-9):
+            self.step()
+            self._accumulator -= self.dt
+            steps += 1
+        return steps
+
+    def run(self, duration):
+        """Run headless for `duration` simulated seconds."""
+        return self.advance(duration)
+
+    def sync_positions(self, aircraft=None):
+        """Copy batched fleet state onto Aircraft objects (moving ones by default)."""
+        fleet = self.fleet
+        if fleet is None:
+            return
+        for ac in (self.moving.values() if aircraft is None else aircraft):
+            slot = ac.slot
+            if not fleet.active[slot]:
+                continue
+            ac.coords = (float(fleet.x[slot]), float(fleet.y[slot]))
+            ac.heading = float(fleet.heading[slot])
+            ac.dist_along_path = float(fleet.offset[slot])
+            ac.node = ac.route[ac.path.segment_at(ac.dist_along_path)]
+
+    def _step_fleet(self, dt):
+        fleet = self.fleet
+        arrived, held = fleet.step(dt)
+        for slot in arrived.tolist():
+            ac = self._slot_aircraft[slot]
+            self._arrive(ac)
+            self.moving.pop(ac.callsign, None)
+            self.stopped.append(ac)
+        for slot in held.tolist():
+            ac = self._slot_aircraft[slot]
+            self.sync_positions((ac,))
+            self._hold_at_stop_bar(ac)
+            self.moving.pop(ac.callsign, None)
+            self.stopped.append(ac)
+
+    def _arrive(self, ac):
+        self.stop_bar_manager.forget(ac)
+        if ac.route:
+            ac.node = ac.route[-1]
+            node_id = self.graph.id_of(ac.node)
+            if node_id is not None:
+                ac.coords = self.graph.points[node_id]
+        if ac.path is not None:
+            ac.dist_along_path = ac.path.length
+        if ac.node in self.runway_entries and ac.kind == DEPARTURE:
+            self._set_status(ac, RUNWAY)
+            if self.takeoff_after is not None:
+                heapq.heappush(self._takeoff_heap, (self.time + self.takeoff_after, ac.callsign))
+        else:
+            self._set_status(ac, ARRIVED)
+            if self.clear_after is not None:
+                heapq.heappush(self._clear_heap, (self.time + self.clear_after, id(ac), ac))
+
+    def step_aircraft(self, ac, dt):
+        """Move one aircraft along its path; return False once it has stopped moving."""
+        path = ac.path
+        if ac.dist_along_path >= path.length:
+            # arrived or nothing to follow
+            self._arrive(ac)
+            return False
+
+        d = ac.dist_along_path
+        # the next lit stop bar's hold point is precomputed, so this is the
+        # only stop-bar check while moving
+        if d >= ac.stop_bar_at:
+            self._hold_at_stop_bar(ac)
+            return False
+
+        limit = min(ac.waits[0][0], ac.stop_bar_at) if ac.waits else ac.stop_bar_at
+        limit = min(path.length, max(limit, d))
+        ac.dist_along_path = min(d + ac.speed * dt, limit)
+        x, y, heading, route_idx = path.sample(ac.dist_along_path)
+        ac.coords = (x, y)
+        ac.heading = heading
+        ac.node = ac.route[route_idx]
+        return True
@@ -0,0 +1,202 @@
+import heapq
+import math
+
+# ==============================
+# UNIFORM GRID SPATIAL INDEX
+class GridIndex:
+    """Uniform-grid (spatial hash) index of keyed points.
+
+    Points are bucketed by cell (floor(x / cell_size), floor(y / cell_size)),
+    so a query only looks at the cells around it instead of every point.
+    Keys can be anything hashable (node names, callsigns) and move() is
+    cheap when a point stays in its cell, which suits aircraft positions
+    refreshed every frame. Pick cell_size near the usual query radius.
+    """
+
+    def __init__(self, cell_size=50.0):
+        self.cell_size = float(cell_size)
+        self.cells = {}
+        # key -> (x, y, cell)
+        self.positions = {}
+        # bounding box of cells ever occupied; only grows, which keeps
+        # ring searches terminating without rescanning on removal
+        self._bounds = None
+
+    @classmethod
+    def from_points(cls, items, cell_size=50.0):
+        """Build an index from (key, (x, y)) pairs, e.g. nodes.items()."""
+        index = cls(cell_size)
+        for key, (x, y) in items:
+            index.insert(key, x, y)
+        return index
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __contains__(self, key):
+        return key in self.positions
+
+    def _cell(self, x, y):
+        size = self.cell_size
+        return math.floor(x / size), math.floor(y / size)
+
+    # ------------------------------
+    # Updates
+    def insert(self, key, x, y):
+        """Add a point, or move it if the key is already indexed."""
+        if key in self.positions:
+            self.move(key, x, y)
+            return
+        cell = self._cell(x, y)
+        self.cells.setdefault(cell, {})[key] = (x, y)
+        self.positions[key] = (x, y, cell)
+        bounds = self._bounds
+        if bounds is None:
+            self._bounds = [cell[0], cell[1], cell[0], cell[1]]
+        else:
+            bounds[0] = min(bounds[0], cell[0])
+            bounds[1] = min(bounds[1], cell[1])
+            bounds[2] = max(bounds[2], cell[0])
+            bounds[3] = max(bounds[3], cell[1])
+
+    def remove(self, key):
+        entry = self.positions.pop(key, None)
+        if entry is None:
+            return
+        bucket = self.cells[entry[2]]
+        del bucket[key]
+        if not bucket:
+            del self.cells[entry[2]]
+
+    def move(self, key, x, y):
+        entry = self.positions.get(key)
+        if entry is None:
+            self.insert(key, x, y)
+            return
+        cell = self._cell(x, y)
+        if cell == entry[2]:
+            self.cells[cell][key] = (x, y)
+            self.positions[key] = (x, y, cell)
+            return
+        self.remove(key)
+        self.insert(key, x, y)
+
+    def clear(self):
+        self.cells.clear()
+        self.positions.clear()
+        self._bounds = None
+
+    def position(self, key):
+        entry = self.positions.get(key)
+        return (entry[0], entry[1]) if entry is not None else None
+
+    # ------------------------------
+    # Queries
+    def _ring(self, cx, cy, r):
+        """Yield the occupied buckets on the square ring r cells out from (cx, cy)."""
+        cells = self.cells
+        if r == 0:
+            bucket = cells.get((cx, cy))
+            if bucket:
+                yield bucket
+            return
+        for i in range(cx - r, cx + r + 1):
+            for j in (cy - r, cy + r):
+                bucket = cells.get((i, j))
+                if bucket:
+                    yield bucket
+        for j in range(cy - r + 1, cy + r):
+            for i in (cx - r, cx + r):
+                bucket = cells.get((i, j))
+                if bucket:
+                    yield bucket
+
+    def k_nearest(self, x, y, k, max_dist=math.inf):
+        """Return up to k keys within max_dist of (x, y), nearest first.
+
+        Searches outward ring by ring and stops once no unvisited cell can
+        hold anything closer than the k-th best found so far.
+        """
+        if k <= 0 or self._bounds is None:
+            return []
+        cx, cy = self._cell(x, y)
+        x0, y0, x1, y1 = self._bounds
+        # rings beyond this index cannot contain any occupied cell
+        max_ring = max(cx - x0, x1 - cx, cy - y0, y1 - cy, 0)
+        size = self.cell_size
+        hypot = math.hypot
+        best = []   # max-heap of (-dist, tiebreak, key)
+        counter = 0
+        r = 0
+        while r <= max_ring:
+            for bucket in self._ring(cx, cy, r):
+                for key, (px, py) in bucket.items():
+                    d = hypot(px - x, py - y)
+                    if d > max_dist:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-d, counter, key))
+                    elif d < -best[0][0]:
+                        heapq.heapreplace(best, (-d, counter, key))
+                    counter += 1
+            # anything in ring r+1 or beyond is at least r*size away
+            reach = r * size
+            if reach > max_dist or (len(best) == k and -best[0][0] <= reach):
+                break
+            r += 1
+        best.sort(key=lambda item: (-item[0], item[1]))
+        return [key for _, _, key in best]
+
+    def nearest(self, x, y, max_dist=math.inf):
+        """Return the key nearest to (x, y) within max_dist, or None."""
+        found = self.k_nearest(x, y, 1, max_dist)
+        return found[0] if found else None
+
+    def within(self, x, y, radius):
+        """Return the keys within radius of (x, y), nearest first."""
+        if self._bounds is None:
+            return []
+        i0, j0 = self._cell(x - radius, y - radius)
+        i1, j1 = self._cell(x + radius, y + radius)
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > len(self.cells):
+            buckets = [b for (i, j), b in self.cells.items() if i0 <= i <= i1 and j0 <= j <= j1]
+        else:
+            cells = self.cells
+            buckets = [cells[c] for c in ((i, j) for i in range(i0, i1 + 1) for j in range(j0, j1 + 1)) if c in cells]
+        hypot = math.hypot
+        found = []
+        for bucket in buckets:
+            for key, (px, py) in bucket.items():
+                d = hypot(px - x, py - y)
+                if d <= radius:
+                    found.append((d, key))
+        found.sort(key=lambda item: item[0])
+        return [key for _, key in found]
+
+    def pairs(self, radius):
+        """Yield (key_a, key_b, distance) for every pair of points within radius.
+
+        Each cell is only compared with itself and the cells on one side of
+        it, so every pair is tested once and far-apart points never are.
+        """
+        reach = max(1, math.ceil(radius / self.cell_size))
+        offsets = [(di, dj) for di in range(reach + 1) for dj in range(-reach, reach + 1)
+                   if di > 0 or dj > 0]
+        cells = self.cells
+        hypot = math.hypot
+        for (i, j), bucket in cells.items():
+            items = list(bucket.items())
+            for n, (key_a, (xa, ya)) in enumerate(items):
+                for key_b, (xb, yb) in items[n + 1:]:
+                    d = hypot(xb - xa, yb - ya)
+                    if d <= radius:
+                        yield key_a, key_b, d
+            for di, dj in offsets:
+                other = cells.get((i + di, j + dj))
+                if not other:
+                    continue
+                for key_a, (xa, ya) in items:
+                    for key_b, (xb, yb) in other.items():
+                        d = hypot(xb - xa, yb - ya)
+                        if d <= radius:
+                            yield key_a, key_b, d
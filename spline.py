@@ -0,0 +1,220 @@
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+import math
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+# bounded LRU sizes; the EGNX layout has well under a thousand node quadruples
+SEGMENT_CACHE_SIZE = 4096
+# below this many t values a Python loop beats NumPy's call overhead
+NUMPY_BATCH_MIN = 32
+
+# ==============================
+# CATMULL-ROM SPLINE
+@lru_cache(maxsize=SEGMENT_CACHE_SIZE)
+def segment_coefficients(P0, P1, P2, P3):
+    """Cubic coefficients of the P1->P2 Catmull-Rom segment.
+
+    Returns ((ax, bx, cx, dx), (ay, by, cy, dy)) with
+    p(t) = ((a*t + b)*t + c)*t + d. Points must be hashable (x, y) tuples.
+    """
+    return tuple(
+        (0.5 * (-p0 + 3*p1 - 3*p2 + p3), 0.5 * (2*p0 - 5*p1 + 4*p2 - p3), 0.5 * (-p0 + p2), p1)
+        for p0, p1, p2, p3 in zip(P0, P1, P2, P3)
+    )
+
+def evaluate_segment(coeffs, t):
+    """Evaluate a segment at t by Horner's rule; t may be a float or a NumPy array."""
+    (ax, bx, cx, dx), (ay, by, cy, dy) = coeffs
+    return ((ax*t + bx)*t + cx)*t + dx, ((ay*t + by)*t + cy)*t + dy
+
+def catmull_rom_spline(P0, P1, P2, P3, n_points=20):
+    """Generate Catmull-Rom spline points."""
+    return list(segment_samples(tuple(P0), tuple(P1), tuple(P2), tuple(P3), n_points)[0])
+
+@lru_cache(maxsize=SEGMENT_CACHE_SIZE)
+def segment_samples(P0, P1, P2, P3, n_points):
+    """Sample one segment at t = i/n_points, i < n_points.
+
+    Returns (points, lengths): the sample tuples, and the cumulative chord
+    length (pixels) at each sample plus a final entry at P2, where the next
+    segment starts. Cached, so repeated stand-to-runway segments are a lookup.
+    """
+    coeffs = segment_coefficients(P0, P1, P2, P3)
+    if HAS_NUMPY and n_points >= NUMPY_BATCH_MIN:
+        xs, ys = evaluate_segment(coeffs, np.arange(n_points) / n_points)
+        xs = np.append(xs, P2[0])
+        ys = np.append(ys, P2[1])
+        lengths = np.concatenate(([0.0], np.cumsum(np.hypot(np.diff(xs), np.diff(ys)))))
+        points = tuple(zip(xs[:-1].tolist(), ys[:-1].tolist()))
+        return points, tuple(lengths.tolist())
+
+    points = tuple(evaluate_segment(coeffs, i / n_points) for i in range(n_points))
+    lengths = [0.0]
+    total = 0.0
+    for (x0, y0), (x1, y1) in zip(points, points[1:] + (P2,)):
+        total += math.hypot(x1 - x0, y1 - y0)
+        lengths.append(total)
+    return points, tuple(lengths)
+
+def build_spline_path(graph, route, points_per_segment=20):
+    """Build a Catmull-Rom spline for the given route (list of node names).
+
+    Returns (spline_points, spline_route_idx_map) where spline_route_idx_map[i]
+    is the index j such that spline_points[i] corresponds to motion from route[j]
+    towards route[j+1].
+    """
+    spline_points = []
+    spline_route_idx_map = []
+    if not route:
+        return [], []
+    if len(route) == 1:
+        node_id = graph.id_of(route[0])
+        return [graph.points[node_id] if node_id is not None else (0, 0)], [0]
+
+    points = graph.points
+    ids = graph.path_ids(route)
+    n = len(ids)
+    for i in range(n-1):
+        P0 = points[ids[i-1]] if i > 0 else points[ids[i]]
+        P1 = points[ids[i]]
+        P2 = points[ids[i+1]]
+        P3 = points[ids[i+2]] if i+2 < n else points[ids[i+1]]
+        seg = catmull_rom_spline(P0, P1, P2, P3, n_points=points_per_segment)
+        spline_points.extend(seg)
+        spline_route_idx_map.extend([i] * len(seg))
+
+    return spline_points, spline_route_idx_map
+
+
+# ==============================
+# ARC-LENGTH SPLINE PATH
+SAMPLE_SPACING = 10.0   # target pixels between samples
+MIN_SEGMENT_SAMPLES = 2
+
+
+class SplinePath:
+    """Catmull-Rom route spline parameterised by distance travelled.
+
+    Samples are spaced by edge length (about SAMPLE_SPACING px apart, never
+    fewer than MIN_SEGMENT_SAMPLES per edge) and include the route's final
+    node. s[k] is the cumulative arc length at sample k in metres, and
+    node_dist[j] the distance at which route[j] is reached, so position,
+    heading and current route edge at any distance are a binary search away.
+    node_dist doubles as the per-edge offsets, so no per-sample route index
+    is stored.
+    """
+
+    __slots__ = ("xs", "ys", "s", "node_dist", "length")
+
+    def __init__(self, xs, ys, s, node_dist, length=None):
+        self.xs = xs
+        self.ys = ys
+        self.s = s
+        self.node_dist = node_dist
+        self.length = length if length is not None else (s[-1] if s else 0.0)
+
+    @classmethod
+    def from_route(cls, graph, route, scale=1.0, spacing=SAMPLE_SPACING, lead_in=None):
+        """Build the path for a route (list of node names); scale is metres per pixel.
+
+        lead_in is an optional (P0, P3) pair of outer control points for the
+        first edge, so an aircraft rerouted part way along an edge keeps the
+        exact curve it is on until the next node.
+        """
+        ids = graph.path_ids(route)
+        pts = graph.points
+        xs, ys, s, node_dist = array('d'), array('d'), array('d'), array('d')
+        if len(ids) < 2:
+            for i in ids:
+                xs.append(pts[i][0]); ys.append(pts[i][1]); s.append(0.0)
+                node_dist.append(0.0)
+            return cls(xs, ys, s, node_dist)
+
+        total = 0.0
+        n = len(ids)
+        for i in range(n-1):
+            P0 = pts[ids[i-1]] if i > 0 else pts[ids[i]]
+            P1 = pts[ids[i]]
+            P2 = pts[ids[i+1]]
+            P3 = pts[ids[i+2]] if i+2 < n else pts[ids[i+1]]
+            if i == 0 and lead_in is not None:
+                P0, P3 = lead_in
+            n_points = max(MIN_SEGMENT_SAMPLES, math.ceil(math.dist(P1, P2) / spacing))
+            points, lengths = segment_samples(P0, P1, P2, P3, n_points)
+            node_dist.append(total)
+            for x, y in points:
+                xs.append(x)
+                ys.append(y)
+            s.extend([total + d * scale for d in lengths[:-1]])
+            total += lengths[-1] * scale
+        # close the path exactly on the final node
+        xs.append(pts[ids[-1]][0])
+        ys.append(pts[ids[-1]][1])
+        s.append(total)
+        node_dist.append(total)
+        return cls(xs, ys, s, node_dist)
+
+    def __len__(self):
+        return len(self.xs)
+
+    def without_samples(self):
+        """Return a copy keeping only length and node_dist.
+
+        Enough for route bookkeeping (segment_at, node distances) once the
+        samples live elsewhere, e.g. in a FleetState buffer.
+        """
+        empty = array('d')
+        return SplinePath(empty, empty, empty, self.node_dist, self.length)
+
+    @property
+    def points(self):
+        return list(zip(self.xs, self.ys))
+
+    def _locate(self, d):
+        """Return (k, frac): d lies frac of the way from sample k to k+1."""
+        s = self.s
+        last = len(s) - 1
+        if last <= 0 or d <= 0.0:
+            return 0, 0.0
+        if d >= self.length:
+            return last - 1, 1.0
+        k = bisect_right(s, d) - 1
+        span = s[k+1] - s[k]
+        return k, ((d - s[k]) / span if span > 0.0 else 0.0)
+
+    def position_at(self, d):
+        """(x, y) at distance d metres along the path."""
+        if len(self.xs) == 1:
+            return self.xs[0], self.ys[0]
+        k, f = self._locate(d)
+        xs, ys = self.xs, self.ys
+        return xs[k] + (xs[k+1] - xs[k]) * f, ys[k] + (ys[k+1] - ys[k]) * f
+
+    def heading_at(self, d):
+        """Heading in radians (canvas coordinates) at distance d along the path."""
+        if len(self.xs) < 2:
+            return 0.0
+        k, _ = self._locate(d)
+        return math.atan2(self.ys[k+1] - self.ys[k], self.xs[k+1] - self.xs[k])
+
+    def sample(self, d):
+        """Return (x, y, heading, route index) at distance d with a single lookup."""
+        xs, ys = self.xs, self.ys
+        if len(xs) < 2:
+            return (xs[0], ys[0], 0.0, 0) if xs else (0.0, 0.0, 0.0, 0)
+        k, f = self._locate(d)
+        dx = xs[k+1] - xs[k]
+        dy = ys[k+1] - ys[k]
+        return xs[k] + dx * f, ys[k] + dy * f, math.atan2(dy, dx), self.segment_at(d)
+
+    def segment_at(self, d):
+        """Route index j of the edge route[j] -> route[j+1] being travelled at distance d."""
+        node_dist = self.node_dist
+        return min(max(bisect_right(node_dist, d) - 1, 0), max(len(node_dist) - 2, 0))
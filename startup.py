@@ -0,0 +1,38 @@
+import sys
+import time
+
+# ==============================
+# STARTUP TIMING
+class StartupTimer:
+    """Wall-clock marks from the entry point's first line to its first frame.
+
+    mark(name) closes a phase that began at the previous mark, so a run
+    of marks reads as a breakdown (imports, window, first frame, each
+    deferred load); a mark straight after each heavy import times the
+    imports one by one, and report() formats the breakdown. For a full
+    per-module import tree use `python -X importtime`.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.t0 = clock()
+        self.marks = []
+
+    def mark(self, name):
+        self.marks.append((name, self.clock()))
+
+    def elapsed(self):
+        return self.clock() - self.t0
+
+    def report(self):
+        lines = [f"{'phase':<32} {'took':>9} {'at':>10}"]
+        previous = self.t0
+        for name, t in self.marks:
+            lines.append(f"{name:<32} {(t - previous) * 1000.0:7.1f}ms {(t - self.t0) * 1000.0:8.1f}ms")
+            previous = t
+        return "\n".join(lines)
+
+
+def wants_timing(argv=None):
+    """True when --startup-timing is on the command line."""
+    return "--startup-timing" in (sys.argv if argv is None else argv)
@@ -0,0 +1,140 @@
+from simulation import AIRBORNE, AT_STAND, HOLDING, RUNWAY
+from traffic import ARRIVAL
+
+# ==============================
+# STATUS BOARD MODEL
+STATUS_COLUMNS = ("Departures", "Taxiing", "Runway", "Airborne", "Arrivals")
+
+
+def status_column(ac):
+    """Status-board column an aircraft belongs in, from its kind and status."""
+    if ac.status == AIRBORNE:
+        return "Airborne"
+    if ac.kind == ARRIVAL:
+        return "Arrivals"
+    if ac.status == AT_STAND:
+        return "Departures"
+    if ac.status == RUNWAY:
+        return "Runway"
+    return "Taxiing"
+
+
+def status_text(ac):
+    """One status-board row: callsign, and where it is holding or going."""
+    if ac.status == HOLDING:
+        return f"{ac.callsign}  HOLD {ac.holding_at or ac.node}"
+    if ac.status in (AT_STAND, RUNWAY, AIRBORNE) or not ac.route:
+        return f"{ac.callsign}  {ac.node}"
+    return f"{ac.callsign}  {ac.status} {ac.route[-1]}"
+
+
+class StatusBoard:
+    """Callsigns listed under each status-board column, updated by diffs.
+
+    apply() takes only the aircraft whose status changed (see
+    Simulation.drain_status_changes) and moves each between columns, so a
+    frame costs nothing when no aircraft changed state. Columns keep
+    insertion order; drain_changed() says which ones a view must redraw.
+    """
+
+    def __init__(self, columns=STATUS_COLUMNS):
+        self.columns = {name: {} for name in columns}
+        self.column_of = {}
+        self.changed = set()
+        self._rows = {}
+
+    def __len__(self):
+        return len(self.column_of)
+
+    def apply(self, aircraft):
+        for ac in aircraft:
+            self.place(ac.callsign, status_column(ac), status_text(ac))
+
+    def place(self, callsign, column, text):
+        """Put a row in a column (moving it from any other) with the given text."""
+        old = self.column_of.get(callsign)
+        if old == column:
+            rows = self.columns[column]
+            if rows[callsign] == text:
+                return
+            rows[callsign] = text
+        else:
+            if old is not None:
+                del self.columns[old][callsign]
+                self._touch(old)
+            self.columns[column][callsign] = text
+            self.column_of[callsign] = column
+        self._touch(column)
+
+    def remove(self, callsign):
+        column = self.column_of.pop(callsign, None)
+        if column is not None:
+            del self.columns[column][callsign]
+            self._touch(column)
+
+    def clear(self):
+        for column in self.columns:
+            if self.columns[column]:
+                self.columns[column].clear()
+                self._touch(column)
+        self.column_of.clear()
+
+    def _touch(self, column):
+        self.changed.add(column)
+        self._rows.pop(column, None)
+
+    def rows(self, column):
+        """Row texts of a column in order (cached until the column changes)."""
+        rows = self._rows.get(column)
+        if rows is None:
+            rows = self._rows[column] = list(self.columns[column].values())
+        return rows
+
+    def drain_changed(self):
+        changed, self.changed = self.changed, set()
+        return changed
+
+
+# ==============================
+# VIRTUALIZED COLUMN VIEW
+class VirtualList:
+    """Scrollable list that only has widgets for the rows on screen.
+
+    make_label(parent) creates one row widget (e.g. a CTkLabel); exactly
+    visible_rows of them are made up front and re-labelled as the list
+    scrolls or changes, and a label is only reconfigured when its text
+    does. The mouse wheel scrolls.
+    """
+
+    def __init__(self, parent, make_label, visible_rows=12):
+        self.labels = []
+        self.shown = []
+        self.rows = []
+        self.first = 0
+        for _ in range(visible_rows):
+            label = make_label(parent)
+            label.pack(fill="x")
+            self.labels.append(label)
+            self.shown.append("")
+        for widget in [parent] + self.labels:
+            widget.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1))
+            widget.bind("<Button-4>", lambda e: self.scroll(-1))
+            widget.bind("<Button-5>", lambda e: self.scroll(1))
+
+    def set_rows(self, rows):
+        self.rows = rows
+        self._render()
+
+    def scroll(self, delta):
+        self.first += delta
+        self._render()
+
+    def _render(self):
+        rows = self.rows
+        self.first = max(0, min(self.first, len(rows) - len(self.labels)))
+        for i, label in enumerate(self.labels):
+            k = self.first + i
+            text = rows[k] if k < len(rows) else ""
+            if text != self.shown[i]:
+                label.configure(text=text)
+                self.shown[i] = text
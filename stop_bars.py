@@ -0,0 +1,132 @@
+from bisect import bisect_right
+import math
+
+# ==============================
+# STOP-BAR MANAGER
+class StopBarManager:
+    """Lit stop bars, the aircraft held at each, and where each aircraft meets its next one.
+
+    When a route is assigned the manager records every node on it (with the
+    spline distances to those nodes) and works out the distance at which
+    the aircraft must hold for the first lit bar still ahead. That is the
+    start of the edge leading to the bar. Aircraft only compare their
+    distance against that number while they move. The stored distances are
+    recomputed only when a bar changes state, and then only for aircraft
+    whose route crosses it. Clearing a bar wakes just the aircraft
+    waiting at it.
+    """
+
+    def __init__(self, graph):
+        # node name -> lit; Simulation.stop_bars is this dict
+        self.lit = {name: False for name in graph.names}
+        # node -> {callsign: Aircraft} held at that bar
+        self.waiters = {}
+        # callsign -> (Aircraft, route, node_dist) for routes being followed
+        self._routes = {}
+        # node -> {callsign: Aircraft} whose route passes through it
+        self._crossing = {}
+        # callsign -> (hold distance, node) of the next lit bar ahead
+        self.next_bar = {}
+
+    def is_lit(self, node):
+        return self.lit.get(node, False)
+
+    def lit_nodes(self):
+        return [node for node, lit in self.lit.items() if lit]
+
+    # ------------------------------
+    # Routes
+    def assign(self, ac, route, node_dist, d=0.0):
+        """Register a route from distance d; return the distance to hold at (inf if none)."""
+        self.forget(ac)
+        callsign = ac.callsign
+        self._routes[callsign] = (ac, route, node_dist)
+        for node in route[1:]:
+            self._crossing.setdefault(node, {})[callsign] = ac
+        return self._find_next(callsign, d)
+
+    def forget(self, ac):
+        """Drop an aircraft's route and any bar it is waiting at."""
+        callsign = ac.callsign
+        entry = self._routes.pop(callsign, None)
+        bar = self.next_bar.pop(callsign, None)
+        if bar is not None:
+            waiting = self.waiters.get(bar[1])
+            if waiting is not None:
+                waiting.pop(callsign, None)
+                if not waiting:
+                    del self.waiters[bar[1]]
+        if entry is None:
+            return
+        for node in entry[1][1:]:
+            crossing = self._crossing.get(node)
+            if crossing is not None:
+                crossing.pop(callsign, None)
+                if not crossing:
+                    del self._crossing[node]
+
+    def _find_next(self, callsign, d):
+        """Distance at which the aircraft must hold for the first lit bar beyond d."""
+        _, route, node_dist = self._routes[callsign]
+        lit = self.lit
+        # bars at or behind the aircraft's position no longer apply
+        for k in range(max(1, bisect_right(node_dist, d)), len(route)):
+            if lit.get(route[k]):
+                self.next_bar[callsign] = (node_dist[k - 1], route[k])
+                return node_dist[k - 1]
+        self.next_bar.pop(callsign, None)
+        return math.inf
+
+    def hold_distance(self, callsign):
+        entry = self.next_bar.get(callsign)
+        return entry[0] if entry is not None else math.inf
+
+    # ------------------------------
+    # Bars
+    def set(self, node, lit, distance_of):
+        """Light or clear the bar at node.
+
+        distance_of(ac) gives an aircraft's current distance along its
+        path. Returns (changed, woken): [(Aircraft, hold distance)] for
+        aircraft whose next bar moved, and the aircraft released from
+        this bar.
+        """
+        lit = bool(lit)
+        if self.lit.get(node) == lit:
+            return [], []
+        self.lit[node] = lit
+        woken = [] if lit else list(self.waiters.pop(node, {}).values())
+        changed = []
+        for callsign, ac in list(self._crossing.get(node, {}).items()):
+            d = distance_of(ac)
+            if lit:
+                current = self.hold_distance(callsign)
+                found = self._find_next(callsign, d)
+                if found != current:
+                    changed.append((ac, found))
+            elif self.next_bar.get(callsign, (None, None))[1] == node:
+                changed.append((ac, self._find_next(callsign, d)))
+        return changed, woken
+
+    def reach(self, ac):
+        """Record that an aircraft has stopped for its next bar; return the bar's node."""
+        node = self.next_bar[ac.callsign][1]
+        self.waiters.setdefault(node, {})[ac.callsign] = ac
+        return node
+
+    def release(self, ac):
+        """Let an aircraft held at its next bar cross it; return the distance to hold at next."""
+        callsign = ac.callsign
+        hold, node = self.next_bar[callsign]
+        waiting = self.waiters.get(node)
+        if waiting is not None:
+            waiting.pop(callsign, None)
+            if not waiting:
+                del self.waiters[node]
+        _, route, node_dist = self._routes[callsign]
+        # the bar is the route node just past the hold point
+        k = min(bisect_right(node_dist, hold), len(route) - 1)
+        return self._find_next(callsign, node_dist[k])
+
+    def waiting_at(self, node):
+        return list(self.waiters.get(node, {}).values())
@@ -0,0 +1,96 @@
+import math
+import time
+
+# ==============================
+# TABLE VIEW MODEL
+TABLE_REFRESH_INTERVAL = 0.25   # seconds between widget flushes (4 Hz)
+COORD_PRECISION = 0             # decimal places of pixel coordinates shown
+
+
+def format_coords(coords, precision=COORD_PRECISION):
+    """Display string for (x, y) rounded to the table's precision."""
+    x, y = coords
+    if precision <= 0:
+        return f"({round(x)}, {round(y)})"
+    return f"({x:.{precision}f}, {y:.{precision}f})"
+
+
+class TableModel:
+    """Rows of a ttk.Treeview keyed by callsign, written to the widget in batches.
+
+    update() only records the latest values of a row, and does nothing if
+    they match what is already shown, so values should be formatted to
+    display precision first (see format_coords). flush() writes the
+    changed rows at most once per `interval` seconds, which keeps widget
+    calls down to a few per second however fast the frames run. Pass
+    force=True on the last frame so final states are not left pending.
+    """
+
+    def __init__(self, table, interval=TABLE_REFRESH_INTERVAL, clock=time.perf_counter):
+        self.table = table
+        self.interval = interval
+        self.clock = clock
+        # key -> Treeview row id, and back
+        self.rows = {}
+        self.keys = {}
+        # key -> values on screen, and values waiting for the next flush
+        self.shown = {}
+        self.dirty = {}
+        self._last_flush = -math.inf
+        self.writes = 0
+
+    def __contains__(self, key):
+        return key in self.rows
+
+    def insert(self, key, values):
+        """Add a row straight away (new rows should not wait for a flush)."""
+        values = tuple(values)
+        row_id = self.table.insert("", "end", values=values)
+        self.rows[key] = row_id
+        self.keys[row_id] = key
+        self.shown[key] = values
+        return row_id
+
+    def remove(self, key):
+        row_id = self.rows.pop(key, None)
+        if row_id is None:
+            return
+        del self.keys[row_id]
+        self.shown.pop(key, None)
+        self.dirty.pop(key, None)
+        self.table.delete(row_id)
+
+    def row_of(self, key):
+        return self.rows.get(key)
+
+    def key_of(self, row_id):
+        """Key (callsign) of a Treeview row id, e.g. from table.selection()."""
+        return self.keys.get(row_id)
+
+    def update(self, key, values):
+        """Queue new values for a row; unchanged values are dropped."""
+        if key not in self.rows:
+            return
+        values = tuple(values)
+        if self.shown.get(key) == values:
+            self.dirty.pop(key, None)
+        else:
+            self.dirty[key] = values
+
+    def flush(self, force=False):
+        """Write queued rows to the widget if the interval has passed; return rows written."""
+        if not self.dirty:
+            return 0
+        now = self.clock()
+        if not force and now - self._last_flush < self.interval:
+            return 0
+        self._last_flush = now
+        item = self.table.item
+        rows = self.rows
+        for key, values in self.dirty.items():
+            item(rows[key], values=values)
+            self.shown[key] = values
+        written = len(self.dirty)
+        self.writes += written
+        self.dirty.clear()
+        return written
@@ -0,0 +1,138 @@
+from array import array
+import heapq
+import math
+
+# ==============================
+# COMPILED TAXIWAY GRAPH
+class TaxiGraph:
+    """Index-based taxiway graph compiled once from the `nodes`/`edges` dicts.
+
+    Node ids are integers 0..n-1 in declaration order. Adjacency is stored
+    CSR-style: the neighbours of node i are targets[offsets[i]:offsets[i+1]],
+    with the Euclidean edge lengths precomputed in the matching weights slots.
+    Coordinates and weights are in layout pixels; metres_per_pixel converts
+    them to ground distance.
+    """
+
+    def __init__(self, nodes, edges, metres_per_pixel=1.0):
+        self.metres_per_pixel = metres_per_pixel
+        self.names = list(nodes)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.points = [tuple(nodes[name]) for name in self.names]
+        self.xs = array('d', (p[0] for p in self.points))
+        self.ys = array('d', (p[1] for p in self.points))
+
+        # Build bidirectional adjacency; dicts keep declaration order and
+        # give O(1) duplicate checks (edges to unknown nodes are dropped)
+        adjacency = [{} for _ in self.names]
+        for name, neighbors in edges.items():
+            u = self.index.get(name)
+            if u is None:
+                continue
+            for neighbor in neighbors:
+                v = self.index.get(neighbor)
+                if v is None or v == u:
+                    continue
+                adjacency[u][v] = None
+                adjacency[v][u] = None
+
+        self.offsets = array('l', [0])
+        self.targets = array('l')
+        self.weights = array('d')
+        for u, neighbors in enumerate(adjacency):
+            for v in neighbors:
+                self.targets.append(v)
+                self.weights.append(math.dist(self.points[u], self.points[v]))
+            self.offsets.append(len(self.targets))
+
+    @classmethod
+    def from_arrays(cls, names, xs, ys, offsets, targets, weights, metres_per_pixel=1.0):
+        """Graph over already-compiled CSR arrays (e.g. memoryviews of a layout cache).
+
+        Skips the adjacency build; the arrays are used as given, so they
+        must be consistent (as layout_loader writes them).
+        """
+        graph = cls.__new__(cls)
+        graph.metres_per_pixel = metres_per_pixel
+        graph.names = list(names)
+        graph.index = {name: i for i, name in enumerate(graph.names)}
+        graph.points = list(zip(xs, ys))
+        graph.xs, graph.ys = xs, ys
+        graph.offsets, graph.targets, graph.weights = offsets, targets, weights
+        return graph
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def id_of(self, name):
+        """Return the integer id for a node name, or None if unknown."""
+        return self.index.get(name)
+
+    def name_of(self, node_id):
+        return self.names[node_id]
+
+    def coords(self, name):
+        """Return (x, y) for a node name."""
+        return self.points[self.index[name]]
+
+    def neighbors(self, node_id):
+        """Return the neighbour ids of node_id."""
+        return self.targets[self.offsets[node_id]:self.offsets[node_id + 1]]
+
+    def edge_count(self):
+        """Number of directed adjacency entries (twice the undirected edges)."""
+        return len(self.targets)
+
+    def edge_items(self):
+        """Yield (u, v, weight) for every directed adjacency entry."""
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        for u in range(len(self.names)):
+            for k in range(offsets[u], offsets[u + 1]):
+                yield u, targets[k], weights[k]
+
+    def edge_weight(self, u, v):
+        """Return the length of edge u->v, or None if the edge does not exist."""
+        for k in range(self.offsets[u], self.offsets[u + 1]):
+            if self.targets[k] == v:
+                return self.weights[k]
+        return None
+
+    def path_names(self, path_ids):
+        return [self.names[i] for i in path_ids]
+
+    def path_ids(self, path_names):
+        return [self.index[name] for name in path_names]
+
+    def dijkstra(self, start, goal):
+        """Return the shortest path as a list of node ids, or None if unreachable."""
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        inf = math.inf
+        dist = [inf] * len(self.names)
+        prev = [-1] * len(self.names)
+        dist[start] = 0.0
+        pq = [(0.0, start)]
+        heappop, heappush = heapq.heappop, heapq.heappush
+
+        while pq:
+            cur_cost, node = heappop(pq)
+            if node == goal:
+                path = [node]
+                while node != start:
+                    node = prev[node]
+                    path.append(node)
+                path.reverse()
+                return path
+            if cur_cost > dist[node]:
+                continue
+            for k in range(offsets[node], offsets[node + 1]):
+                nxt = targets[k]
+                new_cost = cur_cost + weights[k]
+                if new_cost < dist[nxt]:
+                    dist[nxt] = new_cost
+                    prev[nxt] = node
+                    heappush(pq, (new_cost, nxt))
+
+        return None
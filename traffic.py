@@ -0,0 +1,128 @@
+import csv
+import heapq
+import math
+import random
+
+# ==============================
+# TRAFFIC LEVELS
+# Movements per hour (arrivals + departures) for the home screen's Traffic
+# Flow Rate levels
+TRAFFIC_FLOW_RATES = {"Low": 10.0, "Medium": 20.0, "High": 30.0}
+ARRIVAL_SHARE = 0.5
+AIRLINES = ("BAW", "EZY", "RYR", "EXS", "LOG", "TOM")
+DEPARTURE = "departure"
+ARRIVAL = "arrival"
+
+
+class Movement:
+    """One scheduled aircraft movement.
+
+    A departure taxis from its stand to the runway entry; an arrival comes
+    off the runway at that entry and taxis to the stand. time is seconds
+    from the start of the schedule (off-block for departures, landing for
+    arrivals).
+    """
+
+    __slots__ = ("time", "callsign", "kind", "stand", "runway")
+
+    def __init__(self, time, callsign, kind, stand, runway):
+        self.time = time
+        self.callsign = callsign
+        self.kind = kind
+        self.stand = stand
+        self.runway = runway
+
+    def __repr__(self):
+        return f"Movement({self.time:.0f}, {self.callsign!r}, {self.kind!r}, {self.stand!r}, {self.runway!r})"
+
+    @property
+    def origin(self):
+        return self.stand if self.kind == DEPARTURE else self.runway
+
+    @property
+    def destination(self):
+        return self.runway if self.kind == DEPARTURE else self.stand
+
+
+# ==============================
+# GENERATED TRAFFIC
+class TrafficGenerator:
+    """Seeded, lazy stream of arrivals and departures.
+
+    Arrivals and departures are independent Poisson processes whose rates
+    split the flow level's movements per hour by arrival_share. Each draws
+    from its own seeded generator and the two are merged by time as they
+    are consumed, so the same seed gives the same schedule however far it
+    is read and a multi-day stream never exists in memory all at once.
+    """
+
+    def __init__(self, stands, runways, flow="Low", seed=0, arrival_share=ARRIVAL_SHARE, rate=None):
+        self.stands = list(stands)
+        self.runways = list(runways)
+        self.rate = TRAFFIC_FLOW_RATES[flow] if rate is None else rate
+        self.seed = seed
+        self.arrival_share = arrival_share
+
+    @classmethod
+    def for_graph(cls, graph, flow="Low", seed=0, **kwargs):
+        """Generator over a layout's STAND*a stands and RWY* runway entries."""
+        stands = [name for name in graph.names if name.startswith("STAND") and name.endswith("a")]
+        runways = [name for name in graph.names if name.startswith("RWY")]
+        return cls(stands, runways, flow, seed, **kwargs)
+
+    def __iter__(self):
+        return self.stream()
+
+    def stream(self, end=math.inf):
+        """Yield Movements in time order up to `end` seconds (forever by default)."""
+        streams = []
+        for kind, share, offset in ((DEPARTURE, 1.0 - self.arrival_share, 0), (ARRIVAL, self.arrival_share, 1)):
+            if share > 0.0:
+                streams.append(self._poisson(kind, self.rate * share, random.Random(self.seed * 2 + offset), end))
+        for n, (t, kind, airline, stand, runway) in enumerate(heapq.merge(*streams)):
+            yield Movement(t, f"{airline}{n + 1:04d}", kind, stand, runway)
+
+    def _poisson(self, kind, rate_per_hour, rng, end):
+        t = 0.0
+        while True:
+            t += rng.expovariate(rate_per_hour / 3600.0)
+            if t > end:
+                return
+            yield t, kind, rng.choice(AIRLINES), rng.choice(self.stands), rng.choice(self.runways)
+
+    def departures(self, end=math.inf):
+        return (m for m in self.stream(end) if m.kind == DEPARTURE)
+
+
+# ==============================
+# SCHEDULE FILES
+def parse_time(text):
+    """Seconds from "HH:MM", "HH:MM:SS" or a plain number of seconds."""
+    if ":" not in text:
+        return float(text)
+    parts = [float(p) for p in text.split(":")]
+    return sum(p * 60.0 ** (2 - i) for i, p in enumerate(parts + [0.0] * (3 - len(parts))))
+
+
+def schedule_stream(path):
+    """Yield Movements from a CSV schedule, reading one row at a time.
+
+    Columns are time, callsign, kind (departure/arrival or D/A), stand and
+    runway, with an optional header row. Times are clock times or seconds;
+    a clock time earlier than the row before it rolls over to the next
+    day, so a file can list several days of traffic in order.
+    """
+    day = 0.0
+    previous = -math.inf
+    with open(path, newline="") as f:
+        for row in csv.reader(f):
+            if not row or row[0].startswith("#") or row[0].strip().lower() == "time":
+                continue
+            time_text, callsign, kind, stand, runway = (cell.strip() for cell in row[:5])
+            t = parse_time(time_text) + day
+            if t < previous and ":" in time_text:
+                day += 86400.0
+                t += 86400.0
+            previous = t
+            kind = DEPARTURE if kind.lower() in ("d", DEPARTURE) else ARRIVAL
+            yield Movement(t, callsign, kind, stand, runway)